@@ -35,7 +35,7 @@ class ArticleAdmin(admin.ModelAdmin):
     list_select_related = ("author", "category")
 
     # Поля только для чтения
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("created_at", "updated_at", "word_count", "reading_time")
 
     # Добавляем инлайн для комментариев
     inlines = [CommentInline]
@@ -44,6 +44,10 @@ class ArticleAdmin(admin.ModelAdmin):
     fieldsets = (
         (None, {"fields": ("title", "content", "author", "category")}),
         ("Даты", {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
+        (
+            "Сводка",
+            {"fields": ("word_count", "reading_time"), "classes": ("collapse",)},
+        ),
     )
 
 
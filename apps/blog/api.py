@@ -1,16 +1,32 @@
+import datetime
+import hashlib
+import json
 import logging  # Импортируем logging
-from typing import List
-from ninja import Router
+from functools import partial
+from operator import itemgetter
+from typing import List, Literal, Optional
+from asgiref.sync import sync_to_async
+from ninja import Query, Router
 from ninja.errors import HttpError
-from django.http import Http404, JsonResponse  # <--- Добавляем импорт
+from django.http import (  # <--- Добавляем импорт
+    Http404,
+    HttpResponse,
+    JsonResponse,
+)
 
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import aget_object_or_404, get_object_or_404
 
 # User модель больше не нужна здесь напрямую, так как request.user будет объектом User
 # from django.contrib.auth.models import User
 
-from .models import Article, Category, Comment
+from . import counters, list_cache, renditions
+from .conditional import conditional_response, make_etag, set_validators
+from .models import Article, ArticleRendition, Category, Comment
 from .schemas import (
+    ArticleBulkCreateSchema,
+    ArticleBulkResultSchema,
     ArticleOutSchema,
     ArticleCreateSchema,
     ArticleUpdateSchema,
@@ -20,10 +36,37 @@ from .schemas import (
     CommentUpdateSchema,
     CommentListSchema,
 )
+from .serializers import COMMENT_COLUMNS, comment_cursor_key, comment_dict, dumps
+from .pagination import (
+    clamp_page_size,
+    decode_cursor,
+    encode_cursor,
+    keyset_queryset,
+    split_page,
+)
+from .export import export_articles, export_comments
+from .fieldsets import (
+    SUMMARY_FIELDS,
+    article_schema,
+    parse_fields,
+    restrict_queryset,
+)
+from .search import search_article_ids
+from .streaming import streaming_response
+from .services import (
+    bulk_create_articles,
+    delete_own_article,
+    delete_own_comment,
+    ingest_comments,
+    iter_lines,
+    update_own_article,
+    update_own_comment,
+)
 
 # Импортируем аутентификатор из приложения users
 # Изменяем SimpleTokenAuth на TokenAuthBearer
 from apps.users.api import TokenAuthBearer  # Убедитесь, что этот импорт корректен
+from blog_project.db_router import use_primary
 
 logger = logging.getLogger(__name__)  # Получаем логгер
 
@@ -31,6 +74,8 @@ router = Router(tags=["Статьи и Категории"])
 
 # Применяем TokenAuthBearer ко всем эндпоинтам этого роутера, требующим аутентификации
 # Для публичных эндпоинтов (list, get) auth не указывается или auth=None
+# Публичные эндпоинты чтения асинхронные (async ORM): под ASGI один worker
+# обслуживает много медленных клиентов без отдельного потока на запрос.
 
 
 # --- Эндпоинты для Категорий (опционально, но полезно) ---
@@ -40,9 +85,9 @@ router = Router(tags=["Статьи и Категории"])
     summary="Получить список всех категорий",
     operation_id="list_categories",
 )
-def list_categories(request):
+async def list_categories(request):
     logger.info("Запрошен список категорий")
-    return Category.objects.all()
+    return [category async for category in Category.objects.all()]
 
 
 @router.get(
@@ -51,9 +96,9 @@ def list_categories(request):
     summary="Получить категорию по ID",
     operation_id="get_category",
 )
-def get_category(request, category_id: int):
-    logger.info(f"Запрошена категория с ID: {category_id}")
-    category = get_object_or_404(Category, id=category_id)
+async def get_category(request, category_id: int):
+    logger.info("Запрошена категория с ID: %s", category_id)
+    category = await aget_object_or_404(Category, id=category_id)
     return category
 
 
@@ -75,8 +120,8 @@ def create_article(request, payload: ArticleCreateSchema):
     Создает новую статью. Требуется аутентификация.
     Автор статьи устанавливается автоматически на основе аутентифицированного пользователя.
     """
-    logger.info(
-        f"Попытка создания новой статьи пользователем: {request.user.username if request.user and request.user.is_authenticated else 'anonymous'}"
+    logger.debug(
+        "Попытка создания новой статьи пользователем: %s", request.user.username
     )
     # request.user должен быть установлен SimpleTokenAuth
     if not request.user or not request.user.is_authenticated:
@@ -96,42 +141,195 @@ def create_article(request, payload: ArticleCreateSchema):
         if category_id is not None:
             category = get_object_or_404(Category, id=category_id)
 
-        article = Article.objects.create(author=author, category=category, **data)
+        # Счетчики обновляются сигналом post_save — в той же транзакции
+        with transaction.atomic():
+            article = Article.objects.create(author=author, category=category, **data)
         logger.info(
-            f"Статья '{article.title}' (ID: {article.id}) успешно создана пользователем '{author.username}'."
+            "Статья '%s' (ID: %s) успешно создана пользователем '%s'.",
+            article.title,
+            article.id,
+            author.username,
         )
         return 201, article
     except Http404:  # Обработка get_object_or_404 для категории
         logger.warning(
-            f"Ошибка при создании статьи: категория с ID {category_id} не найдена."
+            "Ошибка при создании статьи: категория с ID %s не найдена.", category_id
         )
         raise  # Перевыбрасываем, чтобы Ninja вернул 404
     except Exception as e:
         logger.error(
-            f"Непредвиденная ошибка при создании статьи пользователем '{author.username}': {e}",
+            "Непредвиденная ошибка при создании статьи пользователем '%s': %s",
+            author.username,
+            e,
             exc_info=True,
         )
         raise HttpError(500, "Внутренняя ошибка сервера при создании статьи.")
 
 
+@router.post(
+    "/articles/bulk",
+    response={200: ArticleBulkResultSchema},
+    auth=TokenAuthBearer(),
+    summary="Создать статьи пакетом",
+    operation_id="bulk_create_articles",
+)
+def bulk_create_articles_endpoint(request, payload: ArticleBulkCreateSchema):
+    """
+    Создает до BLOG_BULK_MAX_ITEMS статей за один запрос (формат элемента — как у
+    создания статьи). Возвращает результат по каждому элементу: id созданной
+    статьи или список ошибок; корректные элементы создаются независимо от ошибочных.
+    """
+    if len(payload.items) > settings.BLOG_BULK_MAX_ITEMS:
+        raise HttpError(
+            422, f"Не более {settings.BLOG_BULK_MAX_ITEMS} статей за один запрос."
+        )
+    logger.info(
+        "Пакетное создание %s статей пользователем '%s'",
+        len(payload.items),
+        request.user.username,
+    )
+    results = bulk_create_articles(request.user, payload.items)
+    created = sum(1 for r in results if "id" in r)
+    logger.info(
+        "Пакетное создание: создано %s, отклонено %s.", created, len(results) - created
+    )
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
 @router.get(
     "/articles/",
     summary="Получить список всех статей",
     operation_id="list_articles",
 )
-def list_articles(request, page: int = 1, page_size: int = 10):
-    """Публичный список статей с пагинацией"""
+async def list_articles(
+    request,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+):
+    """
+    Публичный список статей с пагинацией.
+
+    Два режима:
+    - `page`/`page_size` — прежний постраничный режим (count + results);
+    - `cursor` — keyset-пагинация по (created_at, id): время ответа не зависит
+      от глубины страницы. Первая страница запрашивается с пустым `cursor=`,
+      следующие — со значением `next_cursor` из предыдущего ответа.
+
+    `page_size` ограничен сверху настройкой BLOG_MAX_PAGE_SIZE. Первые
+    BLOG_LIST_CACHE_PAGES страниц отдаются из кэша готовыми JSON-байтами.
+
+    `fields` — список полей через запятую (например, `title,author,created_at`):
+    незапрошенные колонки не читаются из БД и не попадают в ответ.
+    `view=summary` — краткий режим для ленты: отрывок, число слов и время
+    чтения вместо content (если `fields` не задан явно).
+    """
     logger.info("Запрошен список статей")
-    qs = (
-        Article.objects.all()
-        .select_related("author", "category")
-        .order_by("-created_at")
-    )
-    total = qs.count()
+    page_size = clamp_page_size(page_size)
+    page = max(page, 1)
+    fields = parse_fields(fields)
+    if fields is None and view == "summary":
+        fields = SUMMARY_FIELDS
+    fields_key = ",".join(fields) if fields else "*"
+
+    if cursor is not None:
+        build = partial(_articles_cursor_page, cursor, page_size, fields)
+        key_parts = ("cursor", page_size, fields_key)
+        cacheable = cursor == ""
+    else:
+        build = partial(_articles_page, page, page_size, fields)
+        key_parts = ("page", page, page_size, fields_key)
+        cacheable = page <= settings.BLOG_LIST_CACHE_PAGES
+
+    if cacheable:
+        body = await list_cache.aget_or_build(key_parts, build)
+    else:
+        body = await build()
+    return HttpResponse(body, content_type="application/json")
+
+
+async def _articles_body(qs, fields, start: int, page_size: int, count=None) -> bytes:
+    """
+    Тело страницы списка. Полный набор полей склеивается из готовых
+    представлений статей (apps.blog.renditions), урезанный — строится через
+    only() и урезанную схему.
+    """
+    if fields is None:
+        qs = qs.values_list("id", "created_at", "rendition__payload")
+        rows = [r async for r in qs[start : start + page_size + 1]]
+        rows, next_cursor = split_page(rows, page_size, key=itemgetter(1, 0))
+        payloads = await renditions.afill({pk: payload for pk, _, payload in rows})
+        results = [payloads[pk] for pk, _, _ in rows if pk in payloads]
+        return renditions.list_body(results, next_cursor, count)
+    qs = restrict_queryset(qs, fields)
+    rows = [a async for a in qs[start : start + page_size + 1]]
+    rows, next_cursor = split_page(rows, page_size)
+    schema = article_schema(fields)
+    data = {
+        "results": [schema.from_orm(a).dict() for a in rows],
+        "next_cursor": next_cursor,
+    }
+    if count is not None:
+        data = {"count": count, **data}
+    return dumps(data)
+
+
+async def _articles_cursor_page(cursor: str, page_size: int, fields=None) -> bytes:
+    qs = keyset_queryset(Article.objects.all(), cursor)
+    return await _articles_body(qs, fields, 0, page_size)
+
+
+async def _articles_page(page: int, page_size: int, fields=None) -> bytes:
+    qs = keyset_queryset(Article.objects.all(), None)
+    total = await counters.aarticles_total()
     start = (page - 1) * page_size
-    slice_qs = qs[start : start + page_size]
-    serialized = [ArticleOutSchema.from_orm(a).dict() for a in slice_qs]
-    return JsonResponse({"count": total, "results": serialized})
+    return await _articles_body(qs, fields, start, page_size, count=total)
+
+
+@router.get(
+    "/articles/search",
+    summary="Полнотекстовый поиск по статьям",
+    operation_id="search_articles",
+)
+async def search_articles(
+    request,
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    page_size: int = 10,
+):
+    """
+    Поиск по заголовку и тексту статей с сортировкой по релевантности.
+    Пагинация — курсором (`next_cursor`), как в keyset-режиме списка статей.
+    """
+    logger.info("Поиск статей: '%s'", q)
+    page_size = clamp_page_size(page_size)
+    after = None
+    if cursor:
+        try:
+            score, pk = decode_cursor(cursor)
+            after = (float(score), int(pk))
+        except (TypeError, ValueError):
+            raise HttpError(400, "Некорректный курсор пагинации.")
+
+    matches = await sync_to_async(search_article_ids)(q, page_size + 1, after)
+    next_cursor = None
+    if len(matches) > page_size:
+        matches = matches[:page_size]
+        next_cursor = encode_cursor(*matches[-1])
+
+    ids = [pk for _, pk in matches]
+    stored = {pk: None for pk in ids}
+    async for pk, payload in ArticleRendition.objects.filter(
+        article_id__in=ids
+    ).values_list("article_id", "payload"):
+        stored[pk] = payload
+    payloads = await renditions.afill(stored)
+    results = [payloads[pk] for pk in ids if pk in payloads]
+    return HttpResponse(
+        renditions.list_body(results, next_cursor), content_type="application/json"
+    )
 
 
 @router.get(
@@ -140,12 +338,67 @@ def list_articles(request, page: int = 1, page_size: int = 10):
     summary="Получить статью по ID",
     operation_id="get_article",
 )
-def get_article(request, article_id: int):
-    logger.info(f"Запрошена статья с ID: {article_id}")
-    article = get_object_or_404(
-        Article.objects.select_related("author", "category"), id=article_id
+async def get_article(request, article_id: int, fields: Optional[str] = None):
+    """
+    Статья по ID. Поддерживает условные запросы: при совпадении If-None-Match
+    (или If-Modified-Since) возвращается 304 без загрузки тела статьи.
+    `fields` — как в списке статей; ETag различается для разных наборов полей.
+    """
+    logger.info("Запрошена статья с ID: %s", article_id)
+    fields = parse_fields(fields)
+    if fields is None:
+        return await _article_rendition_response(request, article_id)
+
+    # Версия — время построения готового представления: оно меняется и при
+    # переименовании автора или категории, которые статью не сохраняют
+    rendered_at = await renditions.aversion(article_id)
+    if rendered_at is not None:
+        return await _article_fields_response(request, article_id, fields, rendered_at)
+    # Представления еще нет: оно строится на primary, и строку читаем оттуда же —
+    # реплика может отставать от только что построенной версии
+    with use_primary():
+        stored = await renditions.arebuild(article_id)
+        if stored is None:
+            raise Http404("Статья не найдена.")
+        return await _article_fields_response(request, article_id, fields, stored[0])
+
+
+async def _article_fields_response(request, article_id: int, fields, rendered_at):
+    """Урезанное представление статьи с валидаторами версии rendered_at."""
+    # Запятые в ETag недопустимы: If-None-Match — список через запятую
+    variant = "+".join(fields)
+    etag = make_etag("article", article_id, rendered_at, variant)
+    not_modified = conditional_response(request, etag, rendered_at)
+    if not_modified is not None:
+        return not_modified
+
+    qs = restrict_queryset(Article.objects.all(), fields)
+    article = await aget_object_or_404(qs, id=article_id)
+    response = HttpResponse(
+        dumps(article_schema(fields).from_orm(article).dict()),
+        content_type="application/json",
     )
-    return article
+    # Строка прочитана после версии, поэтому она не старше валидаторов
+    set_validators(response, etag, rendered_at)
+    return response
+
+
+async def _article_rendition_response(request, article_id: int):
+    """
+    Полное представление статьи: готовые байты и rendered_at читаются одним
+    запросом из ArticleRendition и отдаются без повторной сериализации.
+    """
+    stored = await renditions.aload(article_id)
+    if stored is None:
+        raise Http404("Статья не найдена.")
+    rendered_at, payload = stored
+    etag = make_etag("article", article_id, rendered_at)
+    not_modified = conditional_response(request, etag, rendered_at)
+    if not_modified is not None:
+        return not_modified
+    response = HttpResponse(payload, content_type="application/json")
+    set_validators(response, etag, rendered_at)
+    return response
 
 
 @router.put(
@@ -156,59 +409,85 @@ def get_article(request, article_id: int):
     operation_id="update_article",
 )
 def update_article(request, article_id: int, payload: ArticleUpdateSchema):
-    logger.info(
-        f"Попытка обновления статьи ID: {article_id} пользователем: {request.user.username if request.user and request.user.is_authenticated else 'anonymous'}"
+    logger.debug(
+        "Попытка обновления статьи ID: %s пользователем: %s",
+        article_id,
+        request.user.username,
     )
     if not request.user or not request.user.is_authenticated:
         logger.warning(
-            f"Обновление статьи ID {article_id}: отказано (401, аутентификация не пройдена)."
+            "Обновление статьи ID %s: отказано (401, аутентификация не пройдена).",
+            article_id,
         )
         raise HttpError(401, "Аутентификация не пройдена")
 
-    article = get_object_or_404(Article, id=article_id)
-
-    if article.author != request.user:
-        logger.warning(
-            f"Обновление статьи ID {article_id} пользователем '{request.user.username}': отказано (403, нет прав)."
-        )
-        raise HttpError(403, "У вас нет прав на обновление этой статьи")
-
+    changes = payload.dict(exclude_unset=True)
     try:
-        updated_fields_count = 0
-        for attr, value in payload.dict(exclude_unset=True).items():
-            # Проверка на изменение category_id, если он есть в payload
-            if attr == "category_id":
-                if value is not None:
-                    category = get_object_or_404(Category, id=value)
-                    article.category = category
-                else:
-                    article.category = None  # Разрешаем открепление категории
-            else:
-                setattr(article, attr, value)
-            updated_fields_count += 1
-
-        if updated_fields_count > 0:  # Сохраняем только если были изменения
-            article.save()
-            logger.info(
-                f"Статья ID {article_id} успешно обновлена пользователем '{request.user.username}'."
-            )
+        if changes:
+            body = update_own_article(article_id, request.user.id, changes)
         else:
-            logger.info(
-                f"Обновление статьи ID {article_id} пользователем '{request.user.username}': не было полей для обновления."
-            )
-        return article
-    except Http404:  # Обработка get_object_or_404 для категории при обновлении
+            body = _own_article_rendition(article_id, request.user.id)
+    except Category.DoesNotExist:
         logger.warning(
-            f"Ошибка при обновлении статьи ID {article_id}: категория не найдена."
+            "Ошибка при обновлении статьи ID %s: категория не найдена.", article_id
         )
-        raise
+        raise Http404("Категория не найдена.")
     except Exception as e:
         logger.error(
-            f"Непредвиденная ошибка при обновлении статьи ID {article_id} пользователем '{request.user.username}': {e}",
+            "Непредвиденная ошибка при обновлении статьи ID %s пользователем '%s': %s",
+            article_id,
+            request.user.username,
+            e,
             exc_info=True,
         )
         raise HttpError(500, "Внутренняя ошибка сервера при обновлении статьи.")
 
+    if body is None:
+        _not_owned(Article, article_id)
+        logger.warning(
+            "Обновление статьи ID %s пользователем '%s': отказано (403, нет прав).",
+            article_id,
+            request.user.username,
+        )
+        raise HttpError(403, "У вас нет прав на обновление этой статьи")
+
+    if changes:
+        logger.info(
+            "Статья ID %s успешно обновлена пользователем '%s'.",
+            article_id,
+            request.user.username,
+        )
+    else:
+        logger.info(
+            "Обновление статьи ID %s пользователем '%s': не было полей для обновления.",
+            article_id,
+            request.user.username,
+        )
+    return HttpResponse(body, content_type="application/json")
+
+
+def _own_article_rendition(article_id: int, author_id: int):
+    """Готовое представление статьи автора (без изменений) или None."""
+    if not Article.objects.filter(id=article_id, author_id=author_id).exists():
+        return None
+    stored = (
+        ArticleRendition.objects.filter(article_id=article_id)
+        .values_list("payload", flat=True)
+        .first()
+    )
+    if stored is None:
+        return renditions.refresh([article_id])[article_id]
+    return bytes(stored)
+
+
+def _not_owned(model, pk: int) -> None:
+    """
+    Условная запись не затронула ни одной строки: отличает отсутствующий
+    объект (404) от чужого. Возвращается, если объект существует (403).
+    """
+    if not model.objects.filter(id=pk).exists():
+        raise Http404(f"{model._meta.verbose_name}: объект не найден.")
+
 
 @router.delete(
     "/articles/{article_id}/",
@@ -218,37 +497,46 @@ def update_article(request, article_id: int, payload: ArticleUpdateSchema):
     operation_id="delete_article",
 )
 def delete_article(request, article_id: int):
-    logger.info(
-        f"Попытка удаления статьи ID: {article_id} пользователем: {request.user.username if request.user and request.user.is_authenticated else 'anonymous'}"
+    logger.debug(
+        "Попытка удаления статьи ID: %s пользователем: %s",
+        article_id,
+        request.user.username,
     )
     if not request.user or not request.user.is_authenticated:
         logger.warning(
-            f"Удаление статьи ID {article_id}: отказано (401, аутентификация не пройдена)."
+            "Удаление статьи ID %s: отказано (401, аутентификация не пройдена).",
+            article_id,
         )
         raise HttpError(401, "Аутентификация не пройдена")
 
-    article = get_object_or_404(Article, id=article_id)
-
-    if article.author != request.user:
-        logger.warning(
-            f"Удаление статьи ID {article_id} пользователем '{request.user.username}': отказано (403, нет прав)."
-        )
-        raise HttpError(403, "У вас нет прав на удаление этой статьи")
-
     try:
-        article_title_for_log = article.title
-        article.delete()
-        logger.info(
-            f"Статья '{article_title_for_log}' (ID: {article_id}) успешно удалена пользователем '{request.user.username}'."
-        )
-        return 204, None
+        deleted = delete_own_article(article_id, request.user.id)
     except Exception as e:
         logger.error(
-            f"Непредвиденная ошибка при удалении статьи ID {article_id} пользователем '{request.user.username}': {e}",
+            "Непредвиденная ошибка при удалении статьи ID %s пользователем '%s': %s",
+            article_id,
+            request.user.username,
+            e,
             exc_info=True,
         )
         raise HttpError(500, "Внутренняя ошибка сервера при удалении статьи.")
 
+    if not deleted:
+        _not_owned(Article, article_id)
+        logger.warning(
+            "Удаление статьи ID %s пользователем '%s': отказано (403, нет прав).",
+            article_id,
+            request.user.username,
+        )
+        raise HttpError(403, "У вас нет прав на удаление этой статьи")
+
+    logger.info(
+        "Статья ID %s успешно удалена пользователем '%s'.",
+        article_id,
+        request.user.username,
+    )
+    return 204, None
+
 
 # --- Эндпоинты для Комментариев ---
 
@@ -261,12 +549,15 @@ def delete_article(request, article_id: int):
     operation_id="create_comment",
 )
 def create_comment(request, article_id: int, payload: CommentCreateSchema):
-    logger.info(
-        f"Попытка добавления комментария к статье ID: {article_id} пользователем: {request.user.username if request.user and request.user.is_authenticated else 'anonymous'}"
+    logger.debug(
+        "Попытка добавления комментария к статье ID: %s пользователем: %s",
+        article_id,
+        request.user.username,
     )
     if not request.user or not request.user.is_authenticated:
         logger.warning(
-            f"Создание комментария к статье ID {article_id}: отказано (401, аутентификация не пройдена)."
+            "Создание комментария к статье ID %s: отказано (401, аутентификация не пройдена).",
+            article_id,
         )
         raise HttpError(401, "Аутентификация не пройдена")
 
@@ -274,50 +565,157 @@ def create_comment(request, article_id: int, payload: CommentCreateSchema):
     author_for_comment = request.user
 
     try:
-        comment = Comment.objects.create(
-            article=article, author=author_for_comment, content=payload.content
-        )
+        with transaction.atomic():
+            comment = Comment.objects.create(
+                article=article, author=author_for_comment, content=payload.content
+            )
         logger.info(
-            f"Комментарий ID {comment.id} успешно создан к статье ID {article_id} пользователем '{author_for_comment.username}'."
+            "Комментарий ID %s успешно создан к статье ID %s пользователем '%s'.",
+            comment.id,
+            article_id,
+            author_for_comment.username,
         )
         return comment
     except (
         Http404
     ):  # На случай если get_object_or_404 для article не сработает выше (хотя должен)
         logger.warning(
-            f"Попытка создания комментария к несуществующей статье ID {article_id} пользователем '{author_for_comment.username}'."
+            "Попытка создания комментария к несуществующей статье ID %s пользователем '%s'.",
+            article_id,
+            author_for_comment.username,
         )
         raise
     except Exception as e:
         logger.error(
-            f"Непредвиденная ошибка при создании комментария к статье ID {article_id} пользователем '{author_for_comment.username}': {e}",
+            "Непредвиденная ошибка при создании комментария к статье ID %s пользователем '%s': %s",
+            article_id,
+            author_for_comment.username,
+            e,
             exc_info=True,
         )
         raise HttpError(500, "Внутренняя ошибка сервера при создании комментария.")
 
 
+@router.post(
+    "/comments/ingest",
+    auth=TokenAuthBearer(),
+    summary="Потоковая загрузка комментариев (NDJSON)",
+    operation_id="ingest_comments",
+)
+def ingest_comments_endpoint(request):
+    """
+    Принимает тело в формате NDJSON: по одному объекту `{"article_id", "content"}`
+    в строке; автор всех комментариев — аутентифицированный пользователь.
+    Тело читается построчно, комментарии вставляются пачками по
+    BLOG_INGEST_CHUNK_SIZE в отдельных транзакциях. Ответ — поток NDJSON-событий:
+    `error` (ошибка строки), `progress` (после каждой пачки) и итоговый `done`.
+    """
+    logger.info(
+        "Потоковая загрузка комментариев пользователем '%s'", request.user.username
+    )
+    lines = iter_lines(request, settings.BLOG_INGEST_MAX_LINE_BYTES)
+    events = ingest_comments(request.user, lines, settings.BLOG_INGEST_CHUNK_SIZE)
+    # Под ASGI — по одному событию за переход в поток: progress уходит сразу
+    return streaming_response(
+        request,
+        (json.dumps(event, ensure_ascii=False).encode() + b"\n" for event in events),
+        "application/x-ndjson",
+    )
+
+
+@router.get(
+    "/export/articles.ndjson",
+    auth=TokenAuthBearer(),
+    summary="Потоковая выгрузка статей (NDJSON)",
+    operation_id="export_articles",
+)
+def export_articles_endpoint(request, since: Optional[datetime.datetime] = None):
+    """
+    Выгрузка всех статей (или измененных начиная с `since`) по одной в строке.
+    Читается серверным курсором пачками по BLOG_EXPORT_CHUNK_SIZE, без OFFSET.
+    """
+    logger.info(
+        "Выгрузка статей пользователем '%s', since=%s", request.user.username, since
+    )
+    return streaming_response(
+        request,
+        export_articles(since),
+        "application/x-ndjson",
+        batch_size=settings.BLOG_EXPORT_CHUNK_SIZE,
+    )
+
+
+@router.get(
+    "/export/comments.ndjson",
+    auth=TokenAuthBearer(),
+    summary="Потоковая выгрузка комментариев (NDJSON)",
+    operation_id="export_comments",
+)
+def export_comments_endpoint(request, since: Optional[datetime.datetime] = None):
+    """Выгрузка всех комментариев (или измененных начиная с `since`) по одному в строке."""
+    logger.info(
+        "Выгрузка комментариев пользователем '%s', since=%s",
+        request.user.username,
+        since,
+    )
+    return streaming_response(
+        request,
+        export_comments(since),
+        "application/x-ndjson",
+        batch_size=settings.BLOG_EXPORT_CHUNK_SIZE,
+    )
+
+
 @router.get(
     "/articles/{article_id}/comments/",
     response=CommentListSchema,
     summary="Получить комментарии к статье",
     operation_id="list_comments",
 )
-def list_comments_for_article(
-    request, article_id: int, page: int = 1, page_size: int = 10
+async def list_comments_for_article(
+    request,
+    article_id: int,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+    order: Literal["asc", "desc"] = "asc",
 ):
-    """Публичный список комментариев с пагинацией"""
-    logger.info(f"Запрошены комментарии для статьи ID: {article_id}")
-    article = get_object_or_404(Article, id=article_id)
-    qs = (
-        Comment.objects.filter(article=article)
-        .select_related("author")
-        .order_by("created_at")
+    """
+    Публичный список комментариев с пагинацией.
+
+    При переданном `cursor` (первая страница — пустой `cursor=`) используется
+    keyset-пагинация по (created_at, id), `order=desc` отдает сначала новые.
+    Существование статьи в этом режиме проверяется отдельным запросом только
+    для пустой страницы: непустая страница сама доказывает, что статья есть.
+    """
+    logger.info("Запрошены комментарии для статьи ID: %s", article_id)
+    page_size = clamp_page_size(page_size)
+
+    if cursor is not None:
+        qs = keyset_queryset(
+            Comment.objects.filter(article_id=article_id),
+            cursor,
+            descending=order == "desc",
+        ).values_list(*COMMENT_COLUMNS)
+        rows = [c async for c in qs[: page_size + 1]]
+        rows, next_cursor = split_page(rows, page_size, key=comment_cursor_key)
+        if not rows and not await Article.objects.filter(id=article_id).aexists():
+            raise Http404("Статья не найдена.")
+        serialized = [comment_dict(c) for c in rows]
+        return JsonResponse({"results": serialized, "next_cursor": next_cursor})
+
+    article = await aget_object_or_404(Article, id=article_id)
+    qs = keyset_queryset(
+        Comment.objects.filter(article=article), None, descending=False
+    ).values_list(*COMMENT_COLUMNS)
+    total = await counters.aarticle_comments(article.id)
+    start = (max(page, 1) - 1) * page_size
+    rows = [c async for c in qs[start : start + page_size + 1]]
+    rows, next_cursor = split_page(rows, page_size, key=comment_cursor_key)
+    serialized = [comment_dict(c) for c in rows]
+    return JsonResponse(
+        {"count": total, "results": serialized, "next_cursor": next_cursor}
     )
-    total = qs.count()
-    start = (page - 1) * page_size
-    slice_qs = qs[start : start + page_size]
-    serialized = [CommentOutSchema.from_orm(c).dict() for c in slice_qs]
-    return JsonResponse({"count": total, "results": serialized})
 
 
 @router.get(
@@ -326,14 +724,41 @@ def list_comments_for_article(
     summary="Получить комментарий по ID",
     operation_id="get_comment",
 )
-def get_comment(request, comment_id: int):
-    logger.info(f"Запрошен комментарий с ID: {comment_id}")
-    comment = get_object_or_404(
+async def get_comment(request, comment_id: int, response: HttpResponse):
+    """Комментарий по ID. Поддерживает условные запросы (ETag / Last-Modified)."""
+    logger.info("Запрошен комментарий с ID: %s", comment_id)
+    # Версия — updated_at комментария и имя автора: имя входит в ответ, а его
+    # смена комментарий не сохраняет
+    row = await (
+        Comment.objects.filter(id=comment_id)
+        .values_list("updated_at", "author__username")
+        .afirst()
+    )
+    if row is None:
+        raise Http404("Комментарий не найден.")
+    updated_at, username = row
+    not_modified = conditional_response(
+        request, _comment_etag(comment_id, updated_at, username), updated_at
+    )
+    if not_modified is not None:
+        return not_modified
+
+    comment = await aget_object_or_404(
         Comment.objects.select_related("author", "article"), id=comment_id
     )
+    set_validators(
+        response,
+        _comment_etag(comment.id, comment.updated_at, comment.author.username),
+        comment.updated_at,
+    )
     return comment
 
 
+def _comment_etag(comment_id: int, updated_at, username: str) -> str:
+    author_version = hashlib.sha256(username.encode()).hexdigest()[:12]
+    return make_etag("comment", comment_id, updated_at, author_version)
+
+
 @router.put(
     "/comments/{comment_id}/",
     response=CommentOutSchema,
@@ -342,42 +767,61 @@ def get_comment(request, comment_id: int):
     operation_id="update_comment",
 )
 def update_comment(request, comment_id: int, payload: CommentUpdateSchema):
-    logger.info(
-        f"Попытка обновления комментария ID: {comment_id} пользователем: {request.user.username if request.user and request.user.is_authenticated else 'anonymous'}"
+    logger.debug(
+        "Попытка обновления комментария ID: %s пользователем: %s",
+        comment_id,
+        request.user.username,
     )
     if not request.user or not request.user.is_authenticated:
         logger.warning(
-            f"Обновление комментария ID {comment_id}: отказано (401, аутентификация не пройдена)."
+            "Обновление комментария ID %s: отказано (401, аутентификация не пройдена).",
+            comment_id,
         )
         raise HttpError(401, "Аутентификация не пройдена")
 
-    comment = get_object_or_404(Comment, id=comment_id)
-
-    if comment.author != request.user:
-        logger.warning(
-            f"Обновление комментария ID {comment_id} пользователем '{request.user.username}': отказано (403, нет прав)."
-        )
-        raise HttpError(403, "У вас нет прав на обновление этого комментария")
-
     try:
         if payload.content:
-            comment.content = payload.content
-            comment.save()
-            logger.info(
-                f"Комментарий ID {comment_id} успешно обновлен пользователем '{request.user.username}'."
-            )
+            data = update_own_comment(comment_id, request.user.id, payload.content)
         else:
-            logger.info(
-                f"Обновление комментария ID {comment_id} пользователем '{request.user.username}': не было данных для обновления (content был пустым)."
+            row = (
+                Comment.objects.filter(id=comment_id, author_id=request.user.id)
+                .values_list(*COMMENT_COLUMNS)
+                .first()
             )
-        return comment
+            data = None if row is None else comment_dict(row)
     except Exception as e:
         logger.error(
-            f"Непредвиденная ошибка при обновлении комментария ID {comment_id} пользователем '{request.user.username}': {e}",
+            "Непредвиденная ошибка при обновлении комментария ID %s пользователем '%s': %s",
+            comment_id,
+            request.user.username,
+            e,
             exc_info=True,
         )
         raise HttpError(500, "Внутренняя ошибка сервера при обновлении комментария.")
 
+    if data is None:
+        _not_owned(Comment, comment_id)
+        logger.warning(
+            "Обновление комментария ID %s пользователем '%s': отказано (403, нет прав).",
+            comment_id,
+            request.user.username,
+        )
+        raise HttpError(403, "У вас нет прав на обновление этого комментария")
+
+    if payload.content:
+        logger.info(
+            "Комментарий ID %s успешно обновлен пользователем '%s'.",
+            comment_id,
+            request.user.username,
+        )
+    else:
+        logger.info(
+            "Обновление комментария ID %s пользователем '%s': не было данных для обновления (content был пустым).",
+            comment_id,
+            request.user.username,
+        )
+    return HttpResponse(dumps(data), content_type="application/json")
+
 
 @router.delete(
     "/comments/{comment_id}/",
@@ -387,32 +831,42 @@ def update_comment(request, comment_id: int, payload: CommentUpdateSchema):
     operation_id="delete_comment",
 )
 def delete_comment(request, comment_id: int):
-    logger.info(
-        f"Попытка удаления комментария ID: {comment_id} пользователем: {request.user.username if request.user and request.user.is_authenticated else 'anonymous'}"
+    logger.debug(
+        "Попытка удаления комментария ID: %s пользователем: %s",
+        comment_id,
+        request.user.username,
     )
     if not request.user or not request.user.is_authenticated:
         logger.warning(
-            f"Удаление комментария ID {comment_id}: отказано (401, аутентификация не пройдена)."
+            "Удаление комментария ID %s: отказано (401, аутентификация не пройдена).",
+            comment_id,
         )
         raise HttpError(401, "Аутентификация не пройдена")
 
-    comment = get_object_or_404(Comment, id=comment_id)
-
-    if comment.author != request.user:
-        logger.warning(
-            f"Удаление комментария ID {comment_id} пользователем '{request.user.username}': отказано (403, нет прав)."
-        )
-        raise HttpError(403, "У вас нет прав на удаление этого комментария")
-
     try:
-        comment.delete()
-        logger.info(
-            f"Комментарий ID {comment_id} успешно удален пользователем '{request.user.username}'."
-        )
-        return 204, None
+        deleted = delete_own_comment(comment_id, request.user.id)
     except Exception as e:
         logger.error(
-            f"Непредвиденная ошибка при удалении комментария ID {comment_id} пользователем '{request.user.username}': {e}",
+            "Непредвиденная ошибка при удалении комментария ID %s пользователем '%s': %s",
+            comment_id,
+            request.user.username,
+            e,
             exc_info=True,
         )
         raise HttpError(500, "Внутренняя ошибка сервера при удалении комментария.")
+
+    if not deleted:
+        _not_owned(Comment, comment_id)
+        logger.warning(
+            "Удаление комментария ID %s пользователем '%s': отказано (403, нет прав).",
+            comment_id,
+            request.user.username,
+        )
+        raise HttpError(403, "У вас нет прав на удаление этого комментария")
+
+    logger.info(
+        "Комментарий ID %s успешно удален пользователем '%s'.",
+        comment_id,
+        request.user.username,
+    )
+    return 204, None
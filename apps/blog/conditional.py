@@ -0,0 +1,44 @@
+"""
+Условные GET-запросы (ETag / Last-Modified) для детальных эндпоинтов.
+
+Валидаторы строятся из версии записи, которую можно получить узким запросом
+без чтения тела (content): updated_at и имя автора комментария или rendered_at
+готового представления статьи (apps.blog.renditions). Если клиент уже имеет актуальную
+версию, отвечаем 304 и не загружаем и не сериализуем строку.
+"""
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(prefix: str, pk, updated_at, variant: str = None) -> str:
+    """
+    Сильный ETag, меняющийся вместе с версией updated_at. variant различает
+    представления одной записи (например, разные наборы полей).
+    """
+    tag = f'{prefix}-{pk}-{updated_at.strftime("%Y%m%d%H%M%S%f")}'
+    if variant:
+        tag += f";{variant}"
+    return f'"{tag}"'
+
+
+def set_validators(response: HttpResponse, etag: str, updated_at) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(updated_at.timestamp())
+
+
+def conditional_response(request, etag: str, updated_at):
+    """
+    Проверяет If-None-Match / If-Modified-Since (и If-Match / If-Unmodified-Since).
+    Возвращает готовый ответ 304/412 или None, если нужно отдать тело.
+    """
+    probe = HttpResponse()
+    set_validators(probe, etag, updated_at)
+    result = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(updated_at.timestamp()),
+        response=probe,
+    )
+    return None if result is probe else result
@@ -0,0 +1,171 @@
+"""
+Counter cache для списков блога.
+
+Счетчики хранятся в таблице Counter и обновляются в той же транзакции, что и
+запись статьи/комментария (через сигналы в apps.blog.signals или явно — для
+bulk-операций, которые сигналы не отправляют). Если строки счетчика нет,
+значение один раз пересчитывается по исходной таблице.
+"""
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, F
+
+from .models import Article, Comment, Counter
+
+ARTICLES_KEY = "articles"
+
+
+def category_key(category_id) -> str:
+    return f"category:{category_id}:articles"
+
+
+def article_comments_key(article_id) -> str:
+    return f"article:{article_id}:comments"
+
+
+def _recount(key: str) -> int:
+    """Считает значение счетчика по исходным таблицам (на БД для записи, не на реплике)."""
+    db = router.db_for_write(Counter)
+    if key == ARTICLES_KEY:
+        return Article.objects.using(db).count()
+    kind, pk, _ = key.split(":")
+    if kind == "category":
+        return Article.objects.using(db).filter(category_id=pk).count()
+    if kind == "article":
+        return Comment.objects.using(db).filter(article_id=pk).count()
+    raise ValueError(f"Неизвестный ключ счетчика: {key}")
+
+
+def _ensure(key: str) -> int:
+    """Создает отсутствующую строку счетчика, пересчитав значение. Возвращает значение."""
+    value = _recount(key)
+    try:
+        with transaction.atomic():
+            Counter.objects.create(key=key, value=value)
+    except IntegrityError:
+        # Строку параллельно создал другой запрос — берем его значение
+        value = Counter.objects.using(router.db_for_write(Counter)).get(key=key).value
+    return value
+
+
+def get_count(key: str) -> int:
+    value = Counter.objects.filter(key=key).values_list("value", flat=True).first()
+    if value is None:
+        value = _ensure(key)
+    return value
+
+
+async def aget_count(key: str) -> int:
+    value = (
+        await Counter.objects.filter(key=key).values_list("value", flat=True).afirst()
+    )
+    if value is None:
+        value = await sync_to_async(_ensure)(key)
+    return value
+
+
+def add(key: str, delta: int) -> None:
+    """
+    Атомарно прибавляет delta к счетчику (UPDATE ... SET value = value + delta).
+    Вызывается после того, как изменение уже записано в исходную таблицу,
+    поэтому при отсутствии строки пересчет сразу дает верное значение.
+    """
+    if not delta:
+        return
+    if not Counter.objects.filter(key=key).update(value=F("value") + delta):
+        _ensure(key)
+
+
+def forget(key: str) -> None:
+    Counter.objects.filter(key=key).delete()
+
+
+def recount_article_comments(article_ids) -> None:
+    """
+    Пересчитывает счетчики комментариев статей одним агрегатным запросом
+    (после каскадного удаления многих комментариев разом). Счетчики уже
+    удаленных статей не создаются.
+    """
+    ids = set(article_ids)
+    if not ids:
+        return
+    counts = (
+        Article.objects.filter(id__in=ids)
+        .order_by()
+        .annotate(n=Count("comments"))
+        .values_list("id", "n")
+    )
+    rows = [Counter(key=article_comments_key(pk), value=n) for pk, n in counts]
+    with transaction.atomic(savepoint=False):
+        Counter.objects.filter(
+            key__in=[article_comments_key(pk) for pk in ids]
+        ).delete()
+        Counter.objects.bulk_create(rows)
+
+
+def articles_total() -> int:
+    return get_count(ARTICLES_KEY)
+
+
+def category_articles(category_id) -> int:
+    return get_count(category_key(category_id))
+
+
+def article_comments(article_id) -> int:
+    return get_count(article_comments_key(article_id))
+
+
+async def aarticles_total() -> int:
+    return await aget_count(ARTICLES_KEY)
+
+
+async def aarticle_comments(article_id) -> int:
+    return await aget_count(article_comments_key(article_id))
+
+
+def expected_counters() -> dict:
+    """Фактические значения всех счетчиков, посчитанные агрегатными запросами."""
+    expected = {ARTICLES_KEY: Article.objects.count()}
+    for row in (
+        Article.objects.exclude(category_id=None)
+        .values("category_id")
+        .annotate(n=Count("id"))
+        .order_by()
+    ):
+        expected[category_key(row["category_id"])] = row["n"]
+    for row in Comment.objects.values("article_id").annotate(n=Count("id")).order_by():
+        expected[article_comments_key(row["article_id"])] = row["n"]
+    return expected
+
+
+def rebuild_counters(dry_run: bool = False, batch_size: int = 1000) -> dict:
+    """
+    Сверяет таблицу счетчиков с данными и исправляет расхождения.
+    Возвращает статистику: сколько строк создано, исправлено и удалено.
+    """
+    with transaction.atomic():
+        expected = expected_counters()
+        stored = dict(Counter.objects.select_for_update().values_list("key", "value"))
+
+        missing = [key for key in expected if key not in stored]
+        wrong = [
+            key
+            for key, value in expected.items()
+            if key in stored and stored[key] != value
+        ]
+        # Нулевые счетчики агрегаты не возвращают — это не расхождение
+        stale = [
+            key for key, value in stored.items() if key not in expected and value != 0
+        ]
+
+        if not dry_run:
+            Counter.objects.bulk_create(
+                [Counter(key=key, value=expected[key]) for key in missing],
+                batch_size=batch_size,
+            )
+            for key in wrong:
+                Counter.objects.filter(key=key).update(value=expected[key])
+            Counter.objects.filter(key__in=stale).update(value=0)
+
+    return {"created": len(missing), "fixed": len(wrong), "reset": len(stale)}
@@ -0,0 +1,41 @@
+"""
+Потоковая выгрузка статей и комментариев в NDJSON.
+
+Строки читаются через QuerySet.values_list().iterator(chunk_size=...): на
+PostgreSQL это серверный курсор, на SQLite — fetchmany, поэтому в памяти
+одновременно находится не больше одной пачки. Порядок — по первичному ключу,
+без OFFSET. Формат строки совпадает с ArticleOutSchema / CommentOutSchema.
+"""
+
+from django.conf import settings
+
+from .models import Article, Comment
+from .serializers import (
+    ARTICLE_COLUMNS,
+    COMMENT_COLUMNS,
+    article_dict,
+    comment_dict,
+    dumps,
+)
+
+
+def _rows(qs, columns, since):
+    if since is not None:
+        qs = qs.filter(updated_at__gte=since)
+    return (
+        qs.order_by("id")
+        .values_list(*columns)
+        .iterator(chunk_size=settings.BLOG_EXPORT_CHUNK_SIZE)
+    )
+
+
+def export_articles(since=None):
+    """Генератор строк NDJSON со статьями, измененными начиная с since."""
+    for row in _rows(Article.objects.all(), ARTICLE_COLUMNS, since):
+        yield dumps(article_dict(row)) + b"\n"
+
+
+def export_comments(since=None):
+    """Генератор строк NDJSON с комментариями, измененными начиная с since."""
+    for row in _rows(Comment.objects.all(), COMMENT_COLUMNS, since):
+        yield dumps(comment_dict(row)) + b"\n"
@@ -0,0 +1,86 @@
+"""
+Разреженные наборы полей (?fields=) для статей.
+
+Запрошенные поля превращаются в only() для QuerySet — незапрошенные колонки
+(прежде всего content) не читаются из БД — и в урезанную схему вывода,
+построенную из ArticleOutSchema / ArticleSummarySchema. id возвращается всегда.
+Режим view=summary — готовый набор полей SUMMARY_FIELDS.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from ninja import Schema
+from ninja.errors import HttpError
+from pydantic import create_model
+
+from .schemas import ArticleOutSchema, ArticleSummarySchema
+
+# Поле схемы -> колонки, которые нужно загрузить
+ARTICLE_COLUMNS = {
+    "id": ("id",),
+    "title": ("title",),
+    "content": ("content",),
+    "excerpt": ("excerpt",),
+    "word_count": ("word_count",),
+    "reading_time": ("reading_time",),
+    "author": ("author__id", "author__username"),
+    "category": ("category__id", "category__name", "category__slug"),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+}
+
+SUMMARY_FIELDS = tuple(
+    name for name in ARTICLE_COLUMNS if name in ArticleSummarySchema.model_fields
+)
+
+# Описания полей для урезанных схем
+_SCHEMA_FIELDS = {
+    **ArticleSummarySchema.model_fields,
+    **ArticleOutSchema.model_fields,
+}
+
+# Нужны пагинации по (created_at, id) даже если не запрошены
+REQUIRED_COLUMNS = ("id", "created_at")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[tuple]:
+    """
+    Разбирает `fields=title,author` в кортеж полей в порядке схемы.
+    None — полный набор полей. Неизвестное поле — 400.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - ARTICLE_COLUMNS.keys()
+    if unknown:
+        raise HttpError(400, f"Неизвестные поля: {', '.join(sorted(unknown))}.")
+    requested.add("id")
+    return tuple(name for name in ARTICLE_COLUMNS if name in requested)
+
+
+def restrict_queryset(qs, fields: Optional[tuple], extra: tuple = ()):
+    """
+    only() и select_related() только для запрошенных полей. extra — колонки,
+    которые нужны самому эндпоинту (например, updated_at для ETag).
+    """
+    if fields is None:
+        return qs.select_related("author", "category")
+    columns = [*REQUIRED_COLUMNS, *extra]
+    for name in fields:
+        columns.extend(c for c in ARTICLE_COLUMNS[name] if c not in columns)
+    related = [name for name in ("author", "category") if name in fields]
+    return qs.select_related(*related).only(*columns)
+
+
+@lru_cache(maxsize=None)
+def article_schema(fields: Optional[tuple]) -> type:
+    """Схема вывода статьи, ограниченная полями fields (кэшируется по набору)."""
+    if fields is None:
+        return ArticleOutSchema
+    definitions = {
+        name: (_SCHEMA_FIELDS[name].annotation, _SCHEMA_FIELDS[name]) for name in fields
+    }
+    return create_model(
+        "ArticleOutSchema_" + "_".join(fields), __base__=Schema, **definitions
+    )
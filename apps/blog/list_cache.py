@@ -0,0 +1,88 @@
+"""
+Кэш сериализованных первых страниц списка статей.
+
+Ключи страниц включают глобальную "версию статей". Любая запись, влияющая на
+список (статья, категория, автор), увеличивает версию — старые страницы просто
+перестают читаться и вытесняются по таймауту. Одновременные промахи по одному
+ключу объединяются: страницу строит только тот, кто взял блокировку через
+cache.add, остальные ждут готовый результат. Кэшируемая страница строится
+по данным primary, а не реплики (см. blog_project.db_router.use_primary).
+
+Работает с любым бэкендом Django cache (locmem, file-based, Redis, ...).
+"""
+
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from blog_project.db_router import use_primary
+
+VERSION_KEY = "blog:articles:version"
+LOCK_TIMEOUT = 10  # секунд: блокировка не должна пережить упавший worker
+WAIT_STEP = 0.02
+WAIT_TIMEOUT = 2.0
+
+
+def _initial_version() -> int:
+    # Начальная версия уникальна во времени: если ключ версии вытеснили из кэша,
+    # страницы, сохраненные под прежними версиями, не станут снова видимыми
+    return time.time_ns()
+
+
+def _bump() -> None:
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _initial_version(), None)
+
+
+def bump_articles_version() -> None:
+    """
+    Инвалидирует закэшированные страницы. Версия увеличивается сразу и еще раз
+    после коммита: иначе параллельный запрос мог бы закэшировать под новой
+    версией данные, прочитанные до коммита.
+    """
+    _bump()
+    transaction.on_commit(_bump)
+
+
+async def _aversion() -> int:
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, _initial_version(), None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+async def aget_or_build(key_parts, build) -> bytes:
+    """
+    Возвращает байты страницы из кэша или строит их через `await build()`.
+    key_parts — параметры запроса, однозначно определяющие страницу.
+    """
+    version = await _aversion()
+    key = "blog:articles:list:%s:%s" % (version, ":".join(map(str, key_parts)))
+    body = await cache.aget(key)
+    if body is not None:
+        return body
+
+    lock_key = f"{key}:lock"
+    if await cache.aadd(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            with use_primary():
+                body = await build()
+            await cache.aset(key, body, settings.BLOG_LIST_CACHE_TIMEOUT)
+        finally:
+            await cache.adelete(lock_key)
+        return body
+
+    # Страницу уже строит другой запрос — ждем его результат
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_STEP)
+        body = await cache.aget(key)
+        if body is not None:
+            return body
+    return await build()
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.services import backfill_article_summaries
+
+
+class Command(BaseCommand):
+    help = "Заполняет отрывок, число слов и время чтения у существующих статей пачками."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Пересчитать все статьи, а не только незаполненные.",
+        )
+
+    def handle(self, *args, **options):
+        updated = backfill_article_summaries(
+            batch_size=options["batch_size"], only_missing=not options["all"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Обновлено статей: {updated}."))
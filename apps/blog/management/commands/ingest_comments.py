@@ -0,0 +1,43 @@
+import json
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+
+from apps.blog.services import ingest_comments, iter_lines
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает комментарии из NDJSON-файла (или stdin) пачками: "
+        'по одному {"article_id": ..., "content": ...} в строке.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к NDJSON-файлу или '-' для stdin.")
+        parser.add_argument("--author", required=True, help="Имя пользователя-автора.")
+        parser.add_argument(
+            "--chunk-size", type=int, default=settings.BLOG_INGEST_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(username=options["author"])
+        except User.DoesNotExist:
+            raise CommandError(f"Пользователь '{options['author']}' не найден.")
+
+        stream = (
+            sys.stdin.buffer if options["path"] == "-" else open(options["path"], "rb")
+        )
+        try:
+            lines = iter_lines(stream, settings.BLOG_INGEST_MAX_LINE_BYTES)
+            for event in ingest_comments(author, lines, options["chunk_size"]):
+                line = json.dumps(event, ensure_ascii=False)
+                if event["event"] == "error":
+                    self.stderr.write(line)
+                else:
+                    self.stdout.write(line)
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает счетчики статей и комментариев (counter cache) и исправляет расхождения."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать расхождения, ничего не изменяя.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        stats = rebuild_counters(
+            dry_run=options["dry_run"], batch_size=options["batch_size"]
+        )
+        prefix = "Найдено расхождений" if options["dry_run"] else "Исправлено"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}: отсутствующих {stats['created']}, "
+                f"неверных {stats['fixed']}, лишних {stats['reset']}."
+            )
+        )
@@ -0,0 +1,92 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+from django.db import connection
+
+from apps.blog.seeding import seed_blog
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует синтетических пользователей, категории, статьи и комментарии "
+        "пачками bulk_create (воспроизводимо при одинаковом --seed)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--articles", type=int, default=10000)
+        parser.add_argument("--comments", type=int, default=100000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix", default="seed", help="Префикс имен пользователей и категорий."
+        )
+        parser.add_argument("--password", default="seed-password")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--author-alpha",
+            type=float,
+            default=1.0,
+            help="Показатель степенного распределения статей по авторам (0 — равномерно).",
+        )
+        parser.add_argument(
+            "--comment-alpha",
+            type=float,
+            default=1.2,
+            help="Показатель степенного распределения комментариев по статьям (0 — равномерно).",
+        )
+        parser.add_argument(
+            "--uncategorized",
+            type=float,
+            default=0.2,
+            help="Доля статей без категории.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Число параллельных процессов."
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if User.objects.filter(username=f"{prefix}0").exists():
+            raise CommandError(
+                f"Пользователи с префиксом '{prefix}' уже есть — укажите другой --prefix."
+            )
+        workers = options["workers"]
+        if workers > 1 and connection.vendor == "sqlite":
+            # SQLite допускает одного писателя: процессы только ждали бы блокировку
+            self.stderr.write("SQLite: параллельная запись невозможна, --workers 1.")
+            workers = 1
+
+        started = time.monotonic()
+
+        def progress(kind, done, total):
+            if options["verbosity"] >= 2 or done == total:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f"{kind}: {done}/{total} ({elapsed:.1f} с)")
+
+        try:
+            created = seed_blog(
+                users=options["users"],
+                categories=options["categories"],
+                articles=options["articles"],
+                comments=options["comments"],
+                seed=options["seed"],
+                prefix=prefix,
+                password=options["password"],
+                batch_size=options["batch_size"],
+                author_alpha=options["author_alpha"],
+                comment_alpha=options["comment_alpha"],
+                uncategorized=options["uncategorized"],
+                workers=workers,
+                progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано: пользователей {created['users']}, категорий "
+                f"{created['categories']}, статей {created['articles']}, "
+                f"комментариев {created['comments']} за {time.monotonic() - started:.1f} с."
+            )
+        )
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:11
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    Article = apps.get_model("blog", "Article")
+    Comment = apps.get_model("blog", "Comment")
+    Counter = apps.get_model("blog", "Counter")
+
+    counters = [Counter(key="articles", value=Article.objects.count())]
+    for row in (
+        Article.objects.exclude(category_id=None)
+        .values("category_id")
+        .annotate(n=Count("id"))
+        .order_by()
+    ):
+        counters.append(
+            Counter(key=f"category:{row['category_id']}:articles", value=row["n"])
+        )
+    for row in Comment.objects.values("article_id").annotate(n=Count("id")).order_by():
+        counters.append(
+            Counter(key=f"article:{row['article_id']}:comments", value=row["n"])
+        )
+    Counter.objects.bulk_create(counters, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0002_comment"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "key",
+                    models.CharField(
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Ключ",
+                    ),
+                ),
+                ("value", models.BigIntegerField(default=0, verbose_name="Значение")),
+            ],
+            options={
+                "verbose_name": "Счетчик",
+                "verbose_name_plural": "Счетчики",
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,138 @@
+"""
+Полнотекстовый поиск по статьям (см. apps/blog/search.py).
+
+SQL записан здесь же, а не импортируется из приложения: миграция должна
+выполнять одно и то же независимо от последующих правок кода.
+
+PostgreSQL — без перезаписи и долгой блокировки blog_article:
+- колонка search_vector добавляется как обычная nullable-колонка (только
+  изменение каталога), ее поддерживает триггер BEFORE INSERT/UPDATE;
+- существующие строки заполняются пачками по id, каждая пачка — отдельная
+  короткая транзакция (миграция неатомарная);
+- GIN-индекс строится через CREATE INDEX CONCURRENTLY. Если построение
+  прервется, индекс останется INVALID — его нужно удалить и повторить миграцию.
+
+SQLite — FTS5-таблица с внешним содержимым и триггеры синхронизации.
+"""
+
+from django.db import migrations
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({row}.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}.content, '')), 'B')"
+)
+
+POSTGRES_INSTALL = [
+    "ALTER TABLE blog_article ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION blog_article_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR.format(row="NEW")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS blog_article_search_vector_trg ON blog_article",
+    """
+    CREATE TRIGGER blog_article_search_vector_trg
+    BEFORE INSERT OR UPDATE OF title, content ON blog_article
+    FOR EACH ROW EXECUTE FUNCTION blog_article_search_vector_update()
+    """,
+]
+
+POSTGRES_BACKFILL = f"""
+    UPDATE blog_article SET search_vector = {SEARCH_VECTOR.format(row="blog_article")}
+    WHERE id > %s AND id <= %s AND search_vector IS NULL
+"""
+
+POSTGRES_INDEX = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS blog_article_search_gin "
+    "ON blog_article USING GIN (search_vector)"
+)
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX CONCURRENTLY IF EXISTS blog_article_search_gin",
+    "DROP TRIGGER IF EXISTS blog_article_search_vector_trg ON blog_article",
+    "DROP FUNCTION IF EXISTS blog_article_search_vector_update()",
+    "ALTER TABLE blog_article DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blog_article_fts USING fts5(
+        title, content, content='blog_article', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_article_fts_ai AFTER INSERT ON blog_article BEGIN
+        INSERT INTO blog_article_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_article_fts_ad AFTER DELETE ON blog_article BEGIN
+        INSERT INTO blog_article_fts(blog_article_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_article_fts_au AFTER UPDATE OF title, content
+    ON blog_article BEGIN
+        INSERT INTO blog_article_fts(blog_article_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO blog_article_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "INSERT INTO blog_article_fts(blog_article_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS blog_article_fts_ai",
+    "DROP TRIGGER IF EXISTS blog_article_fts_ad",
+    "DROP TRIGGER IF EXISTS blog_article_fts_au",
+    "DROP TABLE IF EXISTS blog_article_fts",
+]
+
+
+def _backfill_postgres(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT max(id) FROM blog_article")
+        max_id = cursor.fetchone()[0] or 0
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            # Вне транзакции миграции: каждая пачка фиксируется сразу
+            cursor.execute(POSTGRES_BACKFILL, [start, start + BACKFILL_BATCH_SIZE])
+
+
+def install(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for sql in POSTGRES_INSTALL:
+            schema_editor.execute(sql)
+        _backfill_postgres(schema_editor)
+        schema_editor.execute(POSTGRES_INDEX)
+    elif vendor == "sqlite":
+        for sql in SQLITE_INSTALL:
+            schema_editor.execute(sql)
+
+
+def uninstall(apps, schema_editor):
+    statements = {"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL}
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    # Пачки backfill и CREATE INDEX CONCURRENTLY — вне общей транзакции
+    atomic = False
+
+    dependencies = [
+        ("blog", "0003_counter"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
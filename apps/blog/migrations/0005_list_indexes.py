@@ -0,0 +1,65 @@
+from django.db import migrations, models
+
+
+class AddIndexConcurrentlyIfPostgres(migrations.AddIndex):
+    """
+    На PostgreSQL создает индекс через CREATE INDEX CONCURRENTLY, не блокируя
+    запись в таблицу, на остальных СУБД ведет себя как обычный AddIndex.
+    Если CONCURRENTLY-построение прервется, индекс останется INVALID —
+    его нужно удалить вручную и повторить миграцию.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.add_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.remove_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, self.index)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    atomic = False
+
+    dependencies = [
+        ("blog", "0004_article_search"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name="article",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="blog_article_created_id_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name="article",
+            index=models.Index(
+                fields=["category", "-created_at"], name="blog_article_cat_created_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name="article",
+            index=models.Index(
+                fields=["author", "-created_at"], name="blog_article_auth_created_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name="comment",
+            index=models.Index(
+                fields=["article", "created_at", "id"],
+                name="blog_comment_art_created_idx",
+            ),
+        ),
+    ]
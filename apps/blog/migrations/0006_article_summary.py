@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Отрывок'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='reading_time',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Время чтения (мин)'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Число слов'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_article_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleRendition',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rendition', serialize=False, to='blog.article', verbose_name='Статья')),
+                ('payload', models.BinaryField(verbose_name='JSON')),
+                ('rendered_at', models.DateTimeField(verbose_name='Дата построения')),
+            ],
+            options={
+                'verbose_name': 'Представление статьи',
+                'verbose_name_plural': 'Представления статей',
+            },
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models import DEFERRED
 from django.contrib.auth.models import User
 from django.utils.text import slugify
 
+from .summary import summarize
+
 
 class Category(models.Model):
     name = models.CharField(
@@ -43,6 +46,20 @@ class Article(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")
 
+    # Считаются из content при сохранении (см. apps.blog.summary); NULL — еще
+    # не заполнено командой backfill_article_summaries
+    excerpt = models.TextField(
+        null=True, blank=True, editable=False, verbose_name="Отрывок"
+    )
+    word_count = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, verbose_name="Число слов"
+    )
+    reading_time = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, verbose_name="Время чтения (мин)"
+    )
+
+    SUMMARY_FIELDS = ("excerpt", "word_count", "reading_time")
+
     # Можно добавить поле slug для статьи, если нужны человекочитаемые URL для статей
     # slug = models.SlugField(max_length=220, unique=True, blank=True)
 
@@ -51,6 +68,28 @@ class Article(models.Model):
     #         self.slug = slugify(self.title) # или более сложная логика для уникальности
     #     super().save(*args, **kwargs)
 
+    def refresh_summary(self) -> None:
+        """Пересчитывает excerpt, word_count и reading_time из content."""
+        for name, value in summarize(self.content).items():
+            setattr(self, name, value)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        content_loaded = "content" not in self.get_deferred_fields()
+        if content_loaded and (update_fields is None or "content" in update_fields):
+            self.refresh_summary()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.SUMMARY_FIELDS}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем категорию на момент загрузки: счетчики статей по категориям
+        # должны учесть ее смену при сохранении (см. apps.blog.signals)
+        instance._loaded_category_id = instance.__dict__.get("category_id", DEFERRED)
+        return instance
+
     def __str__(self):
         return self.title
 
@@ -58,6 +97,19 @@ class Article(models.Model):
         verbose_name = "Статья"
         verbose_name_plural = "Статьи"
         ordering = ["-created_at"]
+        # Индексы под реальные запросы: лента (keyset по created_at, id),
+        # фильтры по категории и автору (админка) с сортировкой по дате
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"], name="blog_article_created_id_idx"
+            ),
+            models.Index(
+                fields=["category", "-created_at"], name="blog_article_cat_created_idx"
+            ),
+            models.Index(
+                fields=["author", "-created_at"], name="blog_article_auth_created_idx"
+            ),
+        ]
 
 
 class Comment(models.Model):
@@ -83,3 +135,53 @@ class Comment(models.Model):
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ["-created_at"]  # Сначала новые комментарии
+        # Комментарии статьи в порядке created_at (в обе стороны) без сортировки
+        indexes = [
+            models.Index(
+                fields=["article", "created_at", "id"],
+                name="blog_comment_art_created_idx",
+            ),
+        ]
+
+
+class Counter(models.Model):
+    """
+    Счетчик (counter cache), поддерживаемый при записи, чтобы списки не
+    выполняли COUNT(*) на каждый запрос. Ключи формирует apps.blog.counters.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True, verbose_name="Ключ")
+    value = models.BigIntegerField(default=0, verbose_name="Значение")
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+    class Meta:
+        verbose_name = "Счетчик"
+        verbose_name_plural = "Счетчики"
+
+
+class ArticleRendition(models.Model):
+    """
+    Готовое публичное JSON-представление статьи (байты формы ArticleOutSchema).
+    Поддерживается apps.blog.renditions; rendered_at меняется при каждом
+    пересчете (в том числе после переименования автора или категории) и служит
+    версией представления для ETag / Last-Modified.
+    """
+
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rendition",
+        verbose_name="Статья",
+    )
+    payload = models.BinaryField(verbose_name="JSON")
+    rendered_at = models.DateTimeField(verbose_name="Дата построения")
+
+    def __str__(self):
+        return f"JSON статьи {self.article_id}"
+
+    class Meta:
+        verbose_name = "Представление статьи"
+        verbose_name_plural = "Представления статей"
@@ -0,0 +1,89 @@
+import base64
+import binascii
+import datetime
+import json
+from operator import attrgetter
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import Q
+from ninja.errors import HttpError
+
+# Курсор — это непрозрачная для клиента строка: base64 от JSON-списка значений
+# ключа сортировки последней отданной строки, например ["2024-05-01T10:00:00.123456+00:00", 42].
+
+
+def clamp_page_size(page_size: int) -> int:
+    """Ограничивает размер страницы диапазоном [1, BLOG_MAX_PAGE_SIZE]."""
+    return max(1, min(page_size, settings.BLOG_MAX_PAGE_SIZE))
+
+
+def encode_cursor(*values) -> str:
+    """Кодирует значения ключа сортировки в курсор."""
+    payload = [
+        value.isoformat() if isinstance(value, datetime.datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Декодирует курсор в список значений. Некорректный курсор — 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HttpError(400, "Некорректный курсор пагинации.")
+    if not isinstance(values, list):
+        raise HttpError(400, "Некорректный курсор пагинации.")
+    return values
+
+
+def decode_created_at_cursor(cursor: str):
+    """Декодирует курсор вида (created_at, id)."""
+    values = decode_cursor(cursor)
+    try:
+        created_at, pk = values
+        created_at = datetime.datetime.fromisoformat(created_at)
+        pk = int(pk)
+    except (TypeError, ValueError):
+        raise HttpError(400, "Некорректный курсор пагинации.")
+    return created_at, pk
+
+
+def keyset_queryset(qs, cursor: Optional[str], descending: bool = True):
+    """
+    Упорядочивает выборку по (created_at, id) и, если передан курсор,
+    отбрасывает всё до него. Условие записано так, чтобы БД могла пройти
+    по индексу диапазоном по created_at, а не сканировать всё с начала (OFFSET).
+    """
+    if descending:
+        qs = qs.order_by("-created_at", "-id")
+    else:
+        qs = qs.order_by("created_at", "id")
+    if cursor:
+        created_at, pk = decode_created_at_cursor(cursor)
+        if descending:
+            qs = qs.filter(
+                Q(created_at__lte=created_at),
+                Q(created_at__lt=created_at) | Q(id__lt=pk),
+            )
+        else:
+            qs = qs.filter(
+                Q(created_at__gte=created_at),
+                Q(created_at__gt=created_at) | Q(id__gt=pk),
+            )
+    return qs
+
+
+def split_page(rows: list, page_size: int, key=attrgetter("created_at", "id")):
+    """
+    Принимает page_size + 1 строк и возвращает (строки страницы, курсор следующей страницы).
+    Лишняя строка нужна только чтобы узнать, есть ли следующая страница, без COUNT(*).
+    key достает (created_at, id) из строки: по умолчанию — из атрибутов модели.
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(*key(rows[-1]))
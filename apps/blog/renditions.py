@@ -0,0 +1,154 @@
+"""
+Готовое JSON-представление статей (materialized rendition).
+
+Для каждой статьи в ArticleRendition хранятся байты ее публичного JSON (форма
+ArticleOutSchema) и время их построения rendered_at, из которого строятся ETag
+и Last-Modified. Детальный эндпоинт отдает байты как есть, а страницы списка
+склеиваются из готовых фрагментов — без select_related, pydantic и повторного
+кодирования.
+
+Версия — rendered_at, а не updated_at статьи: имена автора и категории входят
+в представление, но их переименование статью не сохраняет.
+
+Представление пересчитывается при записи статьи, переименовании автора и
+изменении/удалении категории (apps.blog.signals). Пути, не отправляющие
+сигналы (bulk_create, QuerySet.update), вызывают refresh явно. Отсутствующие
+представления заполняются лениво при чтении: пересчет идет на primary, и его
+результат используется сразу, без повторного чтения — реплика еще может не
+видеть только что записанное представление.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import router
+from django.utils import timezone
+
+from .models import Article, ArticleRendition
+from .serializers import ARTICLE_COLUMNS, article_dict, dumps
+
+
+def refresh(article_ids, rendered_at=None) -> dict:
+    """
+    Пересчитывает представления статей (пачками по BLOG_RENDITION_BATCH_SIZE:
+    один SELECT и один upsert на пачку) и возвращает {id: bytes}.
+    Несуществующие id пропускаются. rendered_at — время построения (по умолчанию
+    текущее время на каждую пачку).
+    """
+    ids = list(article_ids)
+    batch_size = settings.BLOG_RENDITION_BATCH_SIZE
+    payloads = {}
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start : start + batch_size]
+        payloads.update(_refresh_batch(batch, rendered_at or timezone.now()))
+    return payloads
+
+
+def _refresh_batch(ids: list, rendered_at) -> dict:
+    payloads = {}
+    renditions = []
+    # Читаем с той же БД, куда пишем: представление с отстающей реплики
+    # затерло бы более свежее
+    rows = (
+        Article.objects.using(router.db_for_write(ArticleRendition))
+        .filter(id__in=ids)
+        .order_by()
+        .values_list(*ARTICLE_COLUMNS)
+    )
+    for row in rows:
+        payload = dumps(article_dict(row))
+        payloads[row[0]] = payload
+        renditions.append(
+            ArticleRendition(
+                article_id=row[0], payload=payload, rendered_at=rendered_at
+            )
+        )
+    ArticleRendition.objects.bulk_create(
+        renditions,
+        update_conflicts=True,
+        unique_fields=["article"],
+        update_fields=["payload", "rendered_at"],
+    )
+    return payloads
+
+
+def refresh_queryset(qs) -> int:
+    """Пересчитывает представления всех статей выборки. Возвращает их число."""
+    ids = list(qs.order_by().values_list("id", flat=True))
+    refresh(ids)
+    return len(ids)
+
+
+def forget(article_ids) -> None:
+    ArticleRendition.objects.filter(article_id__in=list(article_ids)).delete()
+
+
+async def aget(article_id: int):
+    """(rendered_at, bytes) готового представления или None, если его еще нет."""
+    row = await (
+        ArticleRendition.objects.filter(article_id=article_id)
+        .values_list("rendered_at", "payload")
+        .afirst()
+    )
+    if row is None:
+        return None
+    return row[0], bytes(row[1])  # psycopg отдает bytea как memoryview
+
+
+async def arebuild(article_id: int):
+    """
+    Пересчитывает представление статьи (на primary) и возвращает
+    (rendered_at, bytes) этого же пересчета. None — статьи нет.
+    """
+    rendered_at = timezone.now()
+    payloads = await sync_to_async(refresh)([article_id], rendered_at)
+    if article_id not in payloads:
+        return None
+    return rendered_at, payloads[article_id]
+
+
+async def aload(article_id: int):
+    """
+    (rendered_at, bytes) представления статьи; при отсутствии оно
+    пересчитывается. None — статьи нет.
+    """
+    stored = await aget(article_id)
+    if stored is None:
+        stored = await arebuild(article_id)
+    return stored
+
+
+async def aversion(article_id: int):
+    """
+    rendered_at представления статьи (без чтения самих байтов) или None, если
+    представления еще нет (тогда — arebuild).
+    """
+    return await (
+        ArticleRendition.objects.filter(article_id=article_id)
+        .values_list("rendered_at", flat=True)
+        .afirst()
+    )
+
+
+async def afill(payloads: dict) -> dict:
+    """
+    Дополняет {id: bytes | None} недостающими представлениями (пересчитывая
+    их) и возвращает {id: bytes}. Статьи, удаленные в процессе, выпадают.
+    """
+    missing = [pk for pk, payload in payloads.items() if payload is None]
+    filled = {
+        pk: bytes(payload) for pk, payload in payloads.items() if payload is not None
+    }
+    if missing:
+        filled.update(await sync_to_async(refresh)(missing))
+    return filled
+
+
+def list_body(payloads: list, next_cursor, count=None) -> bytes:
+    """
+    Тело страницы списка {"count"?, "results", "next_cursor"} из готовых
+    фрагментов — байт в байт как json.dumps того же словаря.
+    """
+    parts = [] if count is None else [b'"count": ' + dumps(count)]
+    parts.append(b'"results": [' + b", ".join(payloads) + b"]")
+    parts.append(b'"next_cursor": ' + dumps(next_cursor))
+    return b"{" + b", ".join(parts) + b"}"
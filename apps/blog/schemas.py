@@ -1,6 +1,6 @@
 from ninja import Schema
 from pydantic import Field
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import datetime
 
 
@@ -30,6 +30,19 @@ class ArticleOutSchema(Schema):
     # slug: Optional[str] = None # Если slug есть в модели Article
 
 
+# Краткое представление статьи для ленты (view=summary): без content
+class ArticleSummarySchema(Schema):
+    id: int
+    title: str
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None  # в минутах
+    author: AuthorSchema
+    category: Optional[CategorySchema] = None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
 # Схема для создания статьи
 class ArticleCreateSchema(Schema):
     title: str = Field(..., min_length=5, max_length=200)
@@ -69,13 +82,37 @@ class CommentUpdateSchema(Schema):
     content: Optional[str] = Field(None, min_length=1)
 
 
-# Схема для листинга комментариев (count + results)
+# Схема для листинга комментариев (count + results; в режиме курсора — results + next_cursor)
 class CommentListSchema(Schema):
-    count: int
+    count: Optional[int] = None
     results: List[CommentOutSchema]
+    next_cursor: Optional[str] = None
 
 
 # Схема для листинга статей (count + results)
+# В режиме курсора count не возвращается, а next_cursor указывает на следующую страницу
 class ArticleListSchema(Schema):
-    count: int
+    count: Optional[int] = None
     results: List[ArticleOutSchema]
+    next_cursor: Optional[str] = None
+
+
+# --- Схемы для пакетного создания статей ---
+
+
+# Элементы валидируются по одному схемой ArticleCreateSchema,
+# чтобы ошибка в одном элементе не отклоняла весь пакет
+class ArticleBulkCreateSchema(Schema):
+    items: List[Dict[str, Any]]
+
+
+class ArticleBulkItemResultSchema(Schema):
+    index: int
+    id: Optional[int] = None
+    errors: Optional[List[str]] = None
+
+
+class ArticleBulkResultSchema(Schema):
+    created: int
+    failed: int
+    results: List[ArticleBulkItemResultSchema]
@@ -0,0 +1,74 @@
+"""
+Полнотекстовый поиск по статьям.
+
+- PostgreSQL: колонка blog_article.search_vector (tsvector, заголовок с весом A,
+  текст с весом B), которую заполняет триггер, и GIN-индекс по ней.
+- SQLite: FTS5-таблица blog_article_fts с внешним содержимым (content=blog_article),
+  которую синхронизируют триггеры на INSERT/UPDATE/DELETE.
+
+В обоих случаях индекс поддерживает сама БД, поэтому он остается согласованным
+при любой записи: через ORM, bulk_create, QuerySet.update или админку.
+Ни колонка, ни FTS-таблица не описаны в модели — их создает миграция 0004
+(там же весь DDL). Конфигурация текста в ней зашита как 'simple' — при смене
+SEARCH_CONFIG нужна новая миграция.
+
+Важно для SQLite: если будущая миграция пересоздает таблицу blog_article
+(например, AddField с default), триггеры пропадут — такая миграция должна
+создать их заново.
+"""
+
+from django.db import connection
+
+SEARCH_CONFIG = "simple"
+
+
+def _fts5_query(q: str) -> str:
+    # Каждое слово берем в кавычки: пользовательский ввод не должен
+    # интерпретироваться как синтаксис запросов FTS5 (NEAR, *, ^, столбцы и т.п.)
+    return " ".join('"%s"' % term.replace('"', '""') for term in q.split())
+
+
+def search_article_ids(q: str, limit: int, after=None) -> list:
+    """
+    Возвращает до `limit` пар (score, id), отсортированных по релевантности
+    (score по убыванию, затем id по убыванию). `after` — (score, id) последней
+    строки предыдущей страницы для keyset-пагинации.
+    """
+    vendor = connection.vendor
+    params = []
+    if vendor == "postgresql":
+        # ::float8 — чтобы score точно совпадал между страницами при сравнении с курсором
+        inner = (
+            "SELECT a.id, ts_rank(a.search_vector, query)::float8 AS score "
+            "FROM blog_article a, websearch_to_tsquery(%s, %s) query "
+            "WHERE a.search_vector @@ query"
+        )
+        params += [SEARCH_CONFIG, q]
+    elif vendor == "sqlite":
+        terms = _fts5_query(q)
+        if not terms:
+            return []
+        # bm25 тем меньше, чем релевантнее; инвертируем, чтобы сортировать по убыванию
+        inner = (
+            "SELECT rowid AS id, -bm25(blog_article_fts, 10.0, 1.0) AS score "
+            "FROM blog_article_fts WHERE blog_article_fts MATCH %s"
+        )
+        params.append(terms)
+    else:
+        # Запасной вариант без индекса для прочих СУБД
+        inner = (
+            "SELECT id, 0.0 AS score FROM blog_article "
+            "WHERE title LIKE %s OR content LIKE %s"
+        )
+        params += [f"%{q}%", f"%{q}%"]
+
+    sql = f"SELECT id, score FROM ({inner}) matches"
+    if after is not None:
+        sql += " WHERE score < %s OR (score = %s AND id < %s)"
+        params += [after[0], after[0], after[1]]
+    sql += " ORDER BY score DESC, id DESC LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(score, pk) for pk, score in cursor.fetchall()]
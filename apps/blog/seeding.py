@@ -0,0 +1,260 @@
+"""
+Генерация синтетических данных блога (команда seed_blog, бенчмарки).
+
+Все строки вставляются через bulk_create пачками, у всех пользователей один
+заранее посчитанный хэш пароля, сводка статей (excerpt и т.п.) считается один
+раз на шаблон текста. Каждая пачка генерируется своим генератором случайных
+чисел, зависящим только от seed и номера первой строки пачки, поэтому данные
+одинаковы при любом числе процессов (--workers) и порядке выполнения пачек.
+
+Распределения — степенные (закон Ципфа): у статьи ранга r вес 1 / r**alpha.
+author_alpha задает, сколько статей пишут самые активные авторы,
+comment_alpha — сколько комментариев собирают самые популярные статьи;
+alpha = 0 — равномерное распределение.
+
+id созданных строк берутся из результата bulk_create каждой пачки (нужен
+backend, возвращающий id из bulk insert: PostgreSQL, SQLite 3.35+).
+
+Сигналы bulk_create не отправляет: готовые представления статей строятся в
+пачках, счетчики пересчитываются один раз в конце (rebuild_counters).
+"""
+
+import bisect
+import itertools
+import multiprocessing
+import random
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+
+from . import list_cache, renditions
+from .counters import rebuild_counters
+from .models import Article, Category, Comment
+
+WORDS = (
+    "django ninja postgres sqlite cache index query cursor stream json python "
+    "worker latency replica token article comment category benchmark release "
+    "deploy schema migration signal router queue metric trace profile"
+).split()
+TEMPLATES = 200  # различных текстов статей
+
+# Данные для пачек текущего процесса (в дочерних процессах — через initializer)
+_state = {}
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    """Предложение из words случайных слов WORDS (тексты статей и комментариев)."""
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def zipf_weights(n: int, alpha: float) -> list:
+    """Накопленные веса рангов 1..n для выбора через bisect."""
+    return list(itertools.accumulate(1 / (rank**alpha) for rank in range(1, n + 1)))
+
+
+def _pick(rng: random.Random, population: list, cum_weights: list):
+    return population[bisect.bisect(cum_weights, rng.random() * cum_weights[-1])]
+
+
+def _rng(kind: str, start: int) -> random.Random:
+    return random.Random(f"{_state['seed']}:{kind}:{start}")
+
+
+def _chunks(total: int, batch_size: int) -> list:
+    return [
+        (start, min(start + batch_size, total)) for start in range(0, total, batch_size)
+    ]
+
+
+def _init_worker(state: dict) -> None:
+    django.setup()
+    _state.update(state)
+
+
+def _run(kind: str, fn, chunks: list, workers: int, progress) -> list:
+    """
+    Выполняет fn для каждой пачки — в текущем процессе или в пуле процессов.
+    fn возвращает (start, stop, ids): ids — id созданных строк (список, который
+    вернул bulk_create) или None, если они не нужны. Результат — id всех пачек
+    в порядке номеров строк: при нескольких процессах id распределяются между
+    пачками в произвольном порядке.
+    """
+    done = 0
+    total = chunks[-1][1] if chunks else 0
+    created = {}
+    if workers <= 1:
+        results = map(fn, chunks)
+    else:
+        # Дочерние процессы открывают свои соединения, унаследованные закрываем
+        connections.close_all()
+        pool = multiprocessing.Pool(workers, _init_worker, (dict(_state),))
+        results = pool.imap_unordered(fn, chunks)
+    try:
+        for start, stop, ids in results:
+            done += stop - start
+            if ids is not None:
+                created[start] = ids
+            if progress:
+                progress(kind, done, total)
+    finally:
+        if workers > 1:
+            pool.close()
+            pool.join()
+    return [pk for start in sorted(created) for pk in created[start]]
+
+
+def _users_chunk(chunk) -> tuple:
+    start, stop = chunk
+    users = User.objects.bulk_create(
+        User(username=f"{_state['prefix']}{i}", password=_state["password"])
+        for i in range(start, stop)
+    )
+    return start, stop, [user.id for user in users]
+
+
+def _articles_chunk(chunk) -> tuple:
+    start, stop = chunk
+    rng = _rng("articles", start)
+    templates, users, categories = (
+        _state["templates"],
+        _state["users"],
+        _state["categories"],
+    )
+    articles = []
+    for i in range(start, stop):
+        template = rng.choice(templates)
+        articles.append(
+            Article(
+                title=f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} #{i}",
+                content=template.content,
+                excerpt=template.excerpt,
+                word_count=template.word_count,
+                reading_time=template.reading_time,
+                author_id=_pick(rng, users, _state["author_weights"]),
+                category_id=(
+                    rng.choice(categories)
+                    if categories and rng.random() >= _state["uncategorized"]
+                    else None
+                ),
+            )
+        )
+    with transaction.atomic():
+        Article.objects.bulk_create(articles)
+        renditions.refresh(a.id for a in articles)
+    return start, stop, [a.id for a in articles]
+
+
+def _comments_chunk(chunk) -> tuple:
+    start, stop = chunk
+    rng = _rng("comments", start)
+    users, articles = _state["users"], _state["articles"]
+    Comment.objects.bulk_create(
+        Comment(
+            article_id=_pick(rng, articles, _state["comment_weights"]),
+            author_id=rng.choice(users),
+            content=random_text(rng, rng.randint(3, 40)),
+        )
+        for _ in range(start, stop)
+    )
+    return start, stop, None
+
+
+def seed_blog(
+    *,
+    users: int,
+    categories: int,
+    articles: int,
+    comments: int,
+    seed: int = 0,
+    prefix: str = "seed",
+    password: str = "seed-password",
+    batch_size: int = 5000,
+    author_alpha: float = 1.0,
+    comment_alpha: float = 1.2,
+    uncategorized: float = 0.2,
+    workers: int = 1,
+    progress=None,
+) -> dict:
+    """
+    Создает пользователей {prefix}0..{prefix}N (пароль password), категории,
+    статьи и комментарии. Возвращает число созданных объектов по типам.
+    progress(kind, done, total) вызывается после каждой пачки.
+    Некорректные параметры — ValueError.
+    """
+    if min(users, categories, articles, comments) < 0:
+        raise ValueError("Число объектов не может быть отрицательным.")
+    if batch_size < 1:
+        raise ValueError("batch_size должен быть положительным.")
+    if users == 0 and (articles or comments):
+        raise ValueError("Для статей и комментариев нужен хотя бы один пользователь.")
+    if not 0 <= uncategorized <= 1:
+        raise ValueError("uncategorized — доля от 0 до 1.")
+    rng = random.Random(seed)
+    _state.clear()
+    _state.update(
+        seed=seed,
+        prefix=prefix,
+        password=make_password(password),
+        uncategorized=uncategorized,
+    )
+
+    # id в порядке номеров пользователей, а не по возрастанию id (см. _run)
+    user_ids = _run(
+        "users", _users_chunk, _chunks(users, batch_size), workers, progress
+    )
+    # Какие авторы и статьи окажутся популярными, тоже определяет seed
+    rng.shuffle(user_ids)
+
+    names = [f"{prefix.capitalize()} category {i}" for i in range(categories)]
+    Category.objects.bulk_create(
+        [
+            Category(name=name, slug=f"{prefix}-category-{i}")
+            for i, name in enumerate(names)
+        ],
+        ignore_conflicts=True,
+    )
+    category_ids = list(
+        Category.objects.filter(name__in=names)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+    templates = []
+    for _ in range(TEMPLATES):
+        article = Article(content=random_text(rng, rng.randint(50, 800)))
+        article.refresh_summary()
+        templates.append(article)
+    _state.update(
+        users=user_ids,
+        categories=category_ids,
+        templates=templates,
+        author_weights=zipf_weights(len(user_ids), author_alpha),
+    )
+    article_ids = _run(
+        "articles", _articles_chunk, _chunks(articles, batch_size), workers, progress
+    )
+    rng.shuffle(article_ids)
+    _state.update(
+        articles=article_ids,
+        comment_weights=zipf_weights(len(article_ids), comment_alpha),
+    )
+    if article_ids:
+        _run(
+            "comments",
+            _comments_chunk,
+            _chunks(comments, batch_size),
+            workers,
+            progress,
+        )
+
+    rebuild_counters(batch_size=batch_size)
+    list_cache.bump_articles_version()
+    _state.clear()
+    return {
+        "users": users,
+        "categories": len(category_ids),
+        "articles": len(article_ids),
+        "comments": comments if article_ids else 0,
+    }
@@ -0,0 +1,100 @@
+"""
+Сериализация ответов блога.
+
+Быстрый путь для списков: строки берутся из QuerySet.values_list() кортежами
+и раскладываются в словари формы ArticleOutSchema / CommentOutSchema без
+создания ORM-объектов и pydantic-моделей. Даты заранее форматируются так же,
+как это делает DjangoJSONEncoder, поэтому весь словарь кодирует C-реализация
+json без вызовов default(), а байты ответа совпадают с выводом схем.
+"""
+
+import json
+from operator import itemgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+def dumps(data) -> bytes:
+    """Кодирует данные в JSON так же, как это делает JsonResponse."""
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def format_datetime(value) -> str:
+    """Дата в формате DjangoJSONEncoder (миллисекунды, "Z" для UTC)."""
+    r = value.isoformat()
+    if value.microsecond:
+        r = r[:23] + r[26:]
+    if r.endswith("+00:00"):
+        r = r.removesuffix("+00:00") + "Z"
+    return r
+
+
+ARTICLE_COLUMNS = (
+    "id",
+    "title",
+    "content",
+    "author_id",
+    "author__username",
+    "category_id",
+    "category__name",
+    "category__slug",
+    "created_at",
+    "updated_at",
+)
+
+COMMENT_COLUMNS = (
+    "id",
+    "article_id",
+    "author_id",
+    "author__username",
+    "content",
+    "created_at",
+    "updated_at",
+)
+
+# Ключ курсора (created_at, id) для кортежей values_list — см. pagination.split_page
+comment_cursor_key = itemgetter(
+    COMMENT_COLUMNS.index("created_at"), COMMENT_COLUMNS.index("id")
+)
+
+
+def article_dict(row: tuple) -> dict:
+    """Кортеж ARTICLE_COLUMNS -> словарь формы ArticleOutSchema."""
+    (
+        pk,
+        title,
+        content,
+        author_id,
+        username,
+        category_id,
+        category_name,
+        category_slug,
+        created_at,
+        updated_at,
+    ) = row
+    return {
+        "id": pk,
+        "title": title,
+        "content": content,
+        "author": {"id": author_id, "username": username},
+        "category": (
+            None
+            if category_id is None
+            else {"id": category_id, "name": category_name, "slug": category_slug}
+        ),
+        "created_at": format_datetime(created_at),
+        "updated_at": format_datetime(updated_at),
+    }
+
+
+def comment_dict(row: tuple) -> dict:
+    """Кортеж COMMENT_COLUMNS -> словарь формы CommentOutSchema."""
+    pk, article_id, author_id, username, content, created_at, updated_at = row
+    return {
+        "id": pk,
+        "article_id": article_id,
+        "author": {"id": author_id, "username": username},
+        "content": content,
+        "created_at": format_datetime(created_at),
+        "updated_at": format_datetime(updated_at),
+    }
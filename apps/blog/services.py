@@ -0,0 +1,360 @@
+import json
+from collections import Counter as Tally
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Exists
+from django.utils import timezone
+from pydantic import ValidationError
+
+from . import counters, list_cache, renditions
+from .models import Article, ArticleRendition, Category, Comment
+from .schemas import ArticleCreateSchema, CommentCreateSchema
+from .serializers import COMMENT_COLUMNS, comment_dict
+from .summary import summarize
+
+
+def _validation_messages(error: ValidationError) -> list:
+    return [
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors()
+    ]
+
+
+def bulk_create_articles(author, items: list) -> list:
+    """
+    Создает статьи пачкой. Каждый элемент валидируется отдельно схемой
+    ArticleCreateSchema, все category_id проверяются одним запросом, вставка
+    идет через bulk_create батчами по BLOG_BULK_BATCH_SIZE в одной транзакции.
+
+    Возвращает результаты по каждому элементу в исходном порядке:
+    {"index": i, "id": ...} для созданных и {"index": i, "errors": [...]} для отклоненных.
+    """
+    results = [{"index": i} for i in range(len(items))]
+    valid = []  # (index, payload)
+    for i, item in enumerate(items):
+        try:
+            valid.append((i, ArticleCreateSchema.model_validate(item)))
+        except ValidationError as e:
+            results[i]["errors"] = _validation_messages(e)
+
+    category_ids = {p.category_id for _, p in valid if p.category_id is not None}
+    existing = set(
+        Category.objects.filter(id__in=category_ids)
+        .order_by()
+        .values_list("id", flat=True)
+    )
+
+    to_create = []  # (index, Article)
+    for i, payload in valid:
+        if payload.category_id is not None and payload.category_id not in existing:
+            results[i]["errors"] = [f"Категория с ID {payload.category_id} не найдена."]
+            continue
+        article = Article(author=author, **payload.dict())
+        # bulk_create не вызывает save() — сводку считаем сами
+        article.refresh_summary()
+        to_create.append((i, article))
+
+    if to_create:
+        articles = [article for _, article in to_create]
+        with transaction.atomic():
+            Article.objects.bulk_create(
+                articles, batch_size=settings.BLOG_BULK_BATCH_SIZE
+            )
+            articles_created(articles)
+        for i, article in to_create:
+            results[i]["id"] = article.id
+    return results
+
+
+def articles_created(articles: list) -> None:
+    """
+    Побочные эффекты создания статей для путей, не отправляющих сигналы
+    post_save (bulk_create): счетчики, готовые представления и версия кэша списка.
+    """
+    counters.add(counters.ARTICLES_KEY, len(articles))
+    per_category = Tally(a.category_id for a in articles if a.category_id is not None)
+    for category_id, n in per_category.items():
+        counters.add(counters.category_key(category_id), n)
+    renditions.refresh(a.id for a in articles)
+    list_cache.bump_articles_version()
+
+
+def update_own_article(article_id: int, author_id: int, changes: dict):
+    """
+    Обновляет статью автора одним условным UPDATE ... WHERE id = ? AND author_id = ?
+    (без загрузки строки и save()). При смене категории тем же условием
+    читается прежняя категория (SELECT ... FOR UPDATE, для счетчиков) вместе
+    с проверкой существования новой.
+
+    Возвращает байты готового представления статьи или None, если у автора
+    такой статьи нет. Несуществующая категория — Category.DoesNotExist.
+    Сигналы post_save не отправляются: счетчики, представление и версия кэша
+    списка обновляются здесь же.
+    """
+    fields = dict(changes)
+    if "content" in fields:
+        fields.update(summarize(fields["content"]))
+    fields["updated_at"] = timezone.now()
+    owned = Article.objects.filter(id=article_id, author_id=author_id)
+    payload = None
+    # Как Model.save(): во внешней транзакции — без лишней пары SAVEPOINT/RELEASE.
+    # Поэтому внутри блока не бросаем исключений, а только возвращаемся
+    with transaction.atomic(savepoint=False):
+        if "category_id" in fields:
+            category_id = fields["category_id"]
+            row = (
+                owned.select_for_update()
+                .annotate(
+                    category_exists=Exists(Category.objects.filter(id=category_id))
+                )
+                .values_list("category_id", "category_exists")
+                .first()
+            )
+            if row is None:
+                return None
+            old_category_id, category_exists = row
+            if category_id is None or category_exists:
+                owned.update(**fields)
+                if category_id != old_category_id:
+                    if old_category_id is not None:
+                        counters.add(counters.category_key(old_category_id), -1)
+                    if category_id is not None:
+                        counters.add(counters.category_key(category_id), 1)
+                payload = renditions.refresh([article_id])[article_id]
+        elif owned.update(**fields):
+            payload = renditions.refresh([article_id])[article_id]
+        else:
+            return None
+    if payload is None:
+        raise Category.DoesNotExist
+    list_cache.bump_articles_version()
+    return payload
+
+
+def _delete_rows(model, **filters) -> int:
+    """
+    DELETE FROM <таблица модели> WHERE <поле> = %s AND ... одним запросом.
+    Возвращает число удаленных строк.
+
+    Для моделей с сигналами post_delete (Article, Comment) QuerySet.delete()
+    загружает каждую строку ради сигналов и каскада. Здесь ни сигналы, ни
+    каскад не выполняются: зависимые строки и счетчики вызывающий удаляет
+    и правит сам. Модели без сигналов удаляются обычным QuerySet.delete() —
+    для них это и так один DELETE.
+    """
+    connection = connections[router.db_for_write(model)]
+    qn = connection.ops.quote_name
+    where = " AND ".join(
+        "%s = %%s" % qn(model._meta.get_field(name).column) for name in filters
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM %s WHERE %s" % (qn(model._meta.db_table), where),
+            list(filters.values()),
+        )
+        return cursor.rowcount
+
+
+def delete_own_article(article_id: int, author_id: int) -> bool:
+    """
+    Удаляет статью автора вместе с комментариями и готовым представлением.
+    Вместо каскада Collector (который загружает каждый комментарий ради
+    сигналов) — по одному DELETE на таблицу; счетчики правятся здесь же.
+    Возвращает False, если у автора такой статьи нет.
+    """
+    owned = Article.objects.filter(id=article_id, author_id=author_id)
+    with transaction.atomic(savepoint=False):
+        # Строка статьи заблокирована до конца транзакции
+        row = owned.select_for_update().values_list("category_id").first()
+        if row is None:
+            return False
+        _delete_rows(Comment, article_id=article_id)
+        ArticleRendition.objects.filter(article_id=article_id).delete()
+        _delete_rows(Article, id=article_id)
+        counters.add(counters.ARTICLES_KEY, -1)
+        if row[0] is not None:
+            counters.add(counters.category_key(row[0]), -1)
+        counters.forget(counters.article_comments_key(article_id))
+    list_cache.bump_articles_version()
+    return True
+
+
+def backfill_article_summaries(batch_size: int = 500, only_missing: bool = True) -> int:
+    """
+    Заполняет excerpt, word_count и reading_time у существующих статей.
+    Идет пачками по id (keyset, без OFFSET), каждая пачка — отдельный
+    bulk_update в своей транзакции. Возвращает число обновленных статей.
+    """
+    qs = Article.objects.order_by("id").only("id", "content")
+    if only_missing:
+        qs = qs.filter(word_count__isnull=True)
+    last_id = 0
+    updated = 0
+    while True:
+        batch = list(qs.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        for article in batch:
+            article.refresh_summary()
+        with transaction.atomic():
+            Article.objects.bulk_update(batch, Article.SUMMARY_FIELDS)
+            # Сводка входит в ответы с fields=: их версия — rendered_at
+            renditions.refresh(article.id for article in batch)
+        updated += len(batch)
+        last_id = batch[-1].id
+    if updated:
+        list_cache.bump_articles_version()
+    return updated
+
+
+def iter_lines(stream, max_line_bytes: int):
+    """
+    Читает поток построчно, не загружая его целиком. Строки длиннее
+    max_line_bytes отдаются как None (их остаток пропускается).
+    """
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        if len(line) > max_line_bytes and not line.endswith(b"\n"):
+            while line and not line.endswith(b"\n"):
+                line = stream.readline(max_line_bytes + 1)
+            yield None
+            continue
+        yield line
+
+
+def _parse_comment_line(raw: bytes):
+    """Разбирает строку NDJSON в (article_id, content) или бросает ValueError."""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        raise ValueError("Строка не является корректным JSON.")
+    if not isinstance(data, dict):
+        raise ValueError("Ожидается JSON-объект.")
+    article_id = data.get("article_id")
+    if not isinstance(article_id, int) or isinstance(article_id, bool):
+        raise ValueError("article_id: ожидается целое число.")
+    try:
+        payload = CommentCreateSchema.model_validate(data)
+    except ValidationError as e:
+        raise ValueError("; ".join(_validation_messages(e)))
+    return article_id, payload.content
+
+
+def _insert_comment_chunk(author, chunk: list):
+    """
+    Вставляет пачку комментариев в одной транзакции. Существование статей
+    проверяется одним запросом на пачку. Возвращает (вставлено, ошибки).
+    """
+    article_ids = {article_id for _, article_id, _ in chunk}
+    existing = set(
+        Article.objects.filter(id__in=article_ids)
+        .order_by()
+        .values_list("id", flat=True)
+    )
+    errors = []
+    comments = []
+    for line_no, article_id, content in chunk:
+        if article_id not in existing:
+            errors.append((line_no, f"Статья с ID {article_id} не найдена."))
+            continue
+        comments.append(Comment(article_id=article_id, author=author, content=content))
+    with transaction.atomic():
+        Comment.objects.bulk_create(comments)
+        comments_created(comments)
+    return len(comments), errors
+
+
+def ingest_comments(author, lines, chunk_size: int):
+    """
+    Потоковая загрузка комментариев из NDJSON (`{"article_id": 1, "content": "..."}`
+    в каждой строке). Генератор событий: ошибки по строкам, прогресс после
+    каждой пачки и итог. В памяти держится не больше одной пачки.
+    """
+    chunk = []
+    processed = inserted = failed = 0
+    line_no = 0
+    for line_no, raw in enumerate(lines, 1):
+        if raw is None:
+            processed += 1
+            failed += 1
+            yield {
+                "event": "error",
+                "line": line_no,
+                "detail": "Строка слишком длинная.",
+            }
+            continue
+        if not raw.strip():
+            continue
+        processed += 1
+        try:
+            article_id, content = _parse_comment_line(raw)
+        except ValueError as e:
+            failed += 1
+            yield {"event": "error", "line": line_no, "detail": str(e)}
+            continue
+        chunk.append((line_no, article_id, content))
+        if len(chunk) >= chunk_size:
+            n, errors = _insert_comment_chunk(author, chunk)
+            chunk = []
+            inserted += n
+            failed += len(errors)
+            for error_line, detail in errors:
+                yield {"event": "error", "line": error_line, "detail": detail}
+            yield {
+                "event": "progress",
+                "line": line_no,
+                "processed": processed,
+                "inserted": inserted,
+                "failed": failed,
+            }
+    if chunk:
+        n, errors = _insert_comment_chunk(author, chunk)
+        inserted += n
+        failed += len(errors)
+        for error_line, detail in errors:
+            yield {"event": "error", "line": error_line, "detail": detail}
+    yield {
+        "event": "done",
+        "line": line_no,
+        "processed": processed,
+        "inserted": inserted,
+        "failed": failed,
+    }
+
+
+def comments_created(comments: list) -> None:
+    """Счетчики комментариев для путей без сигналов post_save (bulk_create)."""
+    for article_id, n in Tally(c.article_id for c in comments).items():
+        counters.add(counters.article_comments_key(article_id), n)
+
+
+def update_own_comment(comment_id: int, author_id: int, content: str):
+    """
+    Обновляет текст комментария автора условным UPDATE ... WHERE id = ? AND
+    author_id = ? и возвращает его словарь формы CommentOutSchema (один SELECT)
+    или None, если у автора такого комментария нет.
+    """
+    owned = Comment.objects.filter(id=comment_id, author_id=author_id)
+    if not owned.update(content=content, updated_at=timezone.now()):
+        return None
+    return comment_dict(owned.values_list(*COMMENT_COLUMNS).get())
+
+
+def delete_own_comment(comment_id: int, author_id: int) -> bool:
+    """
+    Удаляет комментарий автора без загрузки модели (статья нужна только для
+    счетчика). Возвращает False, если у автора такого комментария нет.
+    """
+    owned = Comment.objects.filter(id=comment_id, author_id=author_id)
+    with transaction.atomic(savepoint=False):
+        article_id = (
+            owned.select_for_update().values_list("article_id", flat=True).first()
+        )
+        if article_id is None:
+            return False
+        if _delete_rows(Comment, id=comment_id):
+            counters.add(counters.article_comments_key(article_id), -1)
+    return True
@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import DEFERRED
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import counters, list_cache, renditions
+from .models import Article, Category, Comment
+
+
+@receiver(post_save, sender=Article)
+def article_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:  # loaddata: счетчики потом пересчитывает rebuild_blog_counters
+        renditions.forget([instance.pk])  # представление заполнится при чтении
+        return
+    if created:
+        counters.add(counters.ARTICLES_KEY, 1)
+        if instance.category_id is not None:
+            counters.add(counters.category_key(instance.category_id), 1)
+    else:
+        old_category_id = getattr(instance, "_loaded_category_id", DEFERRED)
+        if old_category_id is not DEFERRED and old_category_id != instance.category_id:
+            if old_category_id is not None:
+                counters.add(counters.category_key(old_category_id), -1)
+            if instance.category_id is not None:
+                counters.add(counters.category_key(instance.category_id), 1)
+    instance._loaded_category_id = instance.category_id
+    renditions.refresh([instance.pk])
+    list_cache.bump_articles_version()
+
+
+@receiver(post_delete, sender=Article)
+def article_deleted(sender, instance, **kwargs):
+    counters.add(counters.ARTICLES_KEY, -1)
+    category_id = getattr(instance, "_loaded_category_id", instance.category_id)
+    if category_id is DEFERRED:
+        category_id = instance.category_id
+    if category_id is not None:
+        counters.add(counters.category_key(category_id), -1)
+    counters.forget(counters.article_comments_key(instance.pk))
+    list_cache.bump_articles_version()
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, raw=False, **kwargs):
+    # Название и slug категории входят в закэшированные страницы списка статей
+    # и в готовые представления статей
+    if not created and not raw:
+        renditions.refresh_queryset(Article.objects.filter(category_id=instance.pk))
+    list_cache.bump_articles_version()
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(sender, instance, **kwargs):
+    # SET_NULL выполняется через QuerySet.update без сигналов — запоминаем статьи
+    instance._article_ids = list(
+        Article.objects.filter(category_id=instance.pk).values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    counters.forget(counters.category_key(instance.pk))
+    renditions.refresh(getattr(instance, "_article_ids", ()))
+    list_cache.bump_articles_version()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def author_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Имя автора входит в закэшированные страницы; новый пользователь статей не имеет
+    if created or update_fields == frozenset({"last_login"}):
+        return
+    if update_fields is None or "username" in update_fields:
+        renditions.refresh_queryset(Article.objects.filter(author_id=instance.pk))
+    list_cache.bump_articles_version()
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.add(counters.article_comments_key(instance.article_id), 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    # При каскадном удалении статьи ее счетчик комментариев удаляется целиком
+    origin_model = getattr(origin, "model", type(origin))
+    if origin_model is Article:
+        return
+    if origin_model is get_user_model():
+        # Удаление пользователя: вместо UPDATE на каждый его комментарий
+        # затронутые счетчики пересчитываются разом в author_deleted
+        origin.__dict__.setdefault("_comment_article_ids", set()).add(
+            instance.article_id
+        )
+        return
+    counters.add(counters.article_comments_key(instance.article_id), -1)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def author_deleted(sender, instance, origin=None, **kwargs):
+    # Комментарии удаляются раньше пользователя, поэтому к первому post_delete
+    # пользователя все затронутые статьи уже собраны. origin может быть и
+    # QuerySet (удаление пачкой): его нельзя проверять на истинность — это
+    # выполнило бы запрос, который после удаления пуст
+    if origin is None:
+        return
+    article_ids = vars(origin).pop("_comment_article_ids", None)
+    if article_ids:
+        counters.recount_article_comments(article_ids)
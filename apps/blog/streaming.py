@@ -0,0 +1,55 @@
+"""
+Потоковые ответы, которые остаются потоковыми и под WSGI, и под ASGI.
+
+Синхронный итератор в StreamingHttpResponse под ASGI Django дочитывает
+через sync_to_async(list) — целиком, до отправки первого байта. Поэтому для
+ASGI-запроса итератор оборачивается в асинхронный, который забирает элементы
+пачками через sync_to_async. Все пачки выполняются в одном потоке запроса
+(thread_sensitive), так что серверный курсор и транзакции ORM остаются
+в том же соединении между пачками.
+"""
+
+import itertools
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+
+def _take(iterator, n: int) -> list:
+    return list(itertools.islice(iterator, n))
+
+
+def _close(iterator) -> None:
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
+async def aiterate(iterable, batch_size: int = 1):
+    """
+    Асинхронный итератор по синхронному iterable: next() выполняется через
+    sync_to_async, по batch_size элементов за переход в поток. Итератор
+    закрывается и при обрыве соединения клиентом.
+    """
+    iterator = iter(iterable)
+    try:
+        while True:
+            batch = await sync_to_async(_take)(iterator, batch_size)
+            if not batch:
+                return
+            for item in batch:
+                yield item
+    finally:
+        await sync_to_async(_close)(iterator)
+
+
+def streaming_response(request, content, content_type: str, batch_size: int = 1):
+    """
+    StreamingHttpResponse из синхронного итератора content; для ASGI-запроса —
+    через aiterate. batch_size — сколько элементов забирать за раз: больше —
+    меньше переходов между потоками, но первый байт уходит позже.
+    """
+    if isinstance(request, ASGIRequest):
+        content = aiterate(content, batch_size)
+    return StreamingHttpResponse(content, content_type=content_type)
@@ -0,0 +1,37 @@
+"""
+Краткие сведения о статье для списков: отрывок, число слов и время чтения.
+
+Считаются один раз при сохранении статьи (Article.save, bulk-пути вызывают
+Article.refresh_summary явно) и хранятся в колонках модели, чтобы лента не
+читала content.
+"""
+
+import math
+
+from django.conf import settings
+from django.utils.text import Truncator
+
+
+def make_excerpt(content: str) -> str:
+    """Начало текста длиной до BLOG_EXCERPT_LENGTH символов, пробелы схлопнуты."""
+    return Truncator(" ".join(content.split())).chars(settings.BLOG_EXCERPT_LENGTH)
+
+
+def count_words(content: str) -> int:
+    return len(content.split())
+
+
+def reading_time(word_count: int) -> int:
+    """Время чтения в минутах (не меньше минуты для непустого текста)."""
+    if not word_count:
+        return 0
+    return math.ceil(word_count / settings.BLOG_READING_SPEED_WPM)
+
+
+def summarize(content: str) -> dict:
+    words = count_words(content)
+    return {
+        "excerpt": make_excerpt(content),
+        "word_count": words,
+        "reading_time": reading_time(words),
+    }
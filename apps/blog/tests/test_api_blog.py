@@ -1,11 +1,38 @@
 import json
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from apps.blog.models import Article, Category, Comment
+from blog_project.tests.query_budget import QueryBudgetMixin
+
+
+class BlogAPITests(QueryBudgetMixin, TestCase):
+    # Максимум запросов к БД на эндпоинт, включая проверку токена (если его нет
+    # в кэше), SAVEPOINT'ы и первое создание строк счетчиков. Потоковые ответы
+    # учитываются только до начала отдачи тела.
+    query_budgets = {
+        "users_register": 7,
+        "create_article": 13,
+        "bulk_create_articles": 13,
+        "list_articles": 2,
+        "get_article": 2,
+        "update_article": 4,
+        "delete_article": 7,
+        "create_comment": 10,
+        "list_comments": 3,
+        "get_comment": 2,
+        "update_comment": 3,
+        "delete_comment": 4,
+        "ingest_comments": 1,
+        "export_articles": 1,
+        "export_comments": 1,
+    }
 
-
-class BlogAPITests(TestCase):
     def setUp(self):
+        # Кэш страниц списка не откатывается вместе с транзакцией теста
+        cache.clear()
         self.users_api_base_url = "/api/users"
         self.blog_api_base_url = "/api/blog"
 
@@ -152,6 +179,56 @@ class BlogAPITests(TestCase):
         )
         self.assertEqual(response.status_code, 403)
 
+    def test_update_article_returns_fresh_representation(self):
+        """Ответ на обновление — актуальная статья; сводка пересчитывается."""
+        article = Article.objects.create(
+            author=self.user1, title="Original Title", content="Original Content"
+        )
+        response = self.client.put(
+            self.article_detail_url(article.pk),
+            data=json.dumps({"content": "One two three"}),
+            content_type="application/json",
+            headers=self._get_auth_header(self.user1_token),
+        )
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        data = response.json()
+        self.assertEqual(data["content"], "One two three")
+        self.assertEqual(self.client.get(self.article_detail_url(article.pk)).json(), data)
+        article.refresh_from_db()
+        self.assertEqual(article.word_count, 3)
+
+    def test_update_article_unknown_category_not_found(self):
+        """Несуществующая категория при обновлении — 404, статья не меняется."""
+        article = Article.objects.create(
+            author=self.user1, title="Original Title", content="Original Content"
+        )
+        response = self.client.put(
+            self.article_detail_url(article.pk),
+            data=json.dumps({"title": "New Title", "category_id": 99999}),
+            content_type="application/json",
+            headers=self._get_auth_header(self.user1_token),
+        )
+        self.assertEqual(response.status_code, 404)
+        article.refresh_from_db()
+        self.assertEqual(article.title, "Original Title")
+
+    def test_update_and_delete_missing_objects_not_found(self):
+        """Запись в несуществующие статью и комментарий — 404, а не 403."""
+        headers = self._get_auth_header(self.user1_token)
+        for url, data in (
+            (self.article_detail_url(99999), {"title": "Missing"}),
+            (self.comment_detail_url(99999), {"content": "Missing"}),
+        ):
+            response = self.client.put(
+                url,
+                data=json.dumps(data),
+                content_type="application/json",
+                headers=headers,
+            )
+            self.assertEqual(response.status_code, 404, url)
+            response = self.client.delete(url, headers=headers)
+            self.assertEqual(response.status_code, 404, url)
+
     def test_update_article_unauthenticated(self):
         """Тест попытки обновления статьи неаутентифицированным пользователем (статус 401)."""
         article = Article.objects.create(
@@ -198,6 +275,60 @@ class BlogAPITests(TestCase):
         self.assertEqual(response.status_code, 401)
         self.assertTrue(Article.objects.filter(pk=article.pk).exists())
 
+    def test_list_articles_cursor_pagination(self):
+        """Тест keyset-пагинации: страницы не пересекаются и покрывают все статьи."""
+        for i in range(5):
+            Article.objects.create(
+                author=self.user1, title=f"Cursor Article {i}", content="Content"
+            )
+        response = self.client.get(self.articles_url, {"cursor": "", "page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertNotIn("count", data)
+        seen = [a["id"] for a in data["results"]]
+        while data["next_cursor"]:
+            response = self.client.get(
+                self.articles_url, {"cursor": data["next_cursor"], "page_size": 2}
+            )
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            seen.extend(a["id"] for a in data["results"])
+        expected = list(
+            Article.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_list_articles_page_mode_returns_next_cursor(self):
+        """Постраничный режим сохраняет count и отдает курсор для перехода в keyset-режим."""
+        for i in range(3):
+            Article.objects.create(
+                author=self.user1, title=f"Paged Article {i}", content="Content"
+            )
+        response = self.client.get(self.articles_url, {"page": 1, "page_size": 2})
+        data = response.json()
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(len(data["results"]), 2)
+        response = self.client.get(
+            self.articles_url, {"cursor": data["next_cursor"], "page_size": 2}
+        )
+        self.assertEqual(len(response.json()["results"]), 1)
+        self.assertIsNone(response.json()["next_cursor"])
+
+    def test_list_articles_page_size_is_bounded(self):
+        """Размер страницы ограничен BLOG_MAX_PAGE_SIZE."""
+        for i in range(3):
+            Article.objects.create(
+                author=self.user1, title=f"Bounded Article {i}", content="Content"
+            )
+        with self.settings(BLOG_MAX_PAGE_SIZE=2):
+            response = self.client.get(self.articles_url, {"page_size": 1000})
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    def test_list_articles_invalid_cursor(self):
+        """Некорректный курсор — 400."""
+        response = self.client.get(self.articles_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
     # --- Тесты для Комментариев (Comments) ---
 
     def test_create_comment_authenticated(self):
@@ -306,3 +437,281 @@ class BlogAPITests(TestCase):
         response = self.client.delete(self.comment_detail_url(comment.pk))
         self.assertEqual(response.status_code, 401)
         self.assertTrue(Comment.objects.filter(pk=comment.pk).exists())
+
+    def test_list_comments_cursor_pagination(self):
+        """Тест keyset-пагинации комментариев в обоих направлениях."""
+        article = Article.objects.create(author=self.user1, title="Art10", content="Cnt10")
+        for i in range(5):
+            Comment.objects.create(article=article, author=self.user1, content=f"C{i}")
+        expected = list(
+            Comment.objects.filter(article=article)
+            .order_by("created_at", "id")
+            .values_list("id", flat=True)
+        )
+        for order, ids in (("asc", expected), ("desc", expected[::-1])):
+            seen = []
+            params = {"cursor": "", "page_size": 2, "order": order}
+            while True:
+                response = self.client.get(self.comments_for_article_url(article.pk), params)
+                self.assertEqual(response.status_code, 200)
+                data = response.json()
+                seen.extend(c["id"] for c in data["results"])
+                if not data["next_cursor"]:
+                    break
+                params["cursor"] = data["next_cursor"]
+            self.assertEqual(seen, ids)
+
+    def test_list_comments_cursor_missing_article(self):
+        """Keyset-режим для несуществующей статьи — 404, для статьи без комментариев — пустой список."""
+        response = self.client.get(self.comments_for_article_url(999999), {"cursor": ""})
+        self.assertEqual(response.status_code, 404)
+        article = Article.objects.create(author=self.user1, title="Art11", content="Cnt11")
+        response = self.client.get(self.comments_for_article_url(article.pk), {"cursor": ""})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+
+    async def test_read_endpoints_under_asgi(self):
+        """Асинхронные эндпоинты чтения работают через ASGI-обработчик."""
+        article = await Article.objects.acreate(
+            author=self.user1, title="Async Article", content="Async Content"
+        )
+        await Comment.objects.acreate(article=article, author=self.user2, content="C")
+        response = await self.async_client.get(self.articles_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+        response = await self.async_client.get(self.article_detail_url(article.pk))
+        self.assertEqual(response.json()["title"], "Async Article")
+        response = await self.async_client.get(self.comments_for_article_url(article.pk))
+        self.assertEqual(response.json()["count"], 1)
+        response = await self.async_client.get(f"{self.blog_api_base_url}/categories")
+        self.assertEqual(response.json()[0]["name"], self.category.name)
+
+    def test_get_article_conditional_requests(self):
+        """ETag/Last-Modified: повторный запрос с валидатором получает 304 без тела."""
+        article = Article.objects.create(
+            author=self.user1, title="Cached Article", content="Cached Content"
+        )
+        response = self.client.get(self.article_detail_url(article.pk))
+        etag = response.headers["ETag"]
+        self.assertIn("Last-Modified", response.headers)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.article_detail_url(article.pk), headers={"If-None-Match": etag}
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+        article.title = "Changed Title"
+        article.save()
+        response = self.client.get(
+            self.article_detail_url(article.pk), headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_get_comment_if_modified_since(self):
+        """If-Modified-Since для комментария."""
+        article = Article.objects.create(author=self.user1, title="Art12", content="Cnt12")
+        comment = Comment.objects.create(article=article, author=self.user1, content="C")
+        response = self.client.get(self.comment_detail_url(comment.pk))
+        last_modified = response.headers["Last-Modified"]
+        response = self.client.get(
+            self.comment_detail_url(comment.pk),
+            headers={"If-Modified-Since": last_modified},
+        )
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(self.comment_detail_url(999999))
+        self.assertEqual(response.status_code, 404)
+
+    def test_comment_etag_changes_when_author_renamed(self):
+        """Имя автора входит в ответ, поэтому его смена меняет ETag комментария."""
+        article = Article.objects.create(author=self.user1, title="Art13", content="Cnt13")
+        comment = Comment.objects.create(article=article, author=self.user2, content="C")
+        etag = self.client.get(self.comment_detail_url(comment.pk))["ETag"]
+        response = self.client.get(self.comment_detail_url(comment.pk), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.user2.username = "renamed_commenter"
+        self.user2.save()
+        response = self.client.get(self.comment_detail_url(comment.pk), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["author"]["username"], "renamed_commenter")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_bulk_create_articles(self):
+        """Пакетное создание: корректные элементы создаются, ошибки возвращаются по элементам."""
+        items = [
+            {"title": "Bulk Article 1", "content": "Bulk content 1", "category_id": self.category.id},
+            {"title": "Bad", "content": "Too short title"},
+            {"title": "Bulk Article 3", "content": "Bulk content 3", "category_id": 999999},
+            {"title": "Bulk Article 4", "content": "Bulk content 4"},
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f"{self.articles_url}bulk",
+                data=json.dumps({"items": items}),
+                content_type="application/json",
+                headers=self._get_auth_header(self.user1_token),
+            )
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        sqls = [q["sql"] for q in ctx.captured_queries]
+        self.assertEqual(sum(s.startswith('INSERT INTO "blog_article"') for s in sqls), 1)
+        self.assertEqual(sum(s.startswith('SELECT "blog_category"') for s in sqls), 1)
+        data = response.json()
+        self.assertEqual((data["created"], data["failed"]), (2, 2))
+        results = data["results"]
+        self.assertTrue(Article.objects.filter(id=results[0]["id"], author=self.user1).exists())
+        self.assertIn("errors", results[1])
+        self.assertIn("errors", results[2])
+        self.assertTrue(Article.objects.filter(id=results[3]["id"]).exists())
+        listing = self.client.get(self.articles_url).json()
+        self.assertEqual(listing["count"], 2)
+
+    def test_bulk_create_articles_limit(self):
+        """Превышение BLOG_BULK_MAX_ITEMS — 422."""
+        items = [{"title": f"Bulk {i} title", "content": "Bulk content"} for i in range(3)]
+        with self.settings(BLOG_BULK_MAX_ITEMS=2):
+            response = self.client.post(
+                f"{self.articles_url}bulk",
+                data=json.dumps({"items": items}),
+                content_type="application/json",
+                headers=self._get_auth_header(self.user1_token),
+            )
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(Article.objects.filter(title__startswith="Bulk").exists())
+
+    def test_ingest_comments_ndjson(self):
+        """Потоковая загрузка: пачки, ошибки по строкам, прогресс и счетчики."""
+        article = Article.objects.create(
+            title="Ingest Article", content="Content", author=self.user1, category=self.category
+        )
+        lines = [
+            json.dumps({"article_id": article.id, "content": "First"}),
+            "not json",
+            json.dumps({"article_id": 999999, "content": "Orphan"}),
+            "",
+            json.dumps({"article_id": article.id, "content": ""}),
+            json.dumps({"article_id": article.id, "content": "Second"}),
+            json.dumps({"article_id": article.id, "content": "Third"}),
+        ]
+        with self.settings(BLOG_INGEST_CHUNK_SIZE=2):
+            response = self.client.post(
+                f"{self.blog_api_base_url}/comments/ingest",
+                data="\n".join(lines).encode(),
+                content_type="application/x-ndjson",
+                headers=self._get_auth_header(self.user2_token),
+            )
+            self.assertEqual(response.status_code, 200)
+            events = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        errors = {e["line"]: e["detail"] for e in events if e["event"] == "error"}
+        self.assertEqual(sorted(errors), [2, 3, 5])
+        self.assertEqual(sum(e["event"] == "progress" for e in events), 2)
+        self.assertEqual(
+            events[-1],
+            {"event": "done", "line": 7, "processed": 6, "inserted": 3, "failed": 3},
+        )
+        self.assertEqual(Comment.objects.filter(article=article, author=self.user2).count(), 3)
+        listing = self.client.get(f"{self.comments_for_article_url(article.id)}?page_size=1").json()
+        self.assertEqual(listing["count"], 3)
+
+    def test_ingest_comments_unauthenticated(self):
+        response = self.client.post(
+            f"{self.blog_api_base_url}/comments/ingest",
+            data=b"{}",
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_export_articles_ndjson(self):
+        """Выгрузка: строка совпадает с детальным представлением, since фильтрует по updated_at."""
+        old = Article.objects.create(
+            title="Old Article", content="Content", author=self.user1, category=self.category
+        )
+        new = Article.objects.create(title="New Article", content="Content", author=self.user2)
+        Article.objects.filter(id=old.id).update(updated_at="2020-01-01T00:00:00Z")
+        url = f"{self.blog_api_base_url}/export/articles.ndjson"
+        headers = self._get_auth_header(self.user1_token)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, headers=headers)
+            self.assertEqual(response["Content-Type"], "application/x-ndjson")
+            lines = b"".join(response.streaming_content).splitlines()
+        selects = [q for q in ctx.captured_queries if 'FROM "blog_article"' in q["sql"]]
+        self.assertEqual(len(selects), 1)
+        self.assertNotIn("OFFSET", selects[0]["sql"])
+        self.assertEqual([json.loads(line)["id"] for line in lines], [old.id, new.id])
+        self.assertEqual(
+            json.loads(lines[1]), self.client.get(self.article_detail_url(new.id)).json()
+        )
+
+        response = self.client.get(url, {"since": "2021-01-01T00:00:00Z"}, headers=headers)
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [new.id])
+
+    def test_export_comments_ndjson(self):
+        article = Article.objects.create(title="Export", content="Content", author=self.user1)
+        comment = Comment.objects.create(article=article, author=self.user2, content="Hi")
+        response = self.client.get(
+            f"{self.blog_api_base_url}/export/comments.ndjson",
+            headers=self._get_auth_header(self.user1_token),
+        )
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [self.client.get(self.comment_detail_url(comment.id)).json()],
+        )
+        response = self.client.get(f"{self.blog_api_base_url}/export/comments.ndjson")
+        self.assertEqual(response.status_code, 401)
+
+    def test_list_articles_sparse_fields(self):
+        """fields= сужает и ответ, и SELECT: content не читается из БД."""
+        Article.objects.create(
+            title="Sparse Article", content="Long content " * 100, author=self.user1
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.articles_url, {"fields": "title,author"})
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        item = response.json()["results"][0]
+        self.assertEqual(set(item), {"id", "title", "author"})
+        self.assertEqual(item["author"]["username"], self.user1.username)
+        select = next(q["sql"] for q in ctx.captured_queries if 'FROM "blog_article"' in q["sql"])
+        self.assertNotIn('"blog_article"."content"', select)
+        self.assertNotIn('"blog_category"', select)
+
+        # Кэш первых страниц различает наборы полей
+        full = self.client.get(self.articles_url).json()["results"][0]
+        self.assertIn("content", full)
+        cursor_item = self.client.get(
+            self.articles_url, {"cursor": "", "fields": "created_at"}
+        ).json()["results"][0]
+        self.assertEqual(set(cursor_item), {"id", "created_at"})
+
+        response = self.client.get(self.articles_url, {"fields": "title,password"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_article_sparse_fields(self):
+        article = Article.objects.create(
+            title="Sparse Detail", content="Long content", author=self.user1, category=self.category
+        )
+        url = self.article_detail_url(article.id)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {"fields": "title,category"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "id": article.id,
+                "title": "Sparse Detail",
+                "category": {"id": self.category.id, "name": "Test Category", "slug": "test-category"},
+            },
+        )
+        self.assertFalse(any('"blog_article"."content"' in q["sql"] for q in ctx.captured_queries))
+        full_etag = self.client.get(url)["ETag"]
+        self.assertNotEqual(response["ETag"], full_etag)
+        self.assertIn("Last-Modified", response)
+        response = self.client.get(
+            url, {"fields": "title,category"}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
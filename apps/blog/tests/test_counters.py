@@ -0,0 +1,154 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.blog import counters, services
+from apps.blog.models import Article, ArticleRendition, Category, Comment, Counter
+
+
+class CounterCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="counter", password="password123")
+        self.category1 = Category.objects.create(name="Cat 1")
+        self.category2 = Category.objects.create(name="Cat 2")
+
+    def test_article_counters_follow_writes(self):
+        """Счетчики статей и категорий обновляются при создании, смене категории и удалении."""
+        article = Article.objects.create(
+            author=self.user, title="Counted", content="Content", category=self.category1
+        )
+        Article.objects.create(author=self.user, title="Counted 2", content="Content")
+        self.assertEqual(counters.articles_total(), 2)
+        self.assertEqual(counters.category_articles(self.category1.id), 1)
+
+        article = Article.objects.get(pk=article.pk)
+        article.category = self.category2
+        article.save()
+        self.assertEqual(counters.category_articles(self.category1.id), 0)
+        self.assertEqual(counters.category_articles(self.category2.id), 1)
+
+        article.delete()
+        self.assertEqual(counters.articles_total(), 1)
+        self.assertEqual(counters.category_articles(self.category2.id), 0)
+
+    def test_comment_counters_follow_writes(self):
+        """Счетчик комментариев статьи обновляется и удаляется вместе со статьей."""
+        article = Article.objects.create(author=self.user, title="Art", content="Cnt")
+        comment = Comment.objects.create(article=article, author=self.user, content="C1")
+        Comment.objects.create(article=article, author=self.user, content="C2")
+        self.assertEqual(counters.article_comments(article.id), 2)
+        comment.delete()
+        self.assertEqual(counters.article_comments(article.id), 1)
+        article_id = article.id
+        article.delete()
+        self.assertFalse(
+            Counter.objects.filter(key=counters.article_comments_key(article_id)).exists()
+        )
+
+    def test_counters_follow_conditional_writes(self):
+        """Условные обновление и удаление (без сигналов) поддерживают счетчики сами."""
+        article = Article.objects.create(
+            author=self.user, title="Owned", content="Content", category=self.category1
+        )
+        comment = Comment.objects.create(article=article, author=self.user, content="C1")
+        Comment.objects.create(article=article, author=self.user, content="C2")
+        self.assertEqual(counters.article_comments(article.id), 2)
+
+        services.update_own_article(article.id, self.user.id, {"category_id": self.category2.id})
+        self.assertEqual(counters.category_articles(self.category1.id), 0)
+        self.assertEqual(counters.category_articles(self.category2.id), 1)
+
+        self.assertTrue(services.delete_own_comment(comment.id, self.user.id))
+        self.assertEqual(counters.article_comments(article.id), 1)
+
+        self.assertTrue(services.delete_own_article(article.id, self.user.id))
+        self.assertEqual(counters.articles_total(), 0)
+        self.assertEqual(counters.category_articles(self.category2.id), 0)
+        self.assertFalse(Comment.objects.filter(article_id=article.id).exists())
+        self.assertFalse(
+            Counter.objects.filter(key=counters.article_comments_key(article.id)).exists()
+        )
+
+    def test_delete_own_article_leaves_no_orphans(self):
+        """Удаление статьи без каскада Collector не оставляет зависимых строк и расхождений."""
+        article = Article.objects.create(
+            author=self.user, title="Gone", content="Content", category=self.category1
+        )
+        kept = Article.objects.create(author=self.user, title="Kept", content="Content")
+        for i in range(3):
+            Comment.objects.create(article=article, author=self.user, content=f"C{i}")
+        Comment.objects.create(article=kept, author=self.user, content="Stays")
+
+        self.assertFalse(services.delete_own_article(article.id, self.user.id + 1))
+        self.assertTrue(services.delete_own_article(article.id, self.user.id))
+        self.assertFalse(Article.objects.filter(id=article.id).exists())
+        self.assertFalse(Comment.objects.filter(article_id=article.id).exists())
+        self.assertFalse(ArticleRendition.objects.filter(article_id=article.id).exists())
+        self.assertEqual(Comment.objects.filter(article=kept).count(), 1)
+        self.assertTrue(ArticleRendition.objects.filter(article=kept).exists())
+        self.assertEqual(
+            counters.rebuild_counters(dry_run=True), {"created": 0, "fixed": 0, "reset": 0}
+        )
+
+    def test_user_delete_recounts_comment_counters_at_once(self):
+        """Удаление пользователя пересчитывает счетчики, а не правит их по комментарию."""
+        commenter = User.objects.create_user(username="commenter", password="password123")
+        article = Article.objects.create(author=self.user, title="Art", content="Cnt")
+        other = Article.objects.create(author=self.user, title="Art 2", content="Cnt")
+        Comment.objects.create(article=other, author=self.user, content="Stays")
+        for i in range(5):
+            Comment.objects.create(article=article, author=commenter, content=f"C{i}")
+            Comment.objects.create(article=other, author=commenter, content=f"D{i}")
+        self.assertEqual(counters.article_comments(article.id), 5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            commenter.delete()
+        counter_queries = [q for q in ctx.captured_queries if "blog_counter" in q["sql"]]
+        self.assertEqual(len(counter_queries), 2)  # DELETE + INSERT
+        self.assertEqual(counters.article_comments(article.id), 0)
+        self.assertEqual(counters.article_comments(other.id), 1)
+        self.assertEqual(counters.rebuild_counters(dry_run=True)["fixed"], 0)
+
+    def test_queryset_user_delete_recounts_comment_counters(self):
+        """Удаление пользователей пачкой (QuerySet, admin) тоже пересчитывает счетчики."""
+        article = Article.objects.create(author=self.user, title="Art", content="Cnt")
+        for name in ("first", "second"):
+            commenter = User.objects.create_user(username=name, password="password123")
+            Comment.objects.create(article=article, author=commenter, content=name)
+        self.assertEqual(counters.article_comments(article.id), 2)
+
+        User.objects.filter(username__in=["first", "second"]).delete()
+        self.assertEqual(counters.article_comments(article.id), 0)
+        self.assertEqual(
+            counters.rebuild_counters(dry_run=True), {"created": 0, "fixed": 0, "reset": 0}
+        )
+
+    def test_list_articles_does_not_count(self):
+        """Список статей берет count из счетчика, а не через COUNT(*)."""
+        Article.objects.create(author=self.user, title="Art", content="Cnt")
+        counters.articles_total()  # строка счетчика уже существует
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/blog/articles/")
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_rebuild_command_repairs_drift(self):
+        """Команда rebuild_blog_counters исправляет рассинхронизированные счетчики."""
+        article = Article.objects.create(
+            author=self.user, title="Art", content="Cnt", category=self.category1
+        )
+        Comment.objects.create(article=article, author=self.user, content="C1")
+        Counter.objects.filter(key=counters.ARTICLES_KEY).update(value=42)
+        Counter.objects.filter(key=counters.article_comments_key(article.id)).delete()
+
+        call_command("rebuild_blog_counters", "--dry-run", stdout=StringIO())
+        self.assertEqual(Counter.objects.get(key=counters.ARTICLES_KEY).value, 42)
+
+        call_command("rebuild_blog_counters", stdout=StringIO())
+        self.assertEqual(Counter.objects.get(key=counters.ARTICLES_KEY).value, 1)
+        self.assertEqual(
+            Counter.objects.get(key=counters.article_comments_key(article.id)).value, 1
+        )
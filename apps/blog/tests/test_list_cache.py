@@ -0,0 +1,88 @@
+import asyncio
+import json
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.blog import list_cache
+from apps.blog.models import Article, Category
+
+
+class ArticleListCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="cacher", password="password123")
+        self.url = "/api/blog/articles/"
+
+    def test_first_pages_served_from_cache(self):
+        """Повторный запрос первой страницы не обращается к БД."""
+        Article.objects.create(author=self.user, title="Cached", content="Content")
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.content, second.content)
+
+    def test_deep_pages_not_cached(self):
+        """Страницы дальше BLOG_LIST_CACHE_PAGES всегда читаются из БД."""
+        with self.settings(BLOG_LIST_CACHE_PAGES=1):
+            self.client.get(self.url, {"page": 2})
+            with self.assertNumQueries(2):
+                self.client.get(self.url, {"page": 2})
+
+    def test_writes_invalidate_cached_pages(self):
+        """Создание статьи, переименование категории и автора сбрасывают кэш."""
+        category = Category.objects.create(name="Old name")
+        Article.objects.create(
+            author=self.user, title="First", content="Content", category=category
+        )
+        self.client.get(self.url)
+
+        Article.objects.create(author=self.user, title="Second", content="Content")
+        self.assertEqual(self.client.get(self.url).json()["count"], 2)
+
+        category.name = "New name"
+        category.save()
+        results = self.client.get(self.url).json()["results"]
+        self.assertEqual(results[-1]["category"]["name"], "New name")
+
+        self.user.username = "renamed"
+        self.user.save()
+        results = self.client.get(self.url).json()["results"]
+        self.assertEqual(results[0]["author"]["username"], "renamed")
+
+    def test_concurrent_misses_build_once(self):
+        """Одновременные промахи по одному ключу строят страницу один раз."""
+        builds = []
+
+        async def build():
+            builds.append(1)
+            await asyncio.sleep(0.1)
+            return b"page"
+
+        async def run():
+            return await asyncio.gather(
+                *(list_cache.aget_or_build(("test", 1), build) for _ in range(5))
+            )
+
+        self.assertEqual(asyncio.run(run()), [b"page"] * 5)
+        self.assertEqual(len(builds), 1)
+
+    def test_file_based_backend(self):
+        """Кэш работает и с файловым бэкендом."""
+        with tempfile.TemporaryDirectory() as location:
+            caches = {
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            }
+            with override_settings(CACHES=caches):
+                Article.objects.create(author=self.user, title="File", content="Content")
+                first = self.client.get(self.url)
+                with self.assertNumQueries(0):
+                    second = self.client.get(self.url)
+                self.assertEqual(json.loads(first.content), json.loads(second.content))
+                Article.objects.create(author=self.user, title="File 2", content="Content")
+                self.assertEqual(self.client.get(self.url).json()["count"], 2)
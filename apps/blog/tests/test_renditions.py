@@ -0,0 +1,119 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.blog import renditions
+from apps.blog.models import Article, ArticleRendition, Category
+from apps.blog.schemas import ArticleOutSchema
+from apps.blog.serializers import dumps
+
+
+class ArticleRenditionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="password123")
+        self.category = Category.objects.create(name="Renditions")
+        self.article = Article.objects.create(
+            author=self.user, title="Rendered", content="Content", category=self.category
+        )
+
+    def _expected(self, article_id) -> bytes:
+        article = Article.objects.select_related("author", "category").get(id=article_id)
+        return dumps(ArticleOutSchema.from_orm(article).dict())
+
+    def _detail(self, article_id):
+        return self.client.get(f"/api/blog/articles/{article_id}/")
+
+    def test_detail_served_from_rendition(self):
+        """Детальный эндпоинт — один запрос и те же байты, что и схема."""
+        self.assertTrue(ArticleRendition.objects.filter(article=self.article).exists())
+        with self.assertNumQueries(1):
+            response = self._detail(self.article.id)
+        self.assertEqual(response.content, self._expected(self.article.id))
+        self.assertIn("ETag", response)
+
+    def test_rendition_follows_writes(self):
+        """Представление пересчитывается при правке статьи, автора и категории."""
+        self.article.title = "Rendered again"
+        self.article.save()
+        self.assertEqual(self._detail(self.article.id).json()["title"], "Rendered again")
+
+        self.user.username = "renamed"
+        self.user.save()
+        self.assertEqual(self._detail(self.article.id).json()["author"]["username"], "renamed")
+
+        self.category.name = "Renamed category"
+        self.category.save()
+        self.assertEqual(
+            self._detail(self.article.id).json()["category"]["name"], "Renamed category"
+        )
+
+        self.category.delete()
+        self.assertIsNone(self._detail(self.article.id).json()["category"])
+        self.assertEqual(self._detail(self.article.id).content, self._expected(self.article.id))
+
+    def test_etag_changes_when_author_or_category_renamed(self):
+        """Переименование автора или категории меняет ETag полного и узкого ответа."""
+        url = f"/api/blog/articles/{self.article.id}/"
+        for params, rename in (
+            ({}, lambda: setattr(self.user, "username", "renamed")),
+            ({"fields": "author"}, lambda: setattr(self.user, "username", "renamed2")),
+            ({}, lambda: setattr(self.category, "name", "Renamed")),
+            ({"fields": "category"}, lambda: setattr(self.category, "name", "Renamed 2")),
+        ):
+            etag = self.client.get(url, params)["ETag"]
+            rename()
+            self.user.save()
+            self.category.save()
+            response = self.client.get(url, params, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 200, params)
+            self.assertNotEqual(response["ETag"], etag)
+            data = response.json()
+            if "author" in data:
+                self.assertEqual(data["author"]["username"], self.user.username)
+            if "category" in data:
+                self.assertEqual(data["category"]["name"], self.category.name)
+            response = self.client.get(url, params, headers={"If-None-Match": response["ETag"]})
+            self.assertEqual(response.status_code, 304)
+
+    def test_missing_rendition_filled_on_read(self):
+        other = Article.objects.create(author=self.user, title="Other", content="Content")
+        ArticleRendition.objects.all().delete()
+        response = self.client.get("/api/blog/articles/")
+        expected = {
+            "count": 2,
+            "results": [
+                json.loads(self._expected(other.id)),
+                json.loads(self._expected(self.article.id)),
+            ],
+            "next_cursor": None,
+        }
+        self.assertEqual(response.content, dumps(expected))
+        self.assertEqual(ArticleRendition.objects.count(), 2)
+        self.assertEqual(self._detail(self.article.id).content, self._expected(self.article.id))
+
+    def test_rebuilt_rendition_not_read_back(self):
+        """
+        Пересчитанное при чтении представление отдается из результата пересчета:
+        отстающая реплика его еще не видит, но ответ не должен быть 404.
+        """
+        ArticleRendition.objects.all().delete()
+        lagging = mock.AsyncMock(return_value=None)
+        with mock.patch.object(renditions, "aget", lagging), mock.patch.object(
+            renditions, "aversion", lagging
+        ):
+            response = self._detail(self.article.id)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, self._expected(self.article.id))
+            response = self.client.get(
+                f"/api/blog/articles/{self.article.id}/", {"fields": "title"}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["title"], "Rendered")
+            self.assertIn("ETag", response)
+
+    def test_missing_article_404(self):
+        self.assertEqual(self._detail(999999).status_code, 404)
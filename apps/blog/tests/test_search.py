@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.blog.models import Article
+
+
+class ArticleSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="searcher", password="password123")
+        self.url = "/api/blog/articles/search"
+
+    def _ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        return [a["id"] for a in response.json()["results"]], response.json()
+
+    def test_search_ranks_title_matches_first(self):
+        """Совпадение в заголовке релевантнее совпадения в тексте."""
+        in_content = Article.objects.create(
+            author=self.user, title="Something else", content="Django ninja tutorial"
+        )
+        in_title = Article.objects.create(
+            author=self.user, title="Django tips", content="Short text about web"
+        )
+        Article.objects.create(author=self.user, title="Unrelated", content="Nothing here")
+        ids, _ = self._ids(q="django")
+        self.assertEqual(ids, [in_title.id, in_content.id])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Индекс синхронизируется при изменении и удалении статей."""
+        article = Article.objects.create(author=self.user, title="Old words", content="Content")
+        article.title = "Fresh words"
+        article.save()
+        self.assertEqual(self._ids(q="old")[0], [])
+        self.assertEqual(self._ids(q="fresh")[0], [article.id])
+        Article.objects.filter(id=article.id).update(content="bulk updated marker")
+        self.assertEqual(self._ids(q="marker")[0], [article.id])
+        article.delete()
+        self.assertEqual(self._ids(q="fresh")[0], [])
+
+    def test_search_cursor_pagination(self):
+        """Курсорная пагинация результатов поиска без пропусков и повторов."""
+        for i in range(5):
+            Article.objects.create(author=self.user, title=f"Python {i}", content="Content")
+        ids, data = self._ids(q="python", page_size=2)
+        seen = list(ids)
+        while data["next_cursor"]:
+            ids, data = self._ids(q="python", page_size=2, cursor=data["next_cursor"])
+            seen.extend(ids)
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_search_query_syntax_is_escaped(self):
+        """Спецсимволы запроса не ломают поиск."""
+        Article.objects.create(author=self.user, title='Quote "test"', content="Content")
+        response = self.client.get(self.url, {"q": 'test" OR NEAR(*'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, {"q": ""})
+        self.assertEqual(response.status_code, 422)
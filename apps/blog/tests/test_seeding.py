@@ -0,0 +1,73 @@
+from collections import Counter as Tally
+from io import StringIO
+
+from django.contrib.auth import authenticate
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.blog import counters
+from apps.blog.models import Article, ArticleRendition, Comment
+from apps.blog.seeding import _run, seed_blog
+
+SIZES = {"users": 20, "categories": 3, "articles": 50, "comments": 400}
+
+
+class SeedBlogTests(TestCase):
+    def snapshot(self):
+        return (
+            list(Article.objects.order_by("id").values_list("title", "author__username")),
+            list(
+                Comment.objects.order_by("id").values_list(
+                    "article__title", "author__username", "content"
+                )
+            ),
+        )
+
+    def test_creates_consistent_data(self):
+        created = seed_blog(**SIZES, seed=1, batch_size=16)
+        self.assertEqual(created, SIZES)
+        self.assertEqual(Comment.objects.count(), 400)
+        self.assertEqual(counters.articles_total(), 50)
+        article = Article.objects.filter(comments__isnull=False).first()
+        self.assertEqual(counters.article_comments(article.id), article.comments.count())
+        self.assertEqual(ArticleRendition.objects.count(), 50)
+        self.assertIsNotNone(article.excerpt)
+        self.assertIsNotNone(authenticate(username="seed0", password="seed-password"))
+
+    def test_deterministic_for_seed_and_batch_size(self):
+        seed_blog(**SIZES, seed=7, batch_size=16)
+        first = self.snapshot()
+        Article.objects.all().delete()
+        seed_blog(**SIZES, seed=7, batch_size=16, prefix="again")
+        second = self.snapshot()
+        self.assertEqual(
+            [(t, u.removeprefix("seed")) for t, u in first[0]],
+            [(t, u.removeprefix("again")) for t, u in second[0]],
+        )
+        self.assertEqual([c for _, _, c in first[1]], [c for _, _, c in second[1]])
+
+    def test_run_orders_ids_by_chunk(self):
+        """id собираются из результатов пачек в порядке номеров строк, а не завершения."""
+        chunks = [(4, 6), (0, 2), (2, 4)]  # как при imap_unordered
+        ids = _run("test", lambda c: (c[0], c[1], [c[0] * 10, c[0] * 10 + 1]), chunks, 1, None)
+        self.assertEqual(ids, [0, 1, 20, 21, 40, 41])
+
+    def test_comments_follow_power_law(self):
+        seed_blog(**SIZES, seed=3, comment_alpha=1.5)
+        per_article = Tally(Comment.objects.values_list("article_id", flat=True))
+        top = per_article.most_common(1)[0][1]
+        self.assertGreater(top, 400 / 50 * 5)
+
+    def test_command_rejects_existing_prefix(self):
+        out = StringIO()
+        call_command("seed_blog", users=5, articles=5, comments=10, stdout=out)
+        self.assertIn("статей 5", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("seed_blog", users=5, articles=5, comments=10, stdout=out)
+
+    def test_rejects_articles_without_users(self):
+        with self.assertRaises(ValueError):
+            seed_blog(users=0, categories=1, articles=5, comments=0)
+        with self.assertRaises(CommandError):
+            call_command("seed_blog", users=0, articles=5, comments=10, stdout=StringIO())
+        self.assertFalse(Article.objects.exists())
@@ -0,0 +1,46 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.blog.models import Article, Category, Comment
+from apps.blog.schemas import ArticleOutSchema, CommentOutSchema
+from apps.blog.serializers import (
+    ARTICLE_COLUMNS,
+    COMMENT_COLUMNS,
+    article_dict,
+    comment_dict,
+    dumps,
+)
+
+
+class FastSerializationTests(TestCase):
+    """Быстрый путь (values_list -> словари) дает те же байты, что и схемы."""
+
+    def setUp(self):
+        user = User.objects.create_user(username="сериализатор", password="password123")
+        category = Category.objects.create(name="Категория")
+        first = Article.objects.create(
+            author=user, title="С категорией", content='Текст "с кавычками"\n', category=category
+        )
+        second = Article.objects.create(author=user, title="Без категории", content="Text")
+        # Дата без микросекунд форматируется иначе — проверяем оба варианта
+        Article.objects.filter(id=second.id).update(
+            created_at=datetime.datetime(2024, 5, 1, 10, 0, tzinfo=datetime.timezone.utc)
+        )
+        Comment.objects.create(article=first, author=user, content="Комментарий ✓")
+        Comment.objects.create(article=second, author=user, content="Comment")
+
+    def test_articles_byte_identical(self):
+        qs = Article.objects.order_by("id")
+        expected = dumps(
+            [ArticleOutSchema.from_orm(a).dict() for a in qs.select_related("author", "category")]
+        )
+        actual = dumps([article_dict(row) for row in qs.values_list(*ARTICLE_COLUMNS)])
+        self.assertEqual(actual, expected)
+
+    def test_comments_byte_identical(self):
+        qs = Comment.objects.order_by("id")
+        expected = dumps([CommentOutSchema.from_orm(c).dict() for c in qs.select_related("author")])
+        actual = dumps([comment_dict(row) for row in qs.values_list(*COMMENT_COLUMNS)])
+        self.assertEqual(actual, expected)
@@ -0,0 +1,78 @@
+import json
+import warnings
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.blog.models import Article, Comment
+from apps.blog.streaming import aiterate
+from apps.users.models import AuthToken
+
+
+class StreamingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="streamer", password="password123")
+        self.token = AuthToken.objects.create(user=self.user, key="stream-token").key
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+
+    async def test_aiterate_pulls_in_batches(self):
+        """Синхронный генератор читается пачками по мере потребления и закрывается."""
+        produced = []
+        closed = []
+
+        def numbers():
+            try:
+                for i in range(10):
+                    produced.append(i)
+                    yield i
+            finally:
+                closed.append(True)
+
+        stream = aiterate(numbers(), batch_size=3)
+        self.assertEqual(await anext(stream), 0)
+        self.assertEqual(produced, [0, 1, 2])
+        await stream.aclose()
+        self.assertEqual(closed, [True])
+
+    async def test_ingest_streams_progress_under_asgi(self):
+        """Под ASGI событие progress приходит до обработки следующих пачек."""
+        article = await Article.objects.acreate(
+            author=self.user, title="Ingest", content="Content"
+        )
+        lines = [
+            json.dumps({"article_id": article.id, "content": f"C{i}"}) for i in range(6)
+        ]
+        with self.settings(BLOG_INGEST_CHUNK_SIZE=2), warnings.catch_warnings():
+            warnings.simplefilter("error")
+            response = await self.async_client.post(
+                "/api/blog/comments/ingest",
+                data="\n".join(lines).encode(),
+                content_type="application/x-ndjson",
+                headers=self.headers,
+            )
+            self.assertTrue(response.is_async)
+            events = []
+            async for line in response.streaming_content:
+                event = json.loads(line)
+                if event["event"] == "progress" and not events:
+                    # Пока получена только первая пачка, остальные еще не вставлены
+                    self.assertEqual(await Comment.objects.acount(), 2)
+                events.append(event)
+        self.assertEqual([e["event"] for e in events], ["progress"] * 3 + ["done"])
+        self.assertEqual(await Comment.objects.acount(), 6)
+
+    async def test_export_streams_under_asgi(self):
+        """Под ASGI выгрузка отдается асинхронным итератором, без чтения целиком."""
+        for i in range(5):
+            await Article.objects.acreate(author=self.user, title=f"A{i}", content="C")
+        with self.settings(BLOG_EXPORT_CHUNK_SIZE=2), warnings.catch_warnings():
+            # Синхронный итератор под ASGI Django дочитывает целиком с Warning
+            warnings.simplefilter("error")
+            response = await self.async_client.get(
+                "/api/blog/export/articles.ndjson", headers=self.headers
+            )
+            self.assertTrue(response.is_async)
+            titles = [
+                json.loads(line)["title"] async for line in response.streaming_content
+            ]
+        self.assertEqual(titles, [f"A{i}" for i in range(5)])
@@ -0,0 +1,59 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.blog.models import Article
+
+
+@override_settings(BLOG_EXCERPT_LENGTH=20, BLOG_READING_SPEED_WPM=100)
+class ArticleSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="summary", password="password123")
+
+    def test_summary_computed_on_save(self):
+        """Отрывок, число слов и время чтения считаются при создании и изменении content."""
+        article = Article.objects.create(
+            author=self.user, title="Summary", content="word  " * 150
+        )
+        self.assertEqual(article.word_count, 150)
+        self.assertEqual(article.reading_time, 2)
+        self.assertEqual(len(article.excerpt), 20)
+        self.assertTrue(article.excerpt.endswith("…"))
+
+        article.content = "Short text"
+        article.save(update_fields=["content"])
+        article.refresh_from_db()
+        self.assertEqual((article.word_count, article.reading_time), (2, 1))
+        self.assertEqual(article.excerpt, "Short text")
+
+    def test_backfill_command(self):
+        article = Article.objects.create(author=self.user, title="Old", content="one two three")
+        Article.objects.filter(id=article.id).update(
+            excerpt=None, word_count=None, reading_time=None
+        )
+        out = StringIO()
+        call_command("backfill_article_summaries", "--batch-size", "1", stdout=out)
+        self.assertIn("1", out.getvalue())
+        article.refresh_from_db()
+        self.assertEqual((article.excerpt, article.word_count, article.reading_time), ("one two three", 3, 1))
+
+    def test_summary_view_skips_content(self):
+        Article.objects.create(author=self.user, title="Summary view", content="word " * 300)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/blog/articles/", {"view": "summary"})
+        self.assertEqual(response.status_code, 200)
+        item = response.json()["results"][0]
+        self.assertEqual(
+            list(item),
+            ["id", "title", "excerpt", "word_count", "reading_time", "author", "category", "created_at", "updated_at"],
+        )
+        self.assertEqual((item["word_count"], item["reading_time"]), (300, 3))
+        self.assertFalse(
+            any('"blog_article"."content"' in q["sql"] for q in ctx.captured_queries)
+        )
@@ -1,9 +1,26 @@
 import logging  # Импортируем logging
+import time
+from django.conf import settings
 from ninja import Router
 from ninja.errors import HttpError
-from .schemas import UserRegisterSchema, UserLoginSchema, TokenSchema, UserSchema
-from .services import create_user_service, authenticate_user_service
+from .schemas import (
+    UserRegisterSchema,
+    UserLoginSchema,
+    TokenSchema,
+    TokenRefreshSchema,
+    TokenCacheStatsSchema,
+    UserSchema,
+)
+from .services import (
+    create_user_service,
+    authenticate_user_service,
+    build_token_response,
+    is_staff,
+    refresh_tokens_service,
+)
 from .models import AuthToken  # Импортируем AuthToken для аутентификатора
+from .signed_tokens import user_from_claims, verify_access_token
+from .token_cache import token_cache
 
 from ninja.security import HttpBearer  # Используем HttpBearer
 
@@ -11,25 +28,62 @@ logger = logging.getLogger(__name__)  # Получаем логгер для т
 
 
 class TokenAuthBearer(HttpBearer):
+    def __call__(self, request):
+        # Время аутентификации — для метрик (blog_project/metrics.py)
+        started = time.perf_counter()
+        try:
+            return super().__call__(request)
+        finally:
+            request.auth_time = time.perf_counter() - started
+
     def authenticate(self, request, token: str):  # token здесь уже извлечен HttpBearer
-        logger.debug(f"TokenAuthBearer.authenticate: CALLED with token = '{token}'")
+        if settings.AUTH_TOKEN_MODE == "signed":
+            return self._authenticate_signed(request, token)
+        # Сначала смотрим в in-process кэш, чтобы не ходить в БД на каждый запрос
+        user = token_cache.get(token)
+        if user is not None:
+            request.user = user
+            return user
         try:
             token_obj = AuthToken.objects.select_related("user").get(key=token)
-            logger.info(
-                f"TokenAuthBearer: Аутентифицирован пользователь '{token_obj.user.username}' (ID: {token_obj.user.id})."
+            if not token_obj.user.is_active:
+                logger.warning(
+                    "TokenAuthBearer: Пользователь '%s' деактивирован.",
+                    token_obj.user.username,
+                )
+                return None
+            # Промах кэша токенов — не чаще раза в AUTH_TOKEN_CACHE_TTL на токен
+            logger.debug(
+                "TokenAuthBearer: Аутентифицирован пользователь '%s' (ID: %s).",
+                token_obj.user.username,
+                token_obj.user.id,
             )
+            token_cache.set(token, token_obj.user)
             request.user = token_obj.user  # Явно устанавливаем request.user
             return token_obj.user
         except AuthToken.DoesNotExist:
-            logger.warning(f"TokenAuthBearer: Недействительный токен: {token[:20]}...")
+            logger.warning("TokenAuthBearer: Недействительный токен: %s...", token[:8])
             return None
         except Exception as e:
             logger.error(
-                f"TokenAuthBearer: Ошибка при аутентификации по токену: {e}",
+                "TokenAuthBearer: Ошибка при аутентификации по токену: %s",
+                e,
                 exc_info=True,
             )
             return None
 
+    def _authenticate_signed(self, request, token: str):
+        """Проверяет подписанный access-токен локально, без запроса к БД."""
+        claims = verify_access_token(token)
+        if claims is None:
+            logger.warning(
+                "TokenAuthBearer: Недействительный или просроченный access-токен."
+            )
+            return None
+        user = user_from_claims(claims)
+        request.user = user
+        return user
+
 
 # Убираем auth с инициализации Router
 router = Router(tags=["Пользователи"])
@@ -48,21 +102,27 @@ def register_user(request, payload: UserRegisterSchema):
     - **username**: Имя пользователя (уникальное)
     - **password**: Пароль (минимум 8 символов)
     """
-    logger.info(f"Попытка регистрации пользователя: {payload.username}")
+    logger.info("Попытка регистрации пользователя: %s", payload.username)
     try:
         user, token_key = create_user_service(payload.username, payload.password)
         logger.info(
-            f"Пользователь '{user.username}' успешно зарегистрирован. Токен сохранен в БД."
+            "Пользователь '%s' успешно зарегистрирован. Токен сохранен в БД.",
+            user.username,
         )
-        return 201, {"token": token_key}
+        return 201, build_token_response(user, token_key)
     except HttpError as e:
         logger.warning(
-            f"Ошибка регистрации пользователя '{payload.username}': {e.message} (HTTP {e.status_code})"
+            "Ошибка регистрации пользователя '%s': %s (HTTP %s)",
+            payload.username,
+            e.message,
+            e.status_code,
         )
         raise e
     except Exception as e:
         logger.error(
-            f"Непредвиденная ошибка при регистрации пользователя '{payload.username}': {e}",
+            "Непредвиденная ошибка при регистрации пользователя '%s': %s",
+            payload.username,
+            e,
             exc_info=True,
         )
         raise HttpError(500, f"Внутренняя ошибка сервера: {str(e)}")
@@ -81,28 +141,51 @@ def login_user(request, payload: UserLoginSchema):
     - **username**: Имя пользователя
     - **password**: Пароль
     """
-    logger.info(f"Попытка входа пользователя: {payload.username}")
+    logger.info("Попытка входа пользователя: %s", payload.username)
     try:
         user, token_key = authenticate_user_service(payload.username, payload.password)
         logger.info(
-            f"Пользователь '{user.username}' успешно вошел в систему. Токен обновлен/создан в БД."
+            "Пользователь '%s' успешно вошел в систему. Токен обновлен/создан в БД.",
+            user.username,
         )
-        return {"token": token_key}
+        return build_token_response(user, token_key)
     except HttpError as e:
         level_to_log = logging.WARNING if e.status_code == 401 else logging.ERROR
         logger.log(
             level_to_log,
-            f"Ошибка входа пользователя '{payload.username}': {e.message} (HTTP {e.status_code})",
+            "Ошибка входа пользователя '%s': %s (HTTP %s)",
+            payload.username,
+            e.message,
+            e.status_code,
         )
         raise e
     except Exception as e:
         logger.error(
-            f"Непредвиденная ошибка при входе пользователя '{payload.username}': {e}",
+            "Непредвиденная ошибка при входе пользователя '%s': %s",
+            payload.username,
+            e,
             exc_info=True,
         )
         raise HttpError(500, f"Внутренняя ошибка сервера: {str(e)}")
 
 
+@router.post(
+    "/token/refresh",
+    response={200: TokenSchema, 401: None, 404: None},
+    auth=None,
+    summary="Обновить access-токен по refresh-токену (режим signed)",
+    operation_id="users_token_refresh",
+)
+def refresh_token(request, payload: TokenRefreshSchema):
+    """
+    Выдает новый access-токен и ротирует refresh-токен.
+    Доступно только при AUTH_TOKEN_MODE="signed".
+    """
+    user, tokens = refresh_tokens_service(payload.refresh_token)
+    logger.info("Пользователь '%s' обновил токены.", user.username)
+    return tokens
+
+
 # Применяем auth=TokenAuthBearer() непосредственно к эндпоинту /me
 @router.get(
     "/me",
@@ -113,14 +196,7 @@ def login_user(request, payload: UserLoginSchema):
 )
 def get_current_user(request):
     """Возвращает информацию об аутентифицированном пользователе (id, username, email, etc. согласно UserSchema)."""
-    logger.info(
-        f"Эндпоинт /me: request.user = {request.user}, request.user.id = {getattr(request.user, 'id', 'N/A')}"
-    )
-    logger.info(f"Эндпоинт /me: request.user type = {type(request.user)}")
-    if hasattr(request.user, "is_authenticated"):
-        logger.info(
-            f"Эндпоинт /me: request.user.is_authenticated = {request.user.is_authenticated}"
-        )
+    logger.debug("Эндпоинт /me: пользователь ID %s", getattr(request.user, "id", None))
     # Если аутентификация на уровне роутера не сработала и не вернула пользователя,
     # то Ninja вернет 401 еще до вызова этого view.
     # Поэтому здесь request.user должен быть аутентифицированным пользователем.
@@ -132,3 +208,17 @@ def get_current_user(request):
             "Пользователь не аутентифицирован или не удалось определить пользователя.",
         )
     return request.user
+
+
+@router.get(
+    "/token-cache/stats",
+    response=TokenCacheStatsSchema,
+    auth=TokenAuthBearer(),
+    summary="Статистика кэша токенов текущего процесса (только для staff)",
+    operation_id="users_token_cache_stats",
+)
+def token_cache_stats(request):
+    """Счетчики попаданий/промахов кэша токенов в обслужившем запрос worker-процессе."""
+    if not is_staff(request.user):
+        raise HttpError(403, "Доступно только сотрудникам.")
+    return token_cache.stats()
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.users"
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import signals  # noqa: F401  Подключаем обработчики сигналов
+
+        if settings.AUTH_TOKEN_MODE == "signed":
+            from .signed_tokens import check_keys
+
+            check_keys()  # Без годных ключей не запускаемся
@@ -1,4 +1,6 @@
 from ninja import Schema
+from typing import Optional
+
 from pydantic import field_validator, Field
 
 
@@ -29,6 +31,13 @@ class UserLoginSchema(Schema):
 
 class TokenSchema(Schema):
     token: str
+    # Заполняются только в режиме AUTH_TOKEN_MODE="signed"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+
+class TokenRefreshSchema(Schema):
+    refresh_token: str
 
 
 class UserSchema(Schema):
@@ -42,3 +51,13 @@ class UserSchema(Schema):
     model_config = {
         "from_attributes": True,
     }
+
+
+class TokenCacheStatsSchema(Schema):
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
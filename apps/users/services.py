@@ -1,11 +1,14 @@
 import uuid  # Для генерации UUID токенов
 
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.db import IntegrityError, transaction
 
 from ninja.errors import HttpError
 from .models import AuthToken  # Импортируем модель AuthToken
+from .signed_tokens import issue_access_token
+from .token_cache import token_cache
 
 # Временное хранилище токенов (для демонстрации, в реальном приложении нужна БД)
 # Ключ - username, значение - token. Либо ключ - token, значение - user_id.
@@ -28,6 +31,8 @@ def generate_auth_token_for_user(user: User) -> str:
         AuthToken.objects.filter(user=user).delete()
         # Создаем новый токен
         token_obj = AuthToken.objects.create(user=user, key=token_key)
+    # Старый токен больше не должен приниматься из кэша этого процесса
+    token_cache.invalidate_user(user.pk)
     return token_obj.key
 
 
@@ -58,3 +63,43 @@ def authenticate_user_service(username, password):
     else:
         # Не уточняем, неправильный логин или пароль, для безопасности
         raise HttpError(401, "Неверные учетные данные.")
+
+
+def build_token_response(user: User, token_key: str) -> dict:
+    """
+    Формирует ответ с токенами. В режиме opaque клиент получает ключ AuthToken,
+    в режиме signed — короткоживущий подписанный access-токен, а ключ AuthToken
+    становится refresh-токеном.
+    """
+    if settings.AUTH_TOKEN_MODE != "signed":
+        return {"token": token_key}
+    return {
+        "token": issue_access_token(user),
+        "refresh_token": token_key,
+        "expires_in": settings.AUTH_ACCESS_TOKEN_TTL,
+    }
+
+
+def is_staff(user: User) -> bool:
+    """
+    Права staff для служебных эндпоинтов. В режиме signed пользователь построен
+    из claims токена без запроса к БД, поэтому флаг читается из БД.
+    """
+    if settings.AUTH_TOKEN_MODE != "signed":
+        return user.is_staff
+    return User.objects.filter(pk=user.pk, is_staff=True, is_active=True).exists()
+
+
+def refresh_tokens_service(refresh_token: str):
+    """Обменивает refresh-токен на новую пару токенов (refresh-токен ротируется)."""
+    if settings.AUTH_TOKEN_MODE != "signed":
+        raise HttpError(404, "Refresh-токены доступны только в режиме signed.")
+    try:
+        token_obj = AuthToken.objects.select_related("user").get(key=refresh_token)
+    except AuthToken.DoesNotExist:
+        raise HttpError(401, "Недействительный refresh-токен.")
+    user = token_obj.user
+    if not user.is_active:
+        raise HttpError(401, "Недействительный refresh-токен.")
+    token_key = generate_auth_token_for_user(user)
+    return user, build_token_response(user, token_key)
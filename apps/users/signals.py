@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import AuthToken
+from .token_cache import token_cache
+
+
+@receiver(post_delete, sender=AuthToken)
+def auth_token_deleted(sender, instance, **kwargs):
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, **kwargs):
+    # Деактивированный пользователь не должен аутентифицироваться из кэша
+    if not instance.is_active:
+        token_cache.invalidate_user(instance.pk)
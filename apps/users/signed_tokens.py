@@ -0,0 +1,106 @@
+"""
+Подписанные access-токены (JWT, RS256).
+
+Access-токен короткоживущий и проверяется локально публичным ключом — без
+запроса к БД. Refresh-токен — это обычный ключ AuthToken, который хранится в
+таблице и может быть отозван. Включается настройкой AUTH_TOKEN_MODE="signed".
+
+Режим закрыт по умолчанию: пути к ключам обязательны, ключи из репозитория
+(key.pem / public_key.pub — общедоступны) и RSA-ключи короче MIN_KEY_BITS
+отклоняются с ImproperlyConfigured. Права staff из токена не берутся.
+"""
+
+import datetime
+from functools import lru_cache
+from pathlib import Path
+
+import jwt
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from jwt.algorithms import RSAAlgorithm
+
+ALGORITHM = "RS256"
+MIN_KEY_BITS = 2048
+# Ключи из репозитория известны всем, у кого есть его копия
+REPOSITORY_KEYS = ("key.pem", "public_key.pub")
+
+
+def _read_bytes(path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def _read_key(path) -> str:
+    """Читает ключ и проверяет, что им можно подписывать (проверять) токены."""
+    if not path:
+        raise ImproperlyConfigured(
+            "AUTH_TOKEN_MODE=signed требует AUTH_JWT_PRIVATE_KEY_PATH "
+            "и AUTH_JWT_PUBLIC_KEY_PATH."
+        )
+    data = _read_bytes(path)
+    for name in REPOSITORY_KEYS:
+        repo_key = Path(settings.BASE_DIR) / name
+        if repo_key.exists() and _read_bytes(repo_key).strip() == data.strip():
+            raise ImproperlyConfigured(
+                f"{path}: ключ из репозитория нельзя использовать для подписи токенов."
+            )
+    key = RSAAlgorithm(RSAAlgorithm.SHA256).prepare_key(data)
+    if key.key_size < MIN_KEY_BITS:
+        raise ImproperlyConfigured(
+            f"{path}: RSA-ключ {key.key_size} бит, нужно не меньше {MIN_KEY_BITS}."
+        )
+    return data.decode()
+
+
+def check_keys() -> None:
+    """Проверяет ключи при старте в режиме signed (ImproperlyConfigured)."""
+    _read_key(settings.AUTH_JWT_PRIVATE_KEY_PATH)
+    _read_key(settings.AUTH_JWT_PUBLIC_KEY_PATH)
+
+
+def issue_access_token(user: User) -> str:
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    claims = {
+        "sub": str(user.pk),
+        "username": user.username,
+        "typ": "access",
+        "iat": now,
+        "exp": now + datetime.timedelta(seconds=settings.AUTH_ACCESS_TOKEN_TTL),
+    }
+    return jwt.encode(
+        claims, _read_key(settings.AUTH_JWT_PRIVATE_KEY_PATH), algorithm=ALGORITHM
+    )
+
+
+def verify_access_token(token: str):
+    """Возвращает claims валидного access-токена или None."""
+    try:
+        claims = jwt.decode(
+            token,
+            _read_key(settings.AUTH_JWT_PUBLIC_KEY_PATH),
+            algorithms=[ALGORITHM],
+            options={"require": ["sub", "exp"]},
+        )
+    except jwt.InvalidTokenError:
+        return None
+    if claims.get("typ") != "access":
+        return None
+    return claims
+
+
+def user_from_claims(claims: dict) -> User:
+    """
+    Строит User из claims без запроса к БД. Объект помечен как загруженный из БД,
+    поэтому годится для сравнения с author и для ForeignKey при создании записей.
+    is_staff всегда False: права проверяются по БД (apps.users.services.is_staff).
+    """
+    user = User(
+        id=int(claims["sub"]),
+        username=claims.get("username", ""),
+        is_active=True,
+    )
+    user._state.adding = False
+    user._state.db = "default"
+    return user
@@ -1,10 +1,21 @@
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from pathlib import Path
+import datetime
 import json
+import tempfile
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 
 # Предполагается, что AuthToken модель существует и используется
 from apps.users.models import AuthToken
 from apps.users.schemas import UserSchema  # Для проверки ответа /me
+from apps.users.signed_tokens import check_keys, issue_access_token
+from apps.users.token_cache import token_cache
 
 
 class UserAPITests(TestCase):
@@ -20,6 +31,8 @@ class UserAPITests(TestCase):
             "password": "anotherpassword456",
         }
         self.wrong_user_data = {"username": "testuser", "password": "wrongpassword"}
+        # Кэш токенов живет в процессе и не откатывается вместе с транзакцией теста
+        token_cache.clear()
 
     def _get_token_for_user(self, user_payload):
         """Вспомогательный метод для регистрации и получения токена."""
@@ -160,3 +173,185 @@ class UserAPITests(TestCase):
         """Тест доступа к /me без токена."""
         response = self.client.get(self.me_url)
         self.assertEqual(response.status_code, 401)
+
+    # Тесты для кэша токенов
+    def test_token_cache_skips_db_on_repeat_requests(self):
+        """Повторная аутентификация тем же токеном не обращается к БД."""
+        token = self._get_token_for_user(self.user_data)
+        headers = {"Authorization": f"Bearer {token}"}
+        self.client.get(self.me_url, headers=headers)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.me_url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(token_cache.stats()["hits"], 1)
+
+    def test_token_cache_invalidated_on_login(self):
+        """После нового входа старый токен не принимается, даже если был в кэше."""
+        old_token = self._get_token_for_user(self.user_data)
+        self.client.get(self.me_url, headers={"Authorization": f"Bearer {old_token}"})
+        self.client.post(
+            self.login_url,
+            data=json.dumps(self.user_data),
+            content_type="application/json",
+        )
+        response = self.client.get(
+            self.me_url, headers={"Authorization": f"Bearer {old_token}"}
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_cache_invalidated_on_deactivation(self):
+        """Деактивированный пользователь не аутентифицируется из кэша."""
+        token = self._get_token_for_user(self.user_data)
+        headers = {"Authorization": f"Bearer {token}"}
+        self.client.get(self.me_url, headers=headers)
+        user = User.objects.get(username=self.user_data["username"])
+        user.is_active = False
+        user.save()
+        response = self.client.get(self.me_url, headers=headers)
+        self.assertEqual(response.status_code, 401)
+
+
+def write_key_pair(directory, bits=2048):
+    """Создает пару RSA-ключей в directory и возвращает пути (private, public)."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=bits)
+    private = Path(directory) / f"jwt-{bits}.pem"
+    public = Path(directory) / f"jwt-{bits}.pub"
+    private.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public.write_bytes(
+        key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    )
+    return str(private), str(public)
+
+
+@override_settings(AUTH_TOKEN_MODE="signed", AUTH_ACCESS_TOKEN_TTL=300)
+class SignedTokenAPITests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        directory = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.private_key, public_key = write_key_pair(directory)
+        cls.enterClassContext(
+            override_settings(
+                AUTH_JWT_PRIVATE_KEY_PATH=cls.private_key,
+                AUTH_JWT_PUBLIC_KEY_PATH=public_key,
+            )
+        )
+
+    def setUp(self):
+        self.register_url = "/api/users/register"
+        self.refresh_url = "/api/users/token/refresh"
+        self.me_url = "/api/users/me"
+        response = self.client.post(
+            self.register_url,
+            data=json.dumps({"username": "signeduser", "password": "password123"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.tokens = response.json()
+
+    def test_register_returns_access_and_refresh(self):
+        """В режиме signed выдаются access- и refresh-токены."""
+        self.assertIn("refresh_token", self.tokens)
+        self.assertEqual(self.tokens["expires_in"], 300)
+        self.assertTrue(
+            AuthToken.objects.filter(key=self.tokens["refresh_token"]).exists()
+        )
+
+    def test_access_token_verified_without_db(self):
+        """Access-токен проверяется без запросов к БД."""
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.me_url, headers={"Authorization": f"Bearer {self.tokens['token']}"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["username"], "signeduser")
+
+    def test_refresh_token_is_not_an_access_token(self):
+        """Refresh-токен нельзя использовать как Bearer-токен."""
+        response = self.client.get(
+            self.me_url,
+            headers={"Authorization": f"Bearer {self.tokens['refresh_token']}"},
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_rotates_tokens(self):
+        """Обмен refresh-токена выдает новую пару, старый refresh-токен отзывается."""
+        response = self.client.post(
+            self.refresh_url,
+            data=json.dumps({"refresh_token": self.tokens["refresh_token"]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        new_tokens = response.json()
+        self.assertNotEqual(new_tokens["refresh_token"], self.tokens["refresh_token"])
+        response = self.client.post(
+            self.refresh_url,
+            data=json.dumps({"refresh_token": self.tokens["refresh_token"]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_staff_checked_in_database(self):
+        """Права staff не берутся из токена: поддельный claim staff не дает доступа."""
+        url = "/api/users/token-cache/stats"
+        user = User.objects.get(username="signeduser")
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        claims = {"sub": str(user.pk), "typ": "access", "staff": True, "iat": now}
+        claims["exp"] = now + datetime.timedelta(seconds=60)
+        with open(self.private_key) as f:
+            forged = jwt.encode(claims, f.read(), algorithm="RS256")
+        response = self.client.get(url, headers={"Authorization": f"Bearer {forged}"})
+        self.assertEqual(response.status_code, 403)
+
+        User.objects.filter(pk=user.pk).update(is_staff=True)
+        response = self.client.get(
+            url, headers={"Authorization": f"Bearer {self.tokens['token']}"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(AUTH_ACCESS_TOKEN_TTL=-1)
+    def test_expired_access_token_rejected(self):
+        """Просроченный access-токен отклоняется."""
+        user = User.objects.get(username="signeduser")
+        token = issue_access_token(user)
+        response = self.client.get(self.me_url, headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(AUTH_TOKEN_MODE="signed")
+class SignedTokenKeyTests(SimpleTestCase):
+    """Режим signed не работает без явно заданных надежных ключей."""
+
+    def test_key_paths_required(self):
+        with override_settings(AUTH_JWT_PRIVATE_KEY_PATH="", AUTH_JWT_PUBLIC_KEY_PATH=""):
+            with self.assertRaises(ImproperlyConfigured):
+                check_keys()
+
+    def test_repository_keys_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            _, public_key = write_key_pair(directory)
+            # Копия ключа из репозитория под другим путем тоже отклоняется
+            copy = Path(directory) / "copy.pem"
+            copy.write_bytes((Path(settings.BASE_DIR) / "key.pem").read_bytes())
+            with override_settings(
+                AUTH_JWT_PRIVATE_KEY_PATH=str(copy), AUTH_JWT_PUBLIC_KEY_PATH=public_key
+            ):
+                with self.assertRaises(ImproperlyConfigured):
+                    check_keys()
+
+    def test_short_keys_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            private_key, public_key = write_key_pair(directory, bits=1024)
+            with override_settings(
+                AUTH_JWT_PRIVATE_KEY_PATH=private_key, AUTH_JWT_PUBLIC_KEY_PATH=public_key
+            ):
+                with self.assertRaises(ImproperlyConfigured):
+                    check_keys()
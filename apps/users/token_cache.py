@@ -0,0 +1,96 @@
+"""
+In-process LRU-кэш с TTL для TokenAuthBearer.
+
+Кэш живет в памяти каждого процесса (gunicorn worker). Явная инвалидация
+(смена токена, деактивация пользователя) действует только в текущем процессе,
+в остальных запись доживает не дольше AUTH_TOKEN_CACHE_TTL секунд — поэтому
+TTL должен оставаться коротким.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class TokenCache:
+    def __init__(self):
+        self._entries = OrderedDict()  # key -> (expires_at, user)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        return settings.AUTH_TOKEN_CACHE_SIZE
+
+    @property
+    def ttl(self) -> float:
+        return settings.AUTH_TOKEN_CACHE_TTL
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: str):
+        """Возвращает копию закэшированного пользователя или None."""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            user = entry[1]
+        # Копия, чтобы изменения request.user в одном запросе не утекали в другие
+        return copy.copy(user)
+
+    def set(self, key: str, user) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_user(self, user_id) -> None:
+        with self._lock:
+            stale = [k for k, (_, user) in self._entries.items() if user.pk == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache()
@@ -0,0 +1,592 @@
+"""
+Нагрузочный бенчмарк эндпоинтов API блога и пользователей.
+
+Заполняет отдельную тестовую БД синтетическими данными (при --scale 1:
+100 000 пользователей, 1 000 000 статей, 10 000 000 комментариев), затем для
+каждого эндпоинта apps.blog.api и apps.users.api измеряет пропускную способность
+и задержки p50/p99 при последовательных и параллельных клиентах. Результаты
+сравниваются с JSON-базовой линией: регрессия (задержки, пропускная способность
+или доля ответов с ошибкой) — код выхода 1.
+
+Запуск из корня проекта:
+    python benchmarks/bench_api.py [--scale 0.01] [--requests 200] [--concurrency 1,8]
+    python benchmarks/bench_api.py --scale 1 --keepdb --save   # записать базовую линию
+
+Работает без сети: БД — SQLite (по умолчанию, файл в benchmarks/.data) или
+локальный PostgreSQL (DB_ENGINE/DB_NAME/... как для приложения, создается
+test_<имя>). --keepdb переиспользует заполненную БД между запусками: данные
+при --scale 1 генерируются десятки минут. Запросы выполняются в процессе через
+django.test.Client (весь стек middleware, без сети); параллельные клиенты —
+потоки, поэтому на их результаты влияет GIL, а на SQLite — блокировки записи.
+Логи приложения пишутся как обычно (в stderr), таблица результатов — в stdout.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from apps.blog.models import Article, Category, Comment  # noqa: E402
+from apps.blog.seeding import WORDS, random_text, seed_blog  # noqa: E402
+from apps.users.models import AuthToken  # noqa: E402
+
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Объемы при --scale 1
+FULL_SIZE = {"users": 100_000, "articles": 1_000_000, "comments": 10_000_000}
+CATEGORIES = 50
+TOKEN_USERS = 64  # пользователи с готовыми токенами (авторы запросов на запись)
+PASSWORD = "bench-password"
+REGISTERED = itertools.count()  # уникальные имена регистрации на весь запуск
+BATCH_SIZE = 5000
+
+
+# --- Данные ---
+
+
+def sizes(scale: float) -> dict:
+    # Пользователей с токенами и для логина должно хватить при любом масштабе
+    return {name: max(int(n * scale), 2 * TOKEN_USERS) for name, n in FULL_SIZE.items()}
+
+
+def seed(scale: float, seed_value: int, workers: int) -> None:
+    """Заполняет БД через apps.blog.seeding и выдает токены первым пользователям."""
+    target = sizes(scale)
+    started = time.perf_counter()
+    seed_blog(
+        **target,
+        categories=CATEGORIES,
+        seed=seed_value,
+        prefix="bench",
+        password=PASSWORD,
+        batch_size=BATCH_SIZE,
+        workers=workers,
+        progress=lambda kind, done, total: _progress(kind, done, total, started),
+    )
+    users = User.objects.filter(username__in=[f"bench{n}" for n in range(TOKEN_USERS)])
+    AuthToken.objects.bulk_create(
+        AuthToken(user_id=user_id, key=f"bench-token-{user_id}")
+        for user_id in users.values_list("id", flat=True)
+    )
+    print(f"данные созданы за {time.perf_counter() - started:.0f} с", file=sys.stderr)
+
+
+def _progress(name: str, done: int, total: int, started: float) -> None:
+    if done == total or done % (BATCH_SIZE * 20) == 0:
+        elapsed = time.perf_counter() - started
+        print(f"  {name}: {done}/{total} ({elapsed:.0f} с)", file=sys.stderr)
+
+
+def _id_range(model) -> tuple:
+    ids = model.objects.order_by("id").values_list("id", flat=True)
+    return ids.first(), ids.last()
+
+
+# --- Сценарии ---
+
+
+class Context:
+    """Общие для потоков данные сценариев: диапазоны id, токены, созданные объекты."""
+
+    def __init__(self, seed_value: int):
+        self.seed = seed_value
+        self.articles = _id_range(Article)
+        self.comments = _id_range(Comment)
+        self.categories = _id_range(Category)
+        self.tokens = dict(
+            AuthToken.objects.filter(key__startswith="bench-token-").values_list(
+                "user_id", "key"
+            )
+        )
+        self.own_articles = {
+            user_id: list(
+                Article.objects.filter(author_id=user_id).values_list("id", flat=True)[
+                    :20
+                ]
+            )
+            for user_id in self.tokens
+        }
+        # Пользователи с токеном, у которых есть свои статьи (для update_article)
+        self.authors = [user_id for user_id, ids in self.own_articles.items() if ids]
+        # Логин пересоздает токен пользователя, поэтому логинятся только
+        # пользователи без токенов бенчмарка
+        self.login_users = list(
+            User.objects.filter(username__startswith="bench")
+            .exclude(id__in=self.tokens)
+            .values_list("username", flat=True)[:1000]
+        )
+        self.created_articles = []
+        self.created_comments = []
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.threads = itertools.count()
+
+    @property
+    def rng(self) -> random.Random:
+        if not hasattr(self.local, "rng"):
+            # Номер потока, а не его ident: последовательность воспроизводима
+            self.local.rng = random.Random(f"{self.seed}-{next(self.threads)}")
+        return self.local.rng
+
+    def user(self, authors_only: bool = False):
+        """
+        (user_id, заголовок Authorization) случайного пользователя с токеном;
+        authors_only — только среди пользователей со своими статьями.
+        """
+        users = self.authors if authors_only else list(self.tokens)
+        if not users:
+            raise RuntimeError(
+                "нет пользователей с токеном и статьями, увеличьте --scale"
+            )
+        user_id = self.rng.choice(users)
+        return user_id, f"Bearer {self.tokens[user_id]}"
+
+    def push(self, bucket: list, value) -> None:
+        with self.lock:
+            bucket.append(value)
+
+    def pop(self, bucket: list):
+        with self.lock:
+            return bucket.pop() if bucket else None
+
+
+def _json(client, method, path, data, auth):
+    return getattr(client, method)(
+        path, json.dumps(data), content_type="application/json", HTTP_AUTHORIZATION=auth
+    )
+
+
+def list_articles(client, ctx):
+    return client.get("/api/blog/articles/", {"page": ctx.rng.randint(1, 50)})
+
+
+def list_articles_summary(client, ctx):
+    return client.get("/api/blog/articles/", {"cursor": "", "view": "summary"})
+
+
+def search_articles(client, ctx):
+    return client.get("/api/blog/articles/search", {"q": ctx.rng.choice(WORDS)})
+
+
+def get_article(client, ctx):
+    return client.get(f"/api/blog/articles/{ctx.rng.randint(*ctx.articles)}/")
+
+
+def list_comments(client, ctx):
+    article_id = ctx.rng.randint(*ctx.articles)
+    return client.get(f"/api/blog/articles/{article_id}/comments/")
+
+
+def get_comment(client, ctx):
+    return client.get(f"/api/blog/comments/{ctx.rng.randint(*ctx.comments)}/")
+
+
+def list_categories(client, ctx):
+    return client.get("/api/blog/categories")
+
+
+def get_category(client, ctx):
+    return client.get(f"/api/blog/categories/{ctx.rng.randint(*ctx.categories)}")
+
+
+def create_article(client, ctx):
+    _, auth = ctx.user()
+    response = _json(
+        client,
+        "post",
+        "/api/blog/articles/",
+        {"title": "Benchmark article", "content": random_text(ctx.rng, 200)},
+        auth,
+    )
+    if response.status_code == 201:
+        ctx.push(ctx.created_articles, (auth, response.json()["id"]))
+    return response
+
+
+def update_article(client, ctx):
+    user_id, auth = ctx.user(authors_only=True)
+    article_id = ctx.rng.choice(ctx.own_articles[user_id])
+    return _json(
+        client,
+        "put",
+        f"/api/blog/articles/{article_id}/",
+        {"title": f"Updated {next(ctx.sequence)}"},
+        auth,
+    )
+
+
+def create_comment(client, ctx):
+    _, auth = ctx.user()
+    article_id = ctx.rng.randint(*ctx.articles)
+    response = _json(
+        client,
+        "post",
+        f"/api/blog/articles/{article_id}/comments/",
+        {"content": random_text(ctx.rng, 10)},
+        auth,
+    )
+    if response.status_code == 201:
+        ctx.push(ctx.created_comments, (auth, response.json()["id"]))
+    return response
+
+
+def update_comment(client, ctx):
+    auth, comment_id = ctx.created_comments[
+        ctx.rng.randrange(len(ctx.created_comments))
+    ]
+    return _json(
+        client, "put", f"/api/blog/comments/{comment_id}/", {"content": "Updated"}, auth
+    )
+
+
+def delete_comment(client, ctx):
+    auth, comment_id = ctx.pop(ctx.created_comments)
+    return client.delete(f"/api/blog/comments/{comment_id}/", HTTP_AUTHORIZATION=auth)
+
+
+def delete_article(client, ctx):
+    auth, article_id = ctx.pop(ctx.created_articles)
+    return client.delete(f"/api/blog/articles/{article_id}/", HTTP_AUTHORIZATION=auth)
+
+
+def bulk_create_articles(client, ctx):
+    _, auth = ctx.user()
+    items = [
+        {"title": f"Bulk article {n}", "content": random_text(ctx.rng, 100)}
+        for n in range(10)
+    ]
+    return _json(client, "post", "/api/blog/articles/bulk", {"items": items}, auth)
+
+
+def ingest_comments(client, ctx):
+    _, auth = ctx.user()
+    lines = (
+        json.dumps(
+            {"article_id": ctx.rng.randint(*ctx.articles), "content": "Ingested"}
+        )
+        for _ in range(50)
+    )
+    response = client.post(
+        "/api/blog/comments/ingest",
+        "\n".join(lines),
+        content_type="application/x-ndjson",
+        HTTP_AUTHORIZATION=auth,
+    )
+    b"".join(response.streaming_content)
+    return response
+
+
+def export_articles(client, ctx):
+    _, auth = ctx.user()
+    response = client.get("/api/blog/export/articles.ndjson", HTTP_AUTHORIZATION=auth)
+    b"".join(response.streaming_content)
+    return response
+
+
+def export_comments(client, ctx):
+    _, auth = ctx.user()
+    response = client.get("/api/blog/export/comments.ndjson", HTTP_AUTHORIZATION=auth)
+    b"".join(response.streaming_content)
+    return response
+
+
+def users_register(client, ctx):
+    username = f"benchnew{os.getpid()}x{next(REGISTERED)}"
+    return _json(
+        client,
+        "post",
+        "/api/users/register",
+        {"username": username, "password": PASSWORD},
+        "",
+    )
+
+
+def users_login(client, ctx):
+    username = ctx.login_users[next(ctx.sequence) % len(ctx.login_users)]
+    return _json(
+        client,
+        "post",
+        "/api/users/login",
+        {"username": username, "password": PASSWORD},
+        "",
+    )
+
+
+def users_get_me(client, ctx):
+    return client.get("/api/users/me", HTTP_AUTHORIZATION=ctx.user()[1])
+
+
+# Порядок важен: удаления и правки комментариев работают с объектами,
+# созданными предыдущими сценариями. Выгрузки читают всю таблицу — только с --exports.
+SCENARIOS = {
+    "list_categories": list_categories,
+    "get_category": get_category,
+    "list_articles": list_articles,
+    "list_articles_summary": list_articles_summary,
+    "search_articles": search_articles,
+    "get_article": get_article,
+    "list_comments": list_comments,
+    "get_comment": get_comment,
+    "users_get_me": users_get_me,
+    "users_login": users_login,
+    "users_register": users_register,
+    "create_article": create_article,
+    "bulk_create_articles": bulk_create_articles,
+    "update_article": update_article,
+    "create_comment": create_comment,
+    "update_comment": update_comment,
+    "ingest_comments": ingest_comments,
+    "delete_comment": delete_comment,
+    "delete_article": delete_article,
+}
+EXPORT_SCENARIOS = {
+    "export_articles": export_articles,
+    "export_comments": export_comments,
+}
+# Сценарии, которым нужны заранее созданные объекты (по одному на запрос)
+SETUP = {
+    "update_comment": create_comment,
+    "delete_comment": create_comment,
+    "delete_article": create_article,
+}
+
+
+# --- Измерение ---
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Процентиль по ближайшему рангу."""
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(scenario, ctx: Context, requests: int, concurrency: int) -> dict:
+    clients = threading.local()
+    errors = []
+
+    def call(_):
+        if not hasattr(clients, "client"):
+            # Ошибка обработчика — ответ 500 и ошибка в статистике, а не исключение
+            clients.client = Client(raise_request_exception=False)
+        started = time.perf_counter()
+        response = scenario(clients.client, ctx)
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+        return elapsed
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        latencies = [call(n) for n in range(requests)]
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = list(pool.map(call, range(requests)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "rps": round(requests / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "errors": len(errors),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Список регрессий: p50/p99 выросли или rps упал больше чем на tolerance,
+    либо доля ошибок выше, чем в базовой линии (быстрый ответ 500 — не улучшение).
+    """
+    regressions = []
+    for name, modes in results.items():
+        for mode, current in modes.items():
+            base = baseline.get(name, {}).get(mode)
+            if not base:
+                continue
+            base_errors = base.get("errors", 0)
+            if current["errors"] / current["requests"] > base_errors / base["requests"]:
+                regressions.append(
+                    f"{name} [{mode}] ошибок: {base_errors}/{base['requests']} -> "
+                    f"{current['errors']}/{current['requests']}"
+                )
+            for metric in ("p50_ms", "p99_ms"):
+                if current[metric] > base[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{name} [{mode}] {metric}: {base[metric]} -> {current[metric]}"
+                    )
+            if current["rps"] < base["rps"] / (1 + tolerance):
+                regressions.append(
+                    f"{name} [{mode}] rps: {base['rps']} -> {current['rps']}"
+                )
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scale", type=float, default=0.01, help="доля полного объема данных"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="запросов на эндпоинт"
+    )
+    parser.add_argument(
+        "--concurrency", default="1,8", help="числа клиентов через запятую"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--seed-workers",
+        type=int,
+        default=1,
+        help="процессов генерации данных (PostgreSQL)",
+    )
+    parser.add_argument("--only", help="эндпоинты через запятую")
+    parser.add_argument(
+        "--exports", action="store_true", help="включить выгрузки NDJSON"
+    )
+    parser.add_argument(
+        "--keepdb", action="store_true", help="не удалять БД после запуска"
+    )
+    parser.add_argument("--baseline", type=Path, help="файл базовой линии")
+    parser.add_argument(
+        "--save", action="store_true", help="записать результаты как базовую линию"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="допустимое ухудшение (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+
+    scenarios = {**SCENARIOS, **EXPORT_SCENARIOS}
+    if args.only:
+        names = args.only.split(",")
+        unknown = set(names) - scenarios.keys()
+        if unknown:
+            parser.error(f"неизвестные эндпоинты: {', '.join(sorted(unknown))}")
+        scenarios = {name: fn for name, fn in scenarios.items() if name in names}
+    elif not args.exports:
+        scenarios = SCENARIOS
+    concurrency = [int(n) for n in args.concurrency.split(",")]
+
+    # ALLOWED_HOSTS для тестового клиента; журнал SQL при DEBUG рос бы на каждый
+    # запрос и искажал замеры
+    setup_test_environment(debug=False)
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        DATA_DIR.mkdir(exist_ok=True)
+        # Параллельные записи ждут блокировку файла, а не падают сразу
+        connection.settings_dict.setdefault("OPTIONS", {})["timeout"] = 20
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = str(
+            DATA_DIR / f"bench-{args.scale:g}.sqlite3"
+        )
+    baseline_path = args.baseline or BASELINE_DIR / f"{vendor}-scale{args.scale:g}.json"
+
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=args.keepdb
+    )
+    try:
+        if not User.objects.filter(username__startswith="bench").exists():
+            seed(args.scale, args.seed, args.seed_workers)
+        counts = {
+            "users": User.objects.count(),
+            "articles": Article.objects.count(),
+            "comments": Comment.objects.count(),
+        }
+        print(f"данные: {counts}", file=sys.stderr)
+
+        results = {}
+        for name, scenario in scenarios.items():
+            results[name] = {}
+            for clients in concurrency:
+                cache.clear()
+                ctx = Context(args.seed)
+                warmup = min(args.requests, 20)
+                if name in SETUP:
+                    run_scenario(SETUP[name], ctx, args.requests + warmup, 1)
+                run_scenario(scenario, ctx, warmup, 1)
+                result = run_scenario(scenario, ctx, args.requests, clients)
+                results[name][f"c{clients}"] = result
+                print(
+                    f"{name:>22} c={clients:<3} {result['rps']:>9.1f} rps  "
+                    f"p50 {result['p50_ms']:>9.3f} мс  p99 {result['p99_ms']:>9.3f} мс  "
+                    f"ошибок {result['errors']}"
+                )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+    report = {
+        "meta": {
+            "scale": args.scale,
+            "data": counts,
+            "requests": args.requests,
+            "seed": args.seed,
+            "database": vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "revision": git_revision(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.save:
+        baseline_path.parent.mkdir(exist_ok=True)
+        baseline_path.write_text(
+            json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+        )
+        print(f"базовая линия записана: {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"базовой линии нет ({baseline_path}), запустите с --save")
+        return
+    baseline = json.loads(baseline_path.read_text())
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(
+            f"регрессии относительно {baseline['meta'].get('revision') or baseline_path}:"
+        )
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("регрессий нет")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Накладные расходы MetricsMiddleware на один запрос: запись счетчика и
+гистограмм (blog_project.metrics.observe) против пустого middleware.
+
+Запуск из корня проекта:
+    python benchmarks/bench_metrics_overhead.py [--repeat 100000]
+
+С PROMETHEUS_MULTIPROC_DIR=<каталог> измеряется режим нескольких процессов
+(значения пишутся в mmap-файлы).
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from blog_project.metrics import MetricsMiddleware  # noqa: E402
+from blog_project.query_stats import QueryStats  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=100000)
+    args = parser.parse_args()
+
+    response = HttpResponse(b"{}")
+    request = RequestFactory().get("/api/blog/articles/")
+    request.ninja_operation_id = "list_articles"
+    request.query_stats = QueryStats()
+    request.auth_time = 0.0001
+
+    def view(request):
+        return response
+
+    results = {}
+    for name, handler in (("bare", view), ("metrics", MetricsMiddleware(view))):
+        best = min(
+            timeit.repeat(lambda: handler(request), number=args.repeat, repeat=3)
+        )
+        results[name] = best / args.repeat * 1e6
+        print(f"{name:>8}: {results[name]:.2f} мкс на запрос")
+    print(
+        f"накладные расходы: {results['metrics'] - results['bare']:.2f} мкс на запрос"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Сравнение сериализации страницы статей: схемы (ORM-объекты + from_orm().dict())
+против быстрого пути (values_list -> словари), см. apps.blog.serializers.
+
+Запуск из корня проекта:
+    python benchmarks/bench_serialization.py [--rows 100] [--repeat 200]
+
+Данные создаются во временной тестовой БД (test_<имя>), рабочая БД не трогается.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from apps.blog.models import Article, Category  # noqa: E402
+from apps.blog.schemas import ArticleOutSchema  # noqa: E402
+from apps.blog.serializers import ARTICLE_COLUMNS, article_dict, dumps  # noqa: E402
+
+
+def seed(rows: int) -> None:
+    author = User.objects.create_user(username="bench", password="bench-password")
+    category = Category.objects.create(name="Bench")
+    articles = [
+        Article(
+            author=author,
+            category=category if i % 2 else None,
+            title=f"Benchmark article {i}",
+            content="Lorem ipsum dolor sit amet. " * 40,
+        )
+        for i in range(rows)
+    ]
+    Article.objects.bulk_create(articles)
+
+
+def schema_page(rows: int) -> bytes:
+    qs = Article.objects.select_related("author", "category").order_by(
+        "-created_at", "-id"
+    )
+    return dumps({"results": [ArticleOutSchema.from_orm(a).dict() for a in qs[:rows]]})
+
+
+def fast_page(rows: int) -> bytes:
+    qs = Article.objects.order_by("-created_at", "-id").values_list(*ARTICLE_COLUMNS)
+    return dumps({"results": [article_dict(r) for r in qs[:rows]]})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        seed(args.rows)
+        assert schema_page(args.rows) == fast_page(args.rows), "вывод различается"
+        results = {}
+        for name, fn in (("schema", schema_page), ("fast", fast_page)):
+            best = min(
+                timeit.repeat(lambda: fn(args.rows), number=args.repeat, repeat=3)
+            )
+            results[name] = best / args.repeat * 1000
+            print(f"{name:>6}: {results[name]:.3f} мс на страницу из {args.rows} строк")
+        print(f"ускорение: x{results['schema'] / results['fast']:.1f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
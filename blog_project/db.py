@@ -0,0 +1,45 @@
+"""
+Состояние соединений с БД в текущем worker-процессе — для подбора
+DB_CONN_MAX_AGE и размеров пула (см. эндпоинт /api/health/db).
+"""
+
+import os
+import time
+
+from django.db import connections
+
+
+def connection_stats(alias: str) -> dict:
+    """Настройки и состояние соединения alias; при пуле — статистика psycopg_pool."""
+    conn = connections[alias]
+    stats = {
+        "alias": alias,
+        "vendor": conn.vendor,
+        "conn_max_age": conn.settings_dict.get("CONN_MAX_AGE"),
+        "conn_health_checks": conn.settings_dict.get("CONN_HEALTH_CHECKS"),
+        "connected": conn.connection is not None,
+        "pool": None,
+    }
+    pool = getattr(conn, "pool", None)  # есть у backend'а PostgreSQL в Django 5.1+
+    if pool is not None:
+        stats["pool"] = pool.get_stats()
+    return stats
+
+
+def ping(alias: str) -> float:
+    """Время выполнения SELECT 1 в миллисекундах."""
+    started = time.perf_counter()
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return (time.perf_counter() - started) * 1000
+
+
+def database_health() -> dict:
+    """Сводка по всем настроенным БД для текущего процесса."""
+    databases = []
+    for alias in connections:
+        stats = connection_stats(alias)
+        stats["ping_ms"] = round(ping(alias), 3)
+        databases.append(stats)
+    return {"pid": os.getpid(), "databases": databases}
@@ -0,0 +1,140 @@
+"""
+Маршрутизация чтения на реплики.
+
+Чтение уходит на реплику (settings.DB_REPLICAS) только внутри безопасного
+HTTP-запроса (GET/HEAD/OPTIONS), который ReplicaRoutingMiddleware пометил
+как допускающий отставание. Во всех остальных случаях — запросы на запись,
+клиент недавно писал, management-команды, сигналы вне запроса, тесты,
+данные для общего кэша (use_primary) — чтение идет на primary. Запись всегда идет на primary.
+
+Реплика выбирается одна на весь запрос: разные реплики отстают по-разному,
+и чтения одного ответа (версия, затем строка; страница списка) должны видеть
+один снимок данных.
+
+Read-your-writes: после успешного небезопасного запроса клиент (по заголовку
+Authorization) на DB_REPLICA_PIN_SECONDS закрепляется за primary. Метка
+хранится в кэше Django, поэтому между worker'ами нужен общий CACHE_BACKEND.
+"""
+
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.decorators import sync_and_async_middleware
+
+PRIMARY = "default"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Модели, которые всегда читаются с primary: токен должен работать сразу после выдачи
+PRIMARY_ONLY_MODELS = frozenset({"users.authtoken"})
+
+# Реплика, с которой читает текущий запрос; None — чтение с primary
+_replica = ContextVar("replica", default=None)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = _replica.get()
+        if not (settings.DB_REPLICAS and replica):
+            return PRIMARY
+        if model._meta.label_lower in PRIMARY_ONLY_MODELS:
+            return PRIMARY
+        return replica
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+@contextmanager
+def use_primary():
+    """
+    Чтение внутри блока идет на primary. Для данных, которые кладутся в общий
+    кэш: версия кэша меняется сразу после коммита, а отстающая реплика могла бы
+    отдать прежние данные, и они закэшировались бы под новой версией.
+    """
+    token = _replica.set(None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def _pin_key(request):
+    auth = request.headers.get("Authorization")
+    if not auth:
+        return None
+    return "db:pin:" + hashlib.sha256(auth.encode()).hexdigest()[:32]
+
+
+def _choose_replica(safe: bool, pinned) -> Optional[str]:
+    return random.choice(settings.DB_REPLICAS) if safe and not pinned else None
+
+
+def _wrap_streaming(response, replica: str):
+    """Потоковый ответ итерируется после выхода из middleware — читаем с той же реплики."""
+    content = response.streaming_content
+
+    def iterate():
+        token = _replica.set(replica)
+        try:
+            yield from content
+        finally:
+            _replica.reset(token)
+
+    response.streaming_content = iterate()
+
+
+@sync_and_async_middleware
+def ReplicaRoutingMiddleware(get_response):
+    """Разрешает чтение с реплик для безопасных запросов незакрепленных клиентов."""
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if not settings.DB_REPLICAS:
+                return await get_response(request)
+            key = _pin_key(request)
+            safe = request.method in SAFE_METHODS
+            replica = _choose_replica(safe, key and await cache.aget(key))
+            token = _replica.set(replica)
+            try:
+                response = await get_response(request)
+            finally:
+                _replica.reset(token)
+            if replica and response.streaming and not response.is_async:
+                _wrap_streaming(response, replica)
+            if key and not safe and response.status_code < 400:
+                await cache.aset(key, True, settings.DB_REPLICA_PIN_SECONDS)
+            return response
+
+    else:
+
+        def middleware(request):
+            if not settings.DB_REPLICAS:
+                return get_response(request)
+            key = _pin_key(request)
+            safe = request.method in SAFE_METHODS
+            replica = _choose_replica(safe, key and cache.get(key))
+            token = _replica.set(replica)
+            try:
+                response = get_response(request)
+            finally:
+                _replica.reset(token)
+            if replica and response.streaming and not response.is_async:
+                _wrap_streaming(response, replica)
+            if key and not safe and response.status_code < 400:
+                cache.set(key, True, settings.DB_REPLICA_PIN_SECONDS)
+            return response
+
+    return middleware
@@ -0,0 +1,192 @@
+"""
+Неблокирующий вывод логов.
+
+Обработчик AsyncHandler только кладет запись в ограниченную очередь; формирование
+JSON (или текста) и запись в поток выполняет фоновый поток QueueListener. Если
+потребитель (stdout, сборщик логов) не успевает и очередь заполнена, запись
+отбрасывается, а не блокирует worker; число отброшенных записей попадает в лог
+отдельным предупреждением, когда место в очереди освобождается.
+
+SamplingFilter пропускает только долю записей уровня INFO и ниже для указанных
+логгеров (LOG_SAMPLE_RATES); WARNING и выше проходят всегда.
+"""
+
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+
+# Стандартные атрибуты LogRecord — все прочие (extra=...) попадают в JSON
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))).union(
+    {"message", "asctime", "taskName"}
+)
+
+
+class JSONFormatter(logging.Formatter):
+    """Одна запись — одна строка JSON."""
+
+    def format(self, record):
+        created = datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+        entry = {
+            "time": created.isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает долю rate записей уровня INFO и ниже логгера (и его потомков).
+    rates — {"apps.blog.api": 0.1, ...}; логгеры без правила не прореживаются.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._resolved = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            parts = name.split(".")
+            for i in range(len(parts), 0, -1):
+                prefix = ".".join(parts[:i])
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+def parse_sample_rates(value: str) -> dict:
+    """'apps.blog.api=0.1,apps.users=0.5' -> {"apps.blog.api": 0.1, "apps.users": 0.5}"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+class _Listener(logging.handlers.QueueListener):
+    STOP_TIMEOUT = 5  # секунд на то, чтобы дописать очередь при остановке
+
+    def stop(self):
+        # Очередь может быть заполнена: ждем место для маркера остановки, но
+        # не дольше STOP_TIMEOUT — зависший потребитель не должен держать выход
+        try:
+            self.queue.put(self._sentinel, timeout=self.STOP_TIMEOUT)
+        except queue.Full:
+            return
+        self._thread.join()
+        self._thread = None
+
+
+class AsyncHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler с собственным фоновым QueueListener, который пишет в stream
+    форматтером handler'а (formatter из dictConfig применяется в фоновом потоке).
+    """
+
+    def __init__(self, stream=None, maxsize: int = 10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self.listener = None
+        self.start()
+        atexit.register(self.stop)
+        # Поток не переживает fork (gunicorn --preload): запускаем заново в потомке
+        os.register_at_fork(after_in_child=self._restart)
+
+    def setFormatter(self, fmt):
+        # Форматирование — в фоновом потоке, у целевого handler'а
+        self.target.setFormatter(fmt)
+
+    def start(self):
+        self.listener = _Listener(self.queue, self.target)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()  # дописывает оставшиеся в очереди записи
+            self.listener = None
+
+    def close(self):
+        # dictConfig закрывает прежние handler'ы при перенастройке логирования
+        self._closed = True
+        self.stop()
+        super().close()
+
+    def _restart(self):
+        if self._closed:
+            return
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._lock = threading.Lock()
+        self.start()
+
+    def prepare(self, record):
+        # В потоке запроса — только подстановка аргументов (они могут измениться
+        # позже) и текст исключения; JSON и время — в фоновом потоке
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        if self.dropped:
+            with self._lock:
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                self._report_dropped(dropped)
+
+    def _report_dropped(self, dropped: int):
+        record = logging.LogRecord(
+            "blog_project.log",
+            logging.WARNING,
+            __file__,
+            0,
+            "Очередь логов переполнена: отброшено записей: %d",
+            (dropped,),
+            None,
+        )
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            with self._lock:
+                self.dropped += dropped
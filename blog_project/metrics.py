@@ -0,0 +1,113 @@
+"""
+Метрики HTTP API в формате Prometheus.
+
+MetricsMiddleware записывает для каждого запроса (метка operation —
+operation_id эндпоинта Ninja, "unmatched" для прочих URL):
+- blog_http_requests_total{operation, method, status};
+- гистограммы времени ответа, времени в БД, числа запросов к БД и времени
+  аутентификации.
+
+Время в БД и число запросов берутся из request.query_stats
+(blog_project/query_stats.py), время аутентификации — из request.auth_time
+(TokenAuthBearer). Для потоковых ответов время ответа — до начала отдачи тела.
+
+Несколько процессов gunicorn: если задан PROMETHEUS_MULTIPROC_DIR, каждый
+worker пишет значения в свои файлы в этом каталоге, а /api/metrics суммирует
+их (prometheus_client.multiprocess). Каталог очищает gunicorn.conf.py при старте.
+"""
+
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUESTS = Counter(
+    "blog_http_requests",
+    "Количество HTTP-запросов",
+    ["operation", "method", "status"],
+)
+LATENCY = Histogram(
+    "blog_http_request_duration_seconds",
+    "Время обработки запроса",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_TIME = Histogram(
+    "blog_db_duration_seconds",
+    "Суммарное время запросов к БД за HTTP-запрос",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "blog_db_queries_per_request",
+    "Число запросов к БД за HTTP-запрос",
+    ["operation"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+AUTH_TIME = Histogram(
+    "blog_auth_duration_seconds",
+    "Время аутентификации",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def observe(request, response, duration: float) -> None:
+    operation = getattr(request, "ninja_operation_id", None) or "unmatched"
+    REQUESTS.labels(operation, request.method, str(response.status_code)).inc()
+    LATENCY.labels(operation).observe(duration)
+    stats = getattr(request, "query_stats", None)
+    if stats is not None:
+        DB_TIME.labels(operation).observe(stats.time)
+        DB_QUERIES.labels(operation).observe(stats.count)
+    auth_time = getattr(request, "auth_time", None)
+    if auth_time is not None:
+        AUTH_TIME.labels(operation).observe(auth_time)
+
+
+@sync_and_async_middleware
+def MetricsMiddleware(get_response):
+    if not settings.METRICS_ENABLED:
+        return get_response
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            started = time.perf_counter()
+            response = await get_response(request)
+            observe(request, response, time.perf_counter() - started)
+            return response
+
+    else:
+
+        def middleware(request):
+            started = time.perf_counter()
+            response = get_response(request)
+            observe(request, response, time.perf_counter() - started)
+            return response
+
+    return middleware
+
+
+def render_metrics():
+    """(тело, content-type) для эндпоинта сбора метрик."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
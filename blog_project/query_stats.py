@@ -0,0 +1,139 @@
+"""
+Число SQL-запросов и время в БД на каждый HTTP-запрос.
+
+Execute-wrapper, установленный на все соединения, учитывает запросы в
+QueryStats текущего запроса (через contextvar — он переходит и в потоки
+sync_to_async асинхронных эндпоинтов). Декоратор tag_operation, добавленный в
+NinjaAPI, помечает запрос operation_id эндпоинта.
+
+Результат:
+- request.query_stats и request.ninja_operation_id — для других middleware и тестов;
+- заголовки X-DB-Query-Count / X-DB-Time-Ms при DEBUG или QUERY_STATS_HEADERS;
+- предупреждение в лог, если запросов больше QUERY_COUNT_WARN_THRESHOLD.
+"""
+
+import functools
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    __slots__ = ("count", "time", "sql")
+
+    def __init__(self, record_sql: bool = False):
+        self.count = 0
+        self.time = 0.0  # секунды
+        self.sql = [] if record_sql else None
+
+    @property
+    def time_ms(self) -> float:
+        return round(self.time * 1000, 3)
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.time += time.perf_counter() - started
+        stats.count += 1
+        if stats.sql is not None:
+            stats.sql.append(sql)
+
+
+def _install(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+# Новые соединения (в том числе в потоках sync_to_async) получают wrapper сразу
+connection_created.connect(_install)
+
+
+def tag_operation(run):
+    """Декоратор NinjaAPI (mode="view"): сохраняет operation_id в запросе."""
+    operation_id = getattr(getattr(run, "__self__", None), "operation_id", None)
+
+    if iscoroutinefunction(run):
+
+        @functools.wraps(run)
+        async def async_wrapper(request, *args, **kwargs):
+            request.ninja_operation_id = operation_id
+            return await run(request, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(run)
+    def wrapper(request, *args, **kwargs):
+        request.ninja_operation_id = operation_id
+        return run(request, *args, **kwargs)
+
+    return wrapper
+
+
+def _begin(request):
+    for conn in connections.all(initialized_only=True):
+        _install(conn)
+    stats = QueryStats(record_sql=settings.QUERY_STATS_RECORD_SQL)
+    request.query_stats = stats
+    return stats, _current.set(stats)
+
+
+def _finish(request, response, stats):
+    operation = getattr(request, "ninja_operation_id", None) or request.path
+    if stats.count > settings.QUERY_COUNT_WARN_THRESHOLD:
+        logger.warning(
+            "%s: %d запросов к БД (%.1f мс) — больше порога %d",
+            operation,
+            stats.count,
+            stats.time_ms,
+            settings.QUERY_COUNT_WARN_THRESHOLD,
+        )
+    else:
+        logger.debug(
+            "%s: %d запросов к БД (%.1f мс)", operation, stats.count, stats.time_ms
+        )
+    if settings.DEBUG or settings.QUERY_STATS_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = str(stats.time_ms)
+
+
+@sync_and_async_middleware
+def QueryStatsMiddleware(get_response):
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            stats, token = _begin(request)
+            try:
+                response = await get_response(request)
+            finally:
+                _current.reset(token)
+            _finish(request, response, stats)
+            return response
+
+    else:
+
+        def middleware(request):
+            stats, token = _begin(request)
+            try:
+                response = get_response(request)
+            finally:
+                _current.reset(token)
+            _finish(request, response, stats)
+            return response
+
+    return middleware
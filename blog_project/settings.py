@@ -12,9 +12,12 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+
 from dotenv import load_dotenv
 import sys  # Для определения запуска через pytest
 
+from blog_project.log import parse_sample_rates
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -54,6 +57,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "blog_project.metrics.MetricsMiddleware",
+    "blog_project.query_stats.QueryStatsMiddleware",
+    "blog_project.db_router.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -98,6 +104,33 @@ DATABASES = {
     }
 }
 
+# Переиспользование соединений с БД.
+# В ASGI-профиле синхронный код каждого запроса (ORM) выполняется в отдельном потоке,
+# а соединение Django привязано к потоку, поэтому постоянные соединения (CONN_MAX_AGE)
+# между запросами не переиспользуются. Там по умолчанию включен пул psycopg (DB_POOL):
+# соединение берется из пула процесса на запрос и возвращается в него по окончании.
+# В WSGI-профиле — постоянные соединения, DB_CONN_MAX_AGE секунд (0 — закрывать после
+# каждого запроса, пустое значение — без ограничения).
+SERVER_PROFILE = os.getenv("SERVER_PROFILE", "asgi")
+DB_POOL = os.getenv("DB_POOL", str(SERVER_PROFILE == "asgi")).lower() == "true"
+if DATABASES["default"]["ENGINE"] != "django.db.backends.postgresql":
+    DB_POOL = False  # пул соединений есть только у backend'а PostgreSQL
+_conn_max_age = os.getenv("DB_CONN_MAX_AGE", "60")
+DATABASES["default"]["CONN_MAX_AGE"] = int(_conn_max_age) if _conn_max_age else None
+# Проверка соединения перед повторным использованием (в том числе при выдаче из пула)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = (
+    os.getenv("DB_CONN_HEALTH_CHECKS", "True").lower() == "true"
+)
+if DB_POOL:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # пул несовместим с CONN_MAX_AGE
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    }
+
 if any("pytest" in arg for arg in sys.argv) or not all(
     [os.getenv("DB_ENGINE"), os.getenv("DB_NAME")]
 ):
@@ -109,6 +142,54 @@ if any("pytest" in arg for arg in sys.argv) or not all(
         }
     }
 
+# Реплики для чтения (см. blog_project/db_router.py).
+# PostgreSQL: DB_REPLICA_HOSTS=replica1,replica2 — остальные параметры как у default,
+# при необходимости DB_REPLICA_NAME / DB_REPLICA_USER / DB_REPLICA_PASSWORD / DB_REPLICA_PORT.
+# SQLite (локальная проверка): DB_REPLICA_NAME=replica.sqlite3 — второй файл вместо реплики.
+DB_REPLICAS = []
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    if os.getenv("DB_REPLICA_NAME"):
+        DATABASES["replica"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_REPLICA_NAME"),
+            "TEST": {"MIRROR": "default"},
+        }
+        DB_REPLICAS.append("replica")
+else:
+    for i, host in enumerate(
+        filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(","))
+    ):
+        DATABASES[f"replica_{i}"] = {
+            **DATABASES["default"],
+            "HOST": host.strip(),
+            "NAME": os.getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+            "USER": os.getenv("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+            "PASSWORD": os.getenv(
+                "DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]
+            ),
+            "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+            "TEST": {"MIRROR": "default"},
+        }
+        DB_REPLICAS.append(f"replica_{i}")
+
+DATABASE_ROUTERS = ["blog_project.db_router.ReplicaRouter"]
+
+# Учет запросов к БД на HTTP-запрос (blog_project/query_stats.py)
+# Заголовки X-DB-Query-Count / X-DB-Time-Ms отдаются при DEBUG или QUERY_STATS_HEADERS
+QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", "False").lower() == "true"
+# Сохранять тексты запросов в request.query_stats.sql (для тестов и отладки)
+QUERY_STATS_RECORD_SQL = DEBUG
+# Больше запросов на один HTTP-запрос — предупреждение в лог (признак N+1)
+QUERY_COUNT_WARN_THRESHOLD = int(os.getenv("QUERY_COUNT_WARN_THRESHOLD", "30"))
+# Сколько секунд после записи клиент читает только с primary (read-your-writes)
+DB_REPLICA_PIN_SECONDS = int(os.getenv("DB_REPLICA_PIN_SECONDS", "5"))
+
+# Метрики Prometheus (blog_project/metrics.py), отдаются на /api/metrics.
+# METRICS_TOKEN — сборщик передает "Authorization: Bearer <токен>"; без токена
+# /api/metrics отвечает 404 (метрики собираются, но не публикуются)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -158,8 +239,72 @@ MEDIA_ROOT = BASE_DIR / "mediafiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# --- Кэш ---
+# По умолчанию локальный кэш процесса; для нескольких worker'ов укажите общий
+# бэкенд (например, django.core.cache.backends.filebased.FileBasedCache или Redis).
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "blog-cache"),
+    }
+}
+
+# --- Аутентификация ---
+
+# In-process кэш токенов TokenAuthBearer (на каждый worker). 0 — кэш выключен.
+# TTL ограничивает, сколько другие worker'ы могут принимать уже замененный токен.
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "30"))
+
+# Режим токенов: "opaque" — ключ AuthToken проверяется по БД (по умолчанию),
+# "signed" — короткоживущий JWT (RS256), проверяемый публичным ключом, + refresh-токен в БД.
+# В режиме signed пути к ключам обязательны: ключи из репозитория и RSA-ключи короче
+# 2048 бит отклоняются при старте (apps/users/signed_tokens.py).
+AUTH_TOKEN_MODE = os.getenv("AUTH_TOKEN_MODE", "opaque")
+AUTH_ACCESS_TOKEN_TTL = int(os.getenv("AUTH_ACCESS_TOKEN_TTL", "300"))
+AUTH_JWT_PRIVATE_KEY_PATH = os.getenv("AUTH_JWT_PRIVATE_KEY_PATH", "")
+AUTH_JWT_PUBLIC_KEY_PATH = os.getenv("AUTH_JWT_PUBLIC_KEY_PATH", "")
+
+# --- Blog API ---
+
+# Максимальный размер страницы для списков статей и комментариев
+BLOG_MAX_PAGE_SIZE = int(os.getenv("BLOG_MAX_PAGE_SIZE", "100"))
+
+# Пакетное создание статей: максимум элементов в запросе и размер батча INSERT
+BLOG_BULK_MAX_ITEMS = int(os.getenv("BLOG_BULK_MAX_ITEMS", "1000"))
+BLOG_BULK_BATCH_SIZE = int(os.getenv("BLOG_BULK_BATCH_SIZE", "500"))
+
+# Сводка статьи для ленты: длина отрывка (символов) и скорость чтения (слов в минуту)
+BLOG_EXCERPT_LENGTH = int(os.getenv("BLOG_EXCERPT_LENGTH", "200"))
+BLOG_READING_SPEED_WPM = int(os.getenv("BLOG_READING_SPEED_WPM", "200"))
+
+# Пачка пересчета готовых JSON-представлений статей (apps.blog.renditions)
+BLOG_RENDITION_BATCH_SIZE = int(os.getenv("BLOG_RENDITION_BATCH_SIZE", "500"))
+
+# Потоковая загрузка комментариев: размер пачки INSERT и максимальная длина строки
+BLOG_INGEST_CHUNK_SIZE = int(os.getenv("BLOG_INGEST_CHUNK_SIZE", "1000"))
+BLOG_INGEST_MAX_LINE_BYTES = int(os.getenv("BLOG_INGEST_MAX_LINE_BYTES", "1048576"))
+
+# Размер пачки серверного курсора при выгрузке в NDJSON
+BLOG_EXPORT_CHUNK_SIZE = int(os.getenv("BLOG_EXPORT_CHUNK_SIZE", "2000"))
+
+# Сколько первых страниц списка статей кэшировать и на сколько секунд
+BLOG_LIST_CACHE_PAGES = int(os.getenv("BLOG_LIST_CACHE_PAGES", "3"))
+BLOG_LIST_CACHE_TIMEOUT = int(os.getenv("BLOG_LIST_CACHE_TIMEOUT", "60"))
+
 # --- Logging Configuration ---
 
+# Логи пишет фоновый поток (blog_project/log.py): запрос только кладет запись
+# в очередь и никогда не ждет медленный stdout. LOG_FORMAT — text (прежний формат
+# verbose, по умолчанию) или json (одна строка JSON на запись).
+# LOG_SAMPLE_RATES — доля записей INFO и ниже, например "apps.blog.api=0.1"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,  # Не отключать существующие логгеры Django
@@ -169,12 +314,21 @@ LOGGING = {
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
         "simple": {"format": "[%(levelname)s] %(message)s"},
+        "json": {"()": "blog_project.log.JSONFormatter"},
+    },
+    "filters": {
+        "sampling": {
+            "()": "blog_project.log.SamplingFilter",
+            "rates": parse_sample_rates(LOG_SAMPLE_RATES),
+        },
     },
     "handlers": {
         "console": {
             "level": "INFO",  # Уровень для вывода в консоль (можно DEBUG для разработки)
-            "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "class": "blog_project.log.AsyncHandler",
+            "formatter": "json" if LOG_FORMAT == "json" else "verbose",
+            "filters": ["sampling"],
+            "maxsize": LOG_QUEUE_SIZE,
         },
         # Опциональный хендлер для записи в файл
         # 'file': {
@@ -193,7 +347,7 @@ LOGGING = {
         # Логгеры для наших приложений (можно настроить разные уровни и хендлеры)
         "apps.users": {
             "handlers": ["console"],  # 'console', 'file'
-            "level": "DEBUG",
+            "level": "INFO",
             "propagate": False,
         },
         "apps.blog": {
@@ -0,0 +1,54 @@
+"""
+Бюджеты запросов к БД для тестов API.
+
+    class BlogAPITests(QueryBudgetMixin, TestCase):
+        query_budgets = {"list_articles": 3, ...}
+
+Каждый ответ self.client проверяется по request.query_stats (см.
+blog_project/query_stats.py): если эндпоинт выполнил больше запросов, чем
+объявлено для его operation_id, тест падает со списком SQL. Эндпоинт без
+объявленного бюджета — тоже ошибка: новый эндпоинт должен получить бюджет.
+"""
+
+from django.test import Client, override_settings
+
+
+class QueryBudgetClient(Client):
+    query_budgets: dict = {}
+
+    def request(self, **request):
+        response = super().request(**request)
+        wsgi_request = response.wsgi_request
+        operation = getattr(wsgi_request, "ninja_operation_id", None)
+        stats = getattr(wsgi_request, "query_stats", None)
+        if operation is None or stats is None:
+            return response
+        if operation not in self.query_budgets:
+            raise AssertionError(f"Для эндпоинта {operation} не объявлен бюджет запросов.")
+        budget = self.query_budgets[operation]
+        if stats.count > budget:
+            queries = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(stats.sql, 1))
+            raise AssertionError(
+                f"{operation}: {stats.count} запросов к БД при бюджете {budget}:\n{queries}"
+            )
+        return response
+
+
+class QueryBudgetMixin:
+    """Подменяет self.client на QueryBudgetClient с бюджетами query_budgets класса."""
+
+    query_budgets: dict = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client_class = type(
+            "QueryBudgetClient", (QueryBudgetClient,), {"query_budgets": cls.query_budgets}
+        )
+        cls._query_budget_settings = override_settings(QUERY_STATS_RECORD_SQL=True)
+        cls._query_budget_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._query_budget_settings.disable()
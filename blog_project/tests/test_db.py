@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from apps.users.services import generate_auth_token_for_user
+from apps.users.token_cache import token_cache
+from blog_project.db import connection_stats
+
+
+class DatabaseHealthTests(TestCase):
+    url = "/api/health/db"
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username="staff", password="password123")
+        self.headers = {"Authorization": f"Bearer {generate_auth_token_for_user(self.user)}"}
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertEqual(self.client.get(self.url, headers=self.headers).status_code, 403)
+
+    def test_reports_connection_settings(self):
+        User.objects.filter(id=self.user.id).update(is_staff=True)
+        token_cache.clear()
+        response = self.client.get(self.url, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        default = response.json()["databases"][0]
+        self.assertEqual(default["alias"], "default")
+        self.assertTrue(default["connected"])
+        self.assertIsNone(default["pool"])
+        self.assertGreaterEqual(default["ping_ms"], 0)
+
+    def test_connection_stats_reads_settings(self):
+        stats = connection_stats("default")
+        self.assertEqual(stats["conn_max_age"], connection.settings_dict["CONN_MAX_AGE"])
+        self.assertEqual(stats["vendor"], connection.vendor)
+
+
+# Загружает настройки с PostgreSQL в отдельном процессе (под pytest settings
+# переключаются на SQLite) и печатает параметры default и собранный пул.
+# Пул создается закрытым (open=False), сервер БД для этого не нужен.
+_POOL_PROBE = """
+import json
+import django
+django.setup()
+from django.conf import settings
+from django.db import connections
+default = settings.DATABASES["default"]
+pool = connections["default"].pool
+print(json.dumps({
+    "conn_max_age": default["CONN_MAX_AGE"],
+    "options": default.get("OPTIONS", {}),
+    "pool": type(pool).__module__ if pool else None,
+    "max_size": pool.max_size if pool else None,
+}))
+"""
+
+
+class ConnectionPoolSettingsTests(TestCase):
+    def probe(self, **env):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "blog_project.settings",
+            "DB_ENGINE": "django.db.backends.postgresql",
+            "DB_NAME": "blog",
+            **env,
+        }
+        for name in ("DB_POOL", "DB_CONN_MAX_AGE", "DB_REPLICA_HOSTS"):
+            if name not in env:
+                env.pop(name, None)
+        output = subprocess.run(
+            [sys.executable, "-c", _POOL_PROBE],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        return json.loads(output)
+
+    def test_asgi_profile_uses_pool(self):
+        result = self.probe(SERVER_PROFILE="asgi", DB_POOL_MAX_SIZE="4")
+        self.assertEqual(result["conn_max_age"], 0)
+        self.assertEqual(result["options"]["pool"]["max_size"], 4)
+        self.assertTrue(result["pool"].startswith("psycopg_pool"))
+        self.assertEqual(result["max_size"], 4)
+
+    def test_wsgi_profile_keeps_persistent_connections(self):
+        result = self.probe(SERVER_PROFILE="wsgi")
+        self.assertEqual(result["conn_max_age"], 60)
+        self.assertNotIn("pool", result["options"])
+        self.assertIsNone(result["pool"])
+
+    def test_pool_can_be_disabled(self):
+        result = self.probe(SERVER_PROFILE="asgi", DB_POOL="False", DB_CONN_MAX_AGE="30")
+        self.assertEqual(result["conn_max_age"], 30)
+        self.assertIsNone(result["pool"])
@@ -0,0 +1,100 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.blog import list_cache
+from apps.blog.models import Article
+from apps.users.models import AuthToken
+from blog_project.db_router import ReplicaRouter, ReplicaRoutingMiddleware, _replica
+
+
+@override_settings(DB_REPLICAS=["replica"], DB_REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.seen = []
+
+    def _view(self, request):
+        # Куда ушло бы чтение статьи внутри запроса
+        self.seen.append(self.router.db_for_read(Article))
+        return HttpResponse(status=200)
+
+    def _call(self, method, headers=None, view=None):
+        request = getattr(self.factory, method)("/api/blog/articles/", headers=headers or {})
+        return ReplicaRoutingMiddleware(view or self._view)(request)
+
+    def test_reads_outside_request_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Article), "default")
+        self.assertEqual(self.router.db_for_write(Article), "default")
+        self.assertTrue(self.router.allow_migrate("default", "blog"))
+        self.assertFalse(self.router.allow_migrate("replica", "blog"))
+
+    def test_safe_requests_read_from_replica(self):
+        self._call("get")
+        self._call("post")
+        self.assertEqual(self.seen, ["replica", "default"])
+
+    def test_auth_tokens_always_read_from_primary(self):
+        token = _replica.set("replica")
+        try:
+            self.assertEqual(self.router.db_for_read(AuthToken), "default")
+            self.assertEqual(self.router.db_for_read(User), "replica")
+        finally:
+            _replica.reset(token)
+
+    def test_client_pinned_to_primary_after_write(self):
+        alice = {"Authorization": "Bearer alice"}
+        bob = {"Authorization": "Bearer bob"}
+        self._call("put", alice)
+        self._call("get", alice)
+        self._call("get", bob)
+        self.assertEqual(self.seen, ["default", "default", "replica"])
+
+    def test_failed_write_does_not_pin(self):
+        headers = {"Authorization": "Bearer carol"}
+        self._call("post", headers, view=lambda request: HttpResponse(status=403))
+        self._call("get", headers)
+        self.assertEqual(self.seen, ["replica"])
+
+    def test_streaming_response_reads_from_replica(self):
+        def view(request):
+            return StreamingHttpResponse(self.router.db_for_read(Article) for _ in range(1))
+
+        response = self._call("get", view=view)
+        self.assertEqual(b"".join(response.streaming_content), b"replica")
+
+    async def test_cached_list_page_built_from_primary(self):
+        seen = []
+
+        async def build():
+            seen.append(self.router.db_for_read(Article))
+            return b"[]"
+
+        token = _replica.set("replica")
+        try:
+            await list_cache.aget_or_build(("router-test",), build)
+            # Некэшируемые чтения того же запроса по-прежнему идут на реплику
+            seen.append(self.router.db_for_read(Article))
+        finally:
+            _replica.reset(token)
+        self.assertEqual(seen, ["default", "replica"])
+
+    @override_settings(DB_REPLICAS=["replica_0", "replica_1", "replica_2"])
+    def test_one_replica_per_request(self):
+        """Все чтения запроса идут на одну реплику — один снимок данных."""
+
+        def view(request):
+            self.seen.append({self.router.db_for_read(Article) for _ in range(20)})
+            return HttpResponse(status=200)
+
+        for _ in range(5):
+            self._call("get", view=view)
+        self.assertTrue(all(len(aliases) == 1 for aliases in self.seen))
+
+    @override_settings(DB_REPLICAS=[])
+    def test_without_replicas_everything_uses_primary(self):
+        self._call("get")
+        self.assertEqual(self.seen, ["default"])
@@ -0,0 +1,78 @@
+import io
+import json
+import logging
+import threading
+import time
+from unittest import TestCase
+
+from blog_project.log import AsyncHandler, JSONFormatter, SamplingFilter, parse_sample_rates
+
+
+def make_record(name="apps.blog.api", level=logging.INFO, msg="Статья %s", args=(1,), **extra):
+    record = logging.LogRecord(name, level, __file__, 10, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class BlockingStream(io.StringIO):
+    """Поток, запись в который ждет release — медленный потребитель логов."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait(5)
+        return super().write(text)
+
+
+class JSONFormatterTests(TestCase):
+    def test_record_as_json_line(self):
+        line = JSONFormatter().format(make_record(operation="get_article"))
+        entry = json.loads(line)
+        self.assertEqual(entry["message"], "Статья 1")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "apps.blog.api")
+        self.assertEqual(entry["operation"], "get_article")
+        self.assertNotIn("\n", line)
+
+
+class SamplingFilterTests(TestCase):
+    def test_rates_by_logger_prefix(self):
+        sampler = SamplingFilter(parse_sample_rates("apps.blog=0, apps.users.api=1"))
+        self.assertFalse(sampler.filter(make_record("apps.blog.api")))
+        self.assertTrue(sampler.filter(make_record("apps.blog.api", logging.WARNING)))
+        self.assertTrue(sampler.filter(make_record("apps.users.api")))
+        self.assertTrue(sampler.filter(make_record("django.request")))
+
+
+class AsyncHandlerTests(TestCase):
+    def test_slow_stream_does_not_block_and_drops_are_reported(self):
+        stream = BlockingStream()
+        handler = AsyncHandler(stream, maxsize=2)
+        handler.setFormatter(JSONFormatter())
+        try:
+            started = time.perf_counter()
+            for n in range(20):
+                handler.handle(make_record(args=(n,)))
+            self.assertLess(time.perf_counter() - started, 1)
+            self.assertGreater(handler.dropped, 0)
+            stream.release.set()
+            time.sleep(0.1)
+            handler.handle(make_record(args=("после",)))
+        finally:
+            handler.close()
+        messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+        self.assertIn("Статья после", messages)
+        self.assertTrue(any("отброшено записей" in m for m in messages))
+        self.assertLess(len(messages), 20)
+
+    def test_arguments_formatted_at_call_time(self):
+        stream = io.StringIO()
+        handler = AsyncHandler(stream)
+        handler.setFormatter(JSONFormatter())
+        items = ["a"]
+        handler.handle(make_record(msg="%s", args=(items,)))
+        items.append("b")
+        handler.close()
+        self.assertEqual(json.loads(stream.getvalue())["message"], "['a']")
@@ -0,0 +1,79 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+
+from apps.blog.models import Article
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTests(TestCase):
+    url = "/api/blog/articles/"
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username="metrics", password="password123")
+        Article.objects.create(author=user, title="Measured", content="Content")
+
+    def test_request_counted_per_operation(self):
+        before = sample(
+            "blog_http_requests_total", operation="list_articles", method="GET", status="200"
+        )
+        latency = sample("blog_http_request_duration_seconds_count", operation="list_articles")
+        db_time = sample("blog_db_duration_seconds_count", operation="list_articles")
+        self.client.get(self.url)
+        self.assertEqual(
+            sample(
+                "blog_http_requests_total", operation="list_articles", method="GET", status="200"
+            ),
+            before + 1,
+        )
+        self.assertEqual(
+            sample("blog_http_request_duration_seconds_count", operation="list_articles"),
+            latency + 1,
+        )
+        self.assertEqual(
+            sample("blog_db_duration_seconds_count", operation="list_articles"), db_time + 1
+        )
+
+    def test_auth_time_and_status(self):
+        labels = {"operation": "create_article", "method": "POST", "status": "401"}
+        before = sample("blog_http_requests_total", **labels)
+        auth = sample("blog_auth_duration_seconds_count", operation="create_article")
+        self.client.post(
+            self.url, {}, content_type="application/json", HTTP_AUTHORIZATION="Bearer nope"
+        )
+        self.assertEqual(sample("blog_http_requests_total", **labels), before + 1)
+        self.assertEqual(
+            sample("blog_auth_duration_seconds_count", operation="create_article"), auth + 1
+        )
+
+    def test_unmatched_url(self):
+        labels = {"operation": "unmatched", "method": "GET", "status": "404"}
+        before = sample("blog_http_requests_total", **labels)
+        self.client.get("/no-such-page/")
+        self.assertEqual(sample("blog_http_requests_total", **labels), before + 1)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_endpoint_exposes_text_format(self):
+        self.client.get(self.url)
+        response = self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            b'blog_http_requests_total{method="GET",operation="list_articles"', response.content
+        )
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_endpoint_token(self):
+        self.assertEqual(self.client.get("/api/metrics").status_code, 401)
+        response = self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_endpoint_hidden_without_token(self):
+        """Без METRICS_TOKEN метрики не публикуются."""
+        self.assertEqual(self.client.get("/api/metrics").status_code, 404)
@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.blog.models import Article
+from blog_project.tests.query_budget import QueryBudgetClient
+
+
+class QueryStatsMiddlewareTests(TestCase):
+    url = "/api/blog/articles/"
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username="stats", password="password123")
+        Article.objects.create(author=user, title="Counted", content="Content")
+
+    def test_request_tagged_with_operation_and_counts(self):
+        response = self.client.get(self.url)
+        request = response.wsgi_request
+        self.assertEqual(request.ninja_operation_id, "list_articles")
+        self.assertGreater(request.query_stats.count, 0)
+        self.assertGreaterEqual(request.query_stats.time, 0)
+        self.assertNotIn("X-DB-Query-Count", response)
+
+    @override_settings(QUERY_STATS_HEADERS=True)
+    def test_headers_when_enabled(self):
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response["X-DB-Query-Count"], str(response.wsgi_request.query_stats.count)
+        )
+        self.assertIn("X-DB-Time-Ms", response)
+
+    @override_settings(QUERY_COUNT_WARN_THRESHOLD=0)
+    def test_warns_above_threshold(self):
+        with self.assertLogs("blog_project.query_stats", "WARNING") as logs:
+            self.client.get(self.url)
+        self.assertIn("list_articles", logs.output[0])
+
+    @override_settings(QUERY_STATS_RECORD_SQL=True)
+    def test_budget_client_fails_over_budget(self):
+        client = type("Client", (QueryBudgetClient,), {"query_budgets": {"list_articles": 0}})()
+        with self.assertRaisesMessage(AssertionError, "list_articles"):
+            client.get(self.url)
+        client.query_budgets = {}
+        with self.assertRaisesMessage(AssertionError, "не объявлен бюджет"):
+            client.get(self.url)
@@ -16,16 +16,24 @@ Including another URLconf
 """
 
 from django.contrib import admin
+from django.http import Http404, HttpResponse
 from django.urls import path  # Убедимся, что include не используется, если не нужен
+from django.utils.crypto import constant_time_compare
 from django.conf import settings  # Импорт для настроек
 from django.conf.urls.static import static  # Импорт для статики/медиа
 from ninja import NinjaAPI  # Импорт NinjaAPI
+from ninja.errors import HttpError
 from django.views.generic import RedirectView  # Для поддержки /api без слэша
 
 # Подключаем роутеры приложений
-from apps.users.api import router as users_router
+from apps.users.api import TokenAuthBearer, router as users_router
+from apps.users.services import is_staff
 from apps.blog.api import router as blog_router  # Добавляем импорт
 
+from .db import database_health
+from .metrics import render_metrics
+from .query_stats import tag_operation
+
 # Инициализация API для Django Ninja
 api = NinjaAPI(
     version="1.0.0",
@@ -43,6 +51,48 @@ def api_root(request):
     return {"message": "Blog API is running. See /api/docs for docs."}
 
 
+@api.get(
+    "/health/db",
+    auth=TokenAuthBearer(),
+    summary="Соединения с БД текущего процесса (только для staff)",
+    operation_id="health_db",
+)
+def health_db(request):
+    """
+    Настройки переиспользования соединений, статистика пула (если включен)
+    и время SELECT 1 для каждой БД в обслужившем запрос worker-процессе.
+    """
+    if not is_staff(request.user):
+        raise HttpError(403, "Доступно только сотрудникам.")
+    return database_health()
+
+
+@api.get(
+    "/metrics",
+    auth=None,
+    include_in_schema=False,
+    summary="Метрики Prometheus",
+    operation_id="metrics",
+)
+def metrics(request):
+    """
+    Метрики всех worker-процессов в текстовом формате Prometheus. Без
+    METRICS_TOKEN эндпоинт не публикуется (404): метрики раскрывают имена
+    эндпоинтов, задержки и состояние пулов.
+    """
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    if not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HttpError(401, "Неверный токен сборщика метрик.")
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+# operation_id эндпоинта — для учета запросов к БД (blog_project/query_stats.py)
+api.add_decorator(tag_operation, mode="view")
+
 api.add_router(
     "/users", users_router
 )  # Без trailing slash, если в users_router пути начинаются с /
@@ -0,0 +1,43 @@
+"""
+Конфигурация gunicorn.
+
+Профиль выбирается переменной SERVER_PROFILE:
+- "asgi" (по умолчанию) — uvicorn worker'ы, blog_project.asgi: асинхронные
+  эндпоинты чтения обслуживают множество одновременных медленных клиентов без
+  потока на запрос;
+- "wsgi" — синхронные worker'ы, blog_project.wsgi. Эндпоинты чтения асинхронные,
+  и под WSGI каждый такой запрос выполняется через async_to_sync в отдельном
+  цикле событий — это медленнее; профиль оставлен для отладки и совместимости.
+"""
+
+import os
+import shutil
+
+# Каталог метрик prometheus_client: каждый worker пишет сюда свои значения,
+# /api/metrics их суммирует. Переменная должна быть задана до импорта приложения.
+METRICS_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/blog-metrics")
+
+SERVER_PROFILE = os.getenv("SERVER_PROFILE", "asgi")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+
+if SERVER_PROFILE == "wsgi":
+    wsgi_app = "blog_project.wsgi:application"
+    worker_class = "sync"
+else:
+    wsgi_app = "blog_project.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+
+
+def on_starting(server):
+    # Значения прошлого запуска не должны попасть в новые метрики
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)